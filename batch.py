@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Entry point analisis batch tanpa GUI untuk file video hasil rekaman.
+
+Contoh:
+    python batch.py rekaman/*.mp4 --output data/batch --workers 4
+"""
+
+import argparse
+import sys
+
+from src.video.batch import analyze_videos
+
+
+def parse_args(argv=None):
+    """Parse argumen command line."""
+    parser = argparse.ArgumentParser(
+        description="Analisis rPPG dan respirasi offline untuk file video.")
+    parser.add_argument('videos', nargs='+', help="File video yang akan dianalisis")
+    parser.add_argument('-o', '--output', default='data/batch',
+                        help="Direktori output (default: data/batch)")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="Jumlah proses paralel (default: jumlah CPU)")
+    parser.add_argument('--max-frames', type=int, default=None,
+                        help="Batas jumlah frame per video")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Fungsi utama analisis batch."""
+    args = parse_args(argv)
+    
+    summaries, stats = analyze_videos(args.videos, args.output,
+                                      workers=args.workers,
+                                      max_frames=args.max_frames)
+    
+    print("=" * 50)
+    print(f"Video berhasil : {stats['videos']}")
+    print(f"Video gagal    : {len(stats['failed'])}")
+    print(f"Total frame    : {stats['total_frames']}")
+    print(f"Waktu total    : {stats['wall_time']:.1f} detik")
+    print(f"Throughput     : {stats['throughput_fps']:.1f} frame/detik "
+          f"({stats['workers']} worker)")
+    
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
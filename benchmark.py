@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Entry point benchmark pipeline frame tanpa kamera.
+
+Contoh:
+    python benchmark.py --save-baseline data/bench_baseline.json
+    python benchmark.py --baseline data/bench_baseline.json
+    python benchmark.py --video rekaman/sesi1.mp4 --frames 300
+    python benchmark.py --video rekaman/sesi1.mp4 --detectors blazeface,haar,dnn --detection-scale 0.5
+"""
+
+import argparse
+import sys
+
+from src.utils.benchmark import (PipelineBenchmark, SyntheticFixture, VideoFixture,
+                                 benchmark_detectors, compare_with_baseline,
+                                 format_detector_report, format_report, load_report,
+                                 save_report)
+from src.utils.utils import BENCHMARK_CONFIG
+
+
+def parse_args(argv=None):
+    """Parse argumen command line."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark latensi, throughput, dan alokasi pipeline rPPG/respirasi.")
+    parser.add_argument('--video', default=None,
+                        help="Fixture video rekaman (default: frame sintetis)")
+    parser.add_argument('--frames', type=int, default=BENCHMARK_CONFIG['frames'],
+                        help="Jumlah frame fixture")
+    parser.add_argument('--warmup', type=int, default=BENCHMARK_CONFIG['warmup_frames'],
+                        help="Jumlah frame warm-up yang tidak diukur")
+    parser.add_argument('--alloc-frames', type=int, default=BENCHMARK_CONFIG['alloc_frames'],
+                        help="Jumlah frame pengukuran alokasi (0 untuk melewati)")
+    parser.add_argument('--detector', action='store_true',
+                        help="Jalankan VideoProcessor pada fixture sintetis "
+                             "(default: ROI ground truth; fixture video selalu memakai detektor)")
+    parser.add_argument('--no-detector', action='store_true',
+                        help="Pakai ROI ground truth fixture sintetis tanpa VideoProcessor")
+    parser.add_argument('--detectors', default=None,
+                        help="Bandingkan backend detektor wajah (mis. blazeface,haar,dnn) "
+                             "alih-alih menjalankan pipeline")
+    parser.add_argument('--detection-scale', type=float, default=None,
+                        help="Skala frame untuk deteksi wajah (default dari ROI_CONFIG)")
+    parser.add_argument('--baseline', default=None,
+                        help="File JSON baseline untuk deteksi regresi")
+    parser.add_argument('--threshold', type=float,
+                        default=BENCHMARK_CONFIG['regression_threshold'],
+                        help="Perubahan relatif maksimum terhadap baseline (default: 0.2)")
+    parser.add_argument('--save-baseline', default=None,
+                        help="Simpan laporan sebagai baseline JSON")
+    parser.add_argument('-o', '--output', default=None,
+                        help="Simpan laporan lengkap ke file JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Fungsi utama benchmark."""
+    args = parse_args(argv)
+    
+    if args.video:
+        fixture = VideoFixture(args.video, max_frames=args.frames)
+    else:
+        fixture = SyntheticFixture(n_frames=args.frames)
+    
+    if args.detectors:
+        names = [name.strip() for name in args.detectors.split(',') if name.strip()]
+        results = benchmark_detectors(fixture, names, scale=args.detection_scale,
+                                      warmup=args.warmup)
+        print("=" * 60)
+        print(format_detector_report(results))
+        print("=" * 60)
+        if args.output:
+            save_report(results, args.output)
+        return 0
+    
+    use_detector = (bool(args.video) or args.detector) and not args.no_detector
+    benchmark = PipelineBenchmark(fixture, use_detector=use_detector)
+    report = benchmark.run(warmup=args.warmup, alloc_frames=args.alloc_frames)
+    
+    print("=" * 60)
+    print(format_report(report))
+    print("=" * 60)
+    
+    if args.output:
+        save_report(report, args.output)
+    if args.save_baseline:
+        save_report(report, args.save_baseline)
+        print(f"Baseline disimpan ke {args.save_baseline}")
+    
+    if not args.baseline:
+        return 0
+    
+    baseline = load_report(args.baseline)
+    if baseline.get('fixture') != report['fixture'] or baseline.get('detector') != report['detector']:
+        print("Warning: Baseline dibuat dengan fixture/detektor berbeda, perbandingan mungkin tidak valid")
+    
+    regressions = compare_with_baseline(report, baseline, threshold=args.threshold)
+    if not regressions:
+        print(f"Tidak ada regresi terhadap baseline (threshold {args.threshold:.0%})")
+        return 0
+    
+    print(f"REGRESI terhadap baseline (threshold {args.threshold:.0%}):")
+    for name, old, new, change in regressions:
+        print(f"  {name:<28} {old:>10.3f} -> {new:>10.3f} ({change:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
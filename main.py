@@ -1,6 +1,6 @@
 import sys
+import time
 import logging
-from src.gui.main_window import MainWindow
 from PyQt5.QtWidgets import QApplication, QMessageBox
 
 def setup_logging():
@@ -33,6 +33,11 @@ def handle_exception(exc_type, exc_value, exc_traceback):
 
 def main():
     """Fungsi utama aplikasi."""
+    start_time = time.perf_counter()
+    
+    # Import di dalam main() agar waktu muat modul GUI ikut terukur
+    from src.gui.main_window import MainWindow
+    
     # Setup sistem logging
     logger = setup_logging()
     
@@ -44,9 +49,15 @@ def main():
         app.setStyle("Fusion")
         
         # Buat dan tampilkan jendela utama
+        # Model dan processor dimuat di background; catat durasi tiap tahap
+        def log_components_ready(components):
+            logger.info("Model siap: " + ", ".join(
+                f"{name} {seconds:.2f} s" for name, seconds in components['timings'].items()))
+        
         logger.info("Menginisialisasi jendela utama...")
-        window = MainWindow()
+        window = MainWindow(on_ready=log_components_ready)
         window.show()
+        logger.info(f"Jendela tampil dalam {time.perf_counter() - start_time:.2f} detik")
         
         logger.info("Aplikasi siap - memulai event loop")
         sys.exit(app.exec_())
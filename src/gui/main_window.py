@@ -1,45 +1,95 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QPushButton, QLabel, QGroupBox, QMessageBox)
 from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QImage, QPixmap
-import cv2
-import numpy as np
+from PyQt5.QtGui import QImage, QPixmap, QFontDatabase
+import os
 import time
+import numpy as np
 import pyqtgraph as pg
 
-from src.video.camera import Camera
-from src.video.processor import detect_face, get_forehead_roi, get_chest_roi
-from src.signal.respiration import RespirationSignalProcessor
-from src.signal.rppg import RPPGSignalProcessor
+from src.gui.startup import StartupLoader
+from src.video.camera import ThreadedCamera
+from src.video.pipeline import PipelineWorker
+from src.utils.metrics import get_metrics
+from src.utils.recording import SessionRecorder
+from src.utils.utils import (METRICS_CONFIG, RPPG_CONFIG, RESPIRATION_CONFIG, FRAME_RING_CONFIG,
+                             QUALITY_CONFIG)
+from src.video.frame_ring import FrameRing
+from src.video.governor import QualityGovernor
+
+# Urutan tahap pada panel metrik (tahap yang belum tercatat dilewati)
+METRIC_STAGES = ('frame.total', 'analyze_frame', 'detect_face', 'detect_face.blazeface_tasks',
+                 'detect_face.blazeface_tasks.async', 'detect_face.blazeface',
+                 'detect_face.haar', 'detect_face.dnn', 'roi_tracking', 'get_chest_roi',
+                 'rppg.process_roi', 'rppg.get_filtered_signal', 'rppg.estimate',
+                 'resp.process_roi', 'resp.get_filtered_signal', 'resp.estimate',
+                 'gui.plot', 'gui.render')
 
 class MainWindow(QMainWindow):
     """Jendela utama aplikasi."""
     
-    def __init__(self):
-        """Inisialisasi jendela utama."""
+    def __init__(self, on_ready=None):
+        """
+        Inisialisasi jendela utama.
+        
+        Parameter
+        ----------
+        on_ready : callable, opsional
+            Callback tambahan untuk sinyal loader.ready (dihubungkan sebelum
+            StartupLoader dimulai sehingga hasil pemuatan tidak terlewat)
+        """
         super().__init__()
         
         # Atur properti jendela
         self.setWindowTitle("Tugas Besar Pengolahan Sinyal Digital")
         self.setMinimumSize(1000, 600)
         
-        # Inisialisasi kamera
-        self.camera = Camera()
+        # Inisialisasi kamera dengan thread capture terpisah
+        self.camera = ThreadedCamera()
+        
+        # Processor sinyal dan pipeline dibuat oleh StartupLoader di background
+        # (import SciPy/MediaPipe dan graph model tidak menunda tampilnya jendela)
+        self.resp_processor = None
+        self.rppg_processor = None
+        self.pipeline = None
+        
+        # Governor kualitas adaptif (dibuat bersama pipeline)
+        self.governor = None
         
-        # Inisialisasi processor sinyal
-        self.resp_processor = RespirationSignalProcessor()
-        self.rppg_processor = RPPGSignalProcessor()
+        # Worker pemrosesan frame (dibuat ulang setiap kamera dimulai)
+        self.worker = None
+        self.last_result_seq = 0
         
-        # Timestamp awal
-        self.start_time = None
+        # Perekam sesi biner (aktif selama tombol Rekam Sesi ditekan)
+        self.recorder = None
+        
+        # Ring frame/ROI terbaru untuk ekspor klip lossless
+        self.frame_ring = FrameRing() if FRAME_RING_CONFIG['enabled'] else None
+        
+        # Instrumentasi per tahap (dibagi dengan pipeline di worker thread)
+        self.metrics = get_metrics()
+        self.last_display_time = None
+        self.last_export_time = None
         
         # Setup UI
         self.setup_ui()
         
-        # Timer untuk memperbarui frame video
+        # Timer untuk menampilkan hasil terbaru dari worker
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
         
+        # Timer panel metrik (lebih jarang dari tampilan frame)
+        self.metrics_timer = QTimer()
+        self.metrics_timer.timeout.connect(self.update_metrics_panel)
+        
+        # Muat model dan processor di background; tombol Mulai aktif saat siap
+        self.loader = StartupLoader(self)
+        self.loader.ready.connect(self.on_components_ready)
+        self.loader.failed.connect(self.on_components_failed)
+        if on_ready is not None:
+            self.loader.ready.connect(on_ready)
+        self.loader.start()
+        
     def setup_ui(self):
         """Menyiapkan antarmuka pengguna."""
         # Widget utama
@@ -61,6 +111,7 @@ class MainWindow(QMainWindow):
         control_layout = QHBoxLayout()
         self.start_button = QPushButton("Mulai")
         self.start_button.clicked.connect(self.start_camera)
+        self.start_button.setEnabled(False)  # Aktif setelah model selesai dimuat
         self.stop_button = QPushButton("Berhenti")
         self.stop_button.clicked.connect(self.stop_camera)
         self.stop_button.setEnabled(False)
@@ -70,11 +121,43 @@ class MainWindow(QMainWindow):
         self.save_button.clicked.connect(self.save_data)
         self.save_button.setEnabled(False)
         
+        # Tombol rekam sesi lengkap ke file biner
+        self.record_button = QPushButton("Rekam Sesi")
+        self.record_button.setCheckable(True)
+        self.record_button.toggled.connect(self.toggle_recording)
+        self.record_button.setEnabled(False)
+        
         control_layout.addWidget(self.start_button)
         control_layout.addWidget(self.stop_button)
         control_layout.addWidget(self.save_button)
+        control_layout.addWidget(self.record_button)
+        
+        # Tombol simpan klip N detik terakhir (hanya jika ring aktif)
+        self.clip_button = QPushButton("Simpan Klip")
+        self.clip_button.clicked.connect(self.save_clip)
+        self.clip_button.setEnabled(False)
+        self.clip_button.setVisible(self.frame_ring is not None)
+        control_layout.addWidget(self.clip_button)
         video_layout.addLayout(control_layout)
         
+        # Panel status metrik: FPS, latensi frame, dan rincian per tahap
+        metrics_layout = QHBoxLayout()
+        self.fps_label = QLabel("Memuat model...")
+        self.detail_button = QPushButton("Detail Metrik")
+        self.detail_button.setCheckable(True)
+        self.detail_button.toggled.connect(self.toggle_metrics_detail)
+        self.export_button = QPushButton("Ekspor Metrik")
+        self.export_button.clicked.connect(self.export_metrics)
+        metrics_layout.addWidget(self.fps_label, 1)
+        metrics_layout.addWidget(self.detail_button)
+        metrics_layout.addWidget(self.export_button)
+        video_layout.addLayout(metrics_layout)
+        
+        self.metrics_label = QLabel()
+        self.metrics_label.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.metrics_label.setVisible(False)
+        video_layout.addWidget(self.metrics_label)
+        
         # Panel kanan - Tampilan sinyal
         signal_group = QGroupBox("Tampilan Sinyal")
         signal_layout = QVBoxLayout(signal_group)
@@ -111,114 +194,241 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(video_group, 1)
         main_layout.addWidget(signal_group, 1)
     
+    def on_components_ready(self, components):
+        """Terima processor dan pipeline dari StartupLoader (slot di thread GUI)."""
+        self.resp_processor = components['resp_processor']
+        self.rppg_processor = components['rppg_processor']
+        self.pipeline = components['pipeline']
+        self.pipeline.frame_ring = self.frame_ring
+        if QUALITY_CONFIG['enabled']:
+            self.governor = QualityGovernor(self.pipeline.video_processor, self.pipeline)
+            self.pipeline.governor = self.governor
+        
+        timings = components['timings']
+        self.fps_label.setText(f"Siap (model dimuat dalam {timings['total']:.1f} detik)")
+        self.start_button.setEnabled(True)
+    
+    def on_components_failed(self, message):
+        """Tampilkan error pemuatan model; tombol Mulai tetap nonaktif."""
+        self.fps_label.setText("Gagal memuat model")
+        QMessageBox.critical(self, "Error Startup", f"Gagal memuat model:\n{message}")
+    
     def reset_processors(self):
-        """Reset processor sinyal."""
-        self.resp_processor.reset()
-        self.rppg_processor.reset()
-        self.start_time = None
+        """Reset processor sinyal dan metrik sesi."""
+        self.pipeline.reset()
+        self.metrics.reset()
+        if self.governor is not None:
+            self.governor.reset()
+        if self.frame_ring is not None:
+            self.frame_ring.clear()
+        self.last_result_seq = 0
+        self.last_display_time = None
+        self.last_export_time = time.monotonic()
     
     def start_camera(self):
         """Mulai kamera dan pemrosesan video."""
         if self.camera.start():
             self.reset_processors()  # Reset processor
-            self.timer.start(30)  # Perbarui setiap 30ms (~33 FPS)
+            
+            # Pemrosesan frame berjalan di worker thread
+            self.worker = PipelineWorker(self.camera, self.pipeline)
+            self.worker.start()
+            
+            self.timer.start(self.plot_interval())  # Default 30ms (~33 FPS)
+            self.metrics_timer.start(METRICS_CONFIG['overlay_interval_ms'])
             self.start_button.setEnabled(False)
             self.stop_button.setEnabled(True)
             self.save_button.setEnabled(True)
+            self.record_button.setEnabled(True)
+            self.clip_button.setEnabled(True)
     
     def stop_camera(self):
         """Hentikan kamera dan pemrosesan video."""
         self.timer.stop()
+        self.metrics_timer.stop()
+        # Selesaikan rekaman sebelum worker berhenti
+        self.record_button.setChecked(False)
+        self.record_button.setEnabled(False)
+        self.clip_button.setEnabled(False)
         self.camera.stop()
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+            # Snapshot akhir sesi
+            if METRICS_CONFIG['export_interval'] > 0:
+                self.export_metrics(notify=False)
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         # Bersihkan tampilan video
         self.video_label.clear()
     
+    def plot_interval(self):
+        """Interval timer tampilan (ms) sesuai level kualitas saat ini."""
+        if self.governor is None:
+            return 30
+        return self.governor.settings['plot_interval_ms']
+    
     def update_frame(self):
-        """Perbarui frame video yang ditampilkan dan proses sinyal."""
-        # Inisialisasi timestamp jika belum ada
-        if self.start_time is None:
-            self.start_time = time.time()
-        
-        current_time = time.time()
-        elapsed_time = current_time - self.start_time
-        
-        frame = self.camera.read_frame()
-        if frame is not None:
-            # Deteksi wajah
-            face_rect = detect_face(frame)
-            
-            # Salin frame untuk ditampilkan (dengan overlay ROI)
-            display_frame = frame.copy()
-            
-            if face_rect is not None:
-                x, y, w, h = face_rect
-                
-                # Gambar kotak di sekitar wajah
-                cv2.rectangle(display_frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
-                
-                # Dapatkan ROI untuk rPPG (dahi)
-                forehead_result = get_forehead_roi(face_rect, frame)
-                if forehead_result is not None:
-                    forehead_roi, (fx, fy, fw, fh) = forehead_result
-                    
-                    # Gambar kotak di sekitar ROI dahi
-                    cv2.rectangle(display_frame, (fx, fy), (fx+fw, fy+fh), (255, 0, 0), 2)
-                    
-                    # Proses ROI dahi untuk sinyal rPPG
-                    self.rppg_processor.process_roi(forehead_roi, elapsed_time)
-                    
-                    # Dapatkan dan tampilkan sinyal rPPG
-                    rppg_time, rppg_signal = self.rppg_processor.get_filtered_signal()
-                    if len(rppg_signal) > 5:  # Pastikan ada cukup data
-                        self.rppg_curve.setData(rppg_time, rppg_signal)
-                        
-                        # Estimasi denyut jantung
-                        heart_rate = self.rppg_processor.estimate_heart_rate()
-                        if heart_rate is not None:
-                            self.heart_rate_label.setText(f"Denyut Jantung: {heart_rate:.1f} BPM")
+        """Tampilkan hasil pemrosesan terbaru dari worker thread."""
+        if self.worker is None:
+            return
+        
+        seq, result = self.worker.get_latest_result()
+        if result is None or seq == self.last_result_seq:
+            return  # Belum ada hasil baru
+        self.last_result_seq = seq
+        
+        # Interval antar frame yang ditampilkan (FPS tampilan)
+        now = time.perf_counter()
+        if self.last_display_time is not None:
+            self.metrics.record('gui.interval', (now - self.last_display_time) * 1000.0)
+        self.last_display_time = now
+        
+        with self.metrics.timer('gui.plot'):
+            self.update_plots(result)
+        
+        display_frame = result['frame']
+        if display_frame is not None:
+            with self.metrics.timer('gui.render'):
+                # Konversi langsung ke QImage BGR (tanpa konversi RGB tambahan)
+                h, w, ch = display_frame.shape
+                img = QImage(display_frame.data, w, h, ch * w, QImage.Format_BGR888)
                 
-                # Dapatkan ROI untuk respirasi (dada)
-                chest_result = get_chest_roi(face_rect, frame)
-                if chest_result is not None:
-                    chest_roi, (cx, cy, cw, ch) = chest_result
-                    
-                    # Gambar kotak di sekitar ROI dada
-                    cv2.rectangle(display_frame, (cx, cy), (cx+cw, cy+ch), (0, 0, 255), 2)
-                    
-                    # Proses ROI dada untuk sinyal respirasi
-                    self.resp_processor.process_roi(chest_roi, elapsed_time)
-                    
-                    # Dapatkan dan tampilkan sinyal respirasi
-                    resp_time, resp_signal = self.resp_processor.get_filtered_signal()
-                    resp_time, resp_signal = self.resp_processor.get_filtered_signal()
-                    if len(resp_signal) > 5:  # Pastikan ada cukup data
-                        self.resp_curve.setData(resp_time, resp_signal)
-                        
-                        # Estimasi laju pernapasan
-                        resp_rate = self.resp_processor.estimate_respiration_rate()
-                        if resp_rate is not None:
-                            # validasi sudah dilakukan dalam processor
-                            self.resp_rate_label.setText(f"Laju Pernapasan: {resp_rate:.1f} napas/menit")
-                        else:
-                            # Tampilkan indikator sedang mengukur
-                            if len(resp_signal) < self.resp_processor.sampling_rate * 5:
-                                self.resp_rate_label.setText("Laju Pernapasan: mengukur...")
-                            else:
-                                self.resp_rate_label.setText("Laju Pernapasan: --")
-                            
-            # Konversi frame ke RGB untuk ditampilkan
-            frame_rgb = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
+                # Tampilkan gambar
+                self.video_label.setPixmap(QPixmap.fromImage(img).scaled(
+                    self.video_label.width(), self.video_label.height(),
+                    Qt.KeepAspectRatio, Qt.SmoothTransformation))
+    
+    def update_plots(self, result):
+        """Perbarui kurva sinyal dan label laju dari satu hasil pipeline."""
+        # Tampilkan sinyal rPPG dan denyut jantung
+        if result['rppg_signal'] is not None:
+            rppg_time, rppg_signal = result['rppg_signal']
+            self.rppg_curve.setData(rppg_time, rppg_signal)
             
-            # Konversi ke QImage
-            h, w, ch = frame_rgb.shape
-            img = QImage(frame_rgb.data, w, h, ch * w, QImage.Format_RGB888)
+            heart_rate = result['heart_rate']
+            if heart_rate is not None:
+                self.heart_rate_label.setText(f"Denyut Jantung: {heart_rate:.1f} BPM")
+        
+        # Tampilkan sinyal respirasi dan laju pernapasan
+        if result['resp_signal'] is not None:
+            resp_time, resp_signal = result['resp_signal']
+            self.resp_curve.setData(resp_time, resp_signal)
             
-            # Tampilkan gambar
-            self.video_label.setPixmap(QPixmap.fromImage(img).scaled(
-                self.video_label.width(), self.video_label.height(),
-                Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            resp_rate = result['resp_rate']
+            if resp_rate is not None:
+                # validasi sudah dilakukan dalam processor
+                self.resp_rate_label.setText(f"Laju Pernapasan: {resp_rate:.1f} napas/menit")
+            else:
+                # Tampilkan indikator sedang mengukur
+                if len(resp_signal) < self.resp_processor.effective_sampling_rate * 5:
+                    self.resp_rate_label.setText("Laju Pernapasan: mengukur...")
+                else:
+                    self.resp_rate_label.setText("Laju Pernapasan: --")
+    
+    def update_metrics_panel(self):
+        """Perbarui panel status metrik dan ekspor berkala."""
+        budget = METRICS_CONFIG['frame_budget_ms']
+        frame_stats = self.metrics.summary('frame.total')
+        text = (f"FPS kamera: {self.camera.measured_fps:.1f} | "
+                f"proses: {self.metrics.rate('frame.interval'):.1f} | "
+                f"tampilan: {self.metrics.rate('gui.interval'):.1f}")
+        if frame_stats:
+            text += (f" | frame p50/p95: {frame_stats['p50']:.1f}/{frame_stats['p95']:.1f} ms "
+                     f"({100.0 * frame_stats['p50'] / budget:.0f}% anggaran)")
+        
+        # Level kualitas adaptif; laju refresh tampilan mengikuti level
+        if self.governor is not None:
+            text += f" | kualitas: level {self.governor.level}/{self.governor.max_level}"
+            interval = self.plot_interval()
+            if self.timer.isActive() and self.timer.interval() != interval:
+                self.timer.setInterval(interval)
+        self.fps_label.setText(text)
+        
+        if self.metrics_label.isVisible():
+            self.metrics_label.setText(self.metrics.format_overlay(METRIC_STAGES, budget))
+        
+        interval = METRICS_CONFIG['export_interval']
+        if interval > 0 and time.monotonic() - self.last_export_time >= interval:
+            self.export_metrics(notify=False)
+    
+    def toggle_metrics_detail(self, checked):
+        """Tampilkan atau sembunyikan tabel latensi per tahap."""
+        self.metrics_label.setVisible(checked)
+        if checked:
+            self.update_metrics_panel()
+    
+    def export_metrics(self, notify=True):
+        """
+        Tambahkan snapshot metrik ke file metrik (JSON Lines).
+        
+        Parameter
+        ----------
+        notify : bool, opsional
+            Tampilkan dialog konfirmasi/error, default True (tombol ekspor)
+        """
+        path = METRICS_CONFIG['export_path']
+        self.last_export_time = time.monotonic()
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.metrics.export(path)
+        except OSError as e:
+            if notify:
+                QMessageBox.warning(self, "Error", f"Gagal mengekspor metrik: {str(e)}")
+            else:
+                print(f"Warning: Gagal mengekspor metrik: {e}")
+            return
+        if notify:
+            QMessageBox.information(self, "Ekspor Metrik", f"Metrik ditambahkan ke:\n{path}")
+    
+    def toggle_recording(self, checked):
+        """Mulai atau hentikan perekaman sesi ke file biner kolumnar."""
+        if checked:
+            metadata = {
+                'camera': {'width': self.camera.width, 'height': self.camera.height,
+                           'fps': self.camera.fps},
+                'rppg': {'method': RPPG_CONFIG['method'],
+                         'sampling_rate': self.rppg_processor.effective_sampling_rate},
+                'respiration': {'method': RESPIRATION_CONFIG['method'],
+                                'sampling_rate': self.resp_processor.effective_sampling_rate},
+            }
+            try:
+                self.recorder = SessionRecorder(metadata=metadata)
+                self.recorder.start()
+            except (OSError, RuntimeError) as e:
+                self.recorder = None
+                QMessageBox.warning(self, "Error", f"Gagal memulai rekaman: {str(e)}")
+                self.record_button.setChecked(False)
+                return
+            self.pipeline.recorder = self.recorder
+            self.record_button.setText("Stop Rekam")
+            return
+        
+        self.record_button.setText("Rekam Sesi")
+        if self.recorder is None:
+            return
+        self.pipeline.recorder = None
+        self.recorder.stop()
+        recorder, self.recorder = self.recorder, None
+        if recorder.error is not None:
+            QMessageBox.warning(self, "Error", f"Rekaman sesi gagal: {str(recorder.error)}")
+        else:
+            QMessageBox.information(self, "Rekam Sesi",
+                                    f"{recorder.rows} frame direkam ke:\n{recorder.directory}")
+    
+    def save_clip(self):
+        """Simpan frame/ROI beberapa detik terakhir sebagai klip lossless."""
+        if self.frame_ring is None:
+            return
+        # Penulisan berjalan di thread latar belakang; error dicetak oleh writer
+        directory = self.frame_ring.flush()
+        if directory is None:
+            QMessageBox.information(self, "Simpan Klip", "Belum ada frame untuk disimpan.")
+            return
+        QMessageBox.information(self, "Simpan Klip",
+                                f"Klip {len(self.frame_ring)} frame terakhir sedang disimpan ke:\n{directory}")
     
     def save_data(self):
         """Simpan data sinyal ke file CSV."""
@@ -234,13 +444,20 @@ class MainWindow(QMainWindow):
             # Nama file dengan timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
+            # Ambil sinyal zero-phase secara konsisten selagi worker berjalan
+            if self.worker is not None:
+                with self.worker.lock:
+                    resp_time, resp_signal = self.resp_processor.get_filtered_signal(zero_phase=True)
+                    rppg_time, rppg_signal = self.rppg_processor.get_filtered_signal(zero_phase=True)
+            else:
+                resp_time, resp_signal = self.resp_processor.get_filtered_signal(zero_phase=True)
+                rppg_time, rppg_signal = self.rppg_processor.get_filtered_signal(zero_phase=True)
+            
             # Simpan data respirasi
-            resp_time, resp_signal = self.resp_processor.get_filtered_signal()
             resp_file = os.path.join(data_dir, f"respirasi_{timestamp}.csv")
             save_data_to_csv(resp_time, resp_signal, resp_file)
             
             # Simpan data rPPG
-            rppg_time, rppg_signal = self.rppg_processor.get_filtered_signal()
             rppg_file = os.path.join(data_dir, f"rppg_{timestamp}.csv")
             save_data_to_csv(rppg_time, rppg_signal, rppg_file)
             
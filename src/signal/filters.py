@@ -5,8 +5,10 @@ Modul yang berisi filter digital untuk pemrosesan sinyal.
 Dengan validasi untuk menangani NaN dan Inf values.
 """
 
+import math
+import threading
 import numpy as np
-from scipy import signal
+from collections import OrderedDict, deque
 
 def validate_signal(data):
     """
@@ -75,6 +77,145 @@ def validate_signal(data):
     
     return data, True
 
+def _normalized_band(lowcut, highcut, fs):
+    """
+    Hitung frekuensi cutoff ternormalisasi (terhadap Nyquist) untuk filter bandpass.
+    
+    Returns
+    -------
+    tuple atau None
+        (low, high) dalam range (0, 1), atau None jika parameter tidak valid
+    """
+    nyq = 0.5 * fs
+    if lowcut >= nyq or highcut >= nyq or lowcut >= highcut:
+        return None
+    
+    low = max(0.001, min(0.999, lowcut / nyq))
+    high = max(0.001, min(0.999, highcut / nyq))
+    
+    if low >= high:
+        low = high * 0.8
+    
+    return low, high
+
+
+class FilterDesignCache:
+    """
+    Cache LRU untuk koefisien filter bandpass Butterworth dalam format SOS.
+    
+    Kunci cache adalah orde dan frekuensi cutoff ternormalisasi, sehingga
+    desain filter hanya dihitung ulang jika parameter (termasuk sampling
+    rate adaptif) benar-benar berubah.
+    """
+    
+    def __init__(self, maxsize=32):
+        """
+        Parameter
+        ----------
+        maxsize : int, opsional
+            Jumlah maksimum desain filter yang disimpan, default 32
+        """
+        self.maxsize = max(1, int(maxsize))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get_bandpass_sos(self, lowcut, highcut, fs, order=4):
+        """
+        Ambil koefisien SOS bandpass dari cache atau desain baru jika belum ada.
+        
+        Parameter
+        ----------
+        lowcut : float
+            Frekuensi cutoff rendah dalam Hz
+        highcut : float
+            Frekuensi cutoff tinggi dalam Hz
+        fs : float
+            Frekuensi sampling dalam Hz
+        order : int, opsional
+            Orde filter, default 4
+            
+        Returns
+        -------
+        numpy.ndarray atau None
+            Koefisien SOS (dipakai bersama, jangan diubah), atau None jika
+            parameter tidak valid
+        """
+        band = _normalized_band(lowcut, highcut, fs)
+        if band is None:
+            return None
+        
+        key = (int(order), round(band[0], 9), round(band[1], 9))
+        with self._lock:
+            sos = self._entries.get(key)
+            if sos is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return sos
+            self.misses += 1
+        
+        # Import lazy: scipy.signal baru dimuat saat filter pertama didesain
+        from scipy import signal
+        sos = signal.butter(order, list(band), btype='band', output='sos')
+        
+        with self._lock:
+            self._entries[key] = sos
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return sos
+    
+    def stats(self):
+        """
+        Statistik pemakaian cache.
+        
+        Returns
+        -------
+        dict
+            hits, misses, size, dan maxsize
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+    
+    def clear(self):
+        """Kosongkan cache dan reset counter."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Cache desain filter yang dipakai bersama oleh seluruh modul
+filter_design_cache = FilterDesignCache()
+
+def design_bandpass_sos(lowcut, highcut, fs, order=4):
+    """
+    Desain filter bandpass Butterworth (SOS) melalui cache global.
+    
+    Parameter
+    ----------
+    lowcut : float
+        Frekuensi cutoff rendah dalam Hz
+    highcut : float
+        Frekuensi cutoff tinggi dalam Hz
+    fs : float
+        Frekuensi sampling dalam Hz
+    order : int, opsional
+        Orde filter, default 4
+        
+    Returns
+    -------
+    numpy.ndarray atau None
+        Koefisien SOS, atau None jika parameter tidak valid
+    """
+    return filter_design_cache.get_bandpass_sos(lowcut, highcut, fs, order)
+
 def bandpass_filter(data, lowcut, highcut, fs, order=4):
     """
     Menerapkan filter bandpass Butterworth pada data input dengan validasi.
@@ -103,27 +244,15 @@ def bandpass_filter(data, lowcut, highcut, fs, order=4):
         return clean_data
     
     try:
-        # Validasi parameter filter
-        nyq = 0.5 * fs
-        if lowcut >= nyq or highcut >= nyq or lowcut >= highcut:
+        # Ambil desain filter (SOS) dari cache, None jika parameter tidak valid
+        sos = design_bandpass_sos(lowcut, highcut, fs, order)
+        if sos is None:
             # Parameter filter tidak valid, return data original
             return clean_data
         
-        low = lowcut / nyq
-        high = highcut / nyq
-        
-        # Pastikan cutoff frequencies dalam range valid (0, 1)
-        low = max(0.001, min(0.999, low))
-        high = max(0.001, min(0.999, high))
-        
-        if low >= high:
-            low = high * 0.8  # Adjust low cutoff
-        
-        # Buat filter
-        b, a = signal.butter(order, [low, high], btype='band')
-        
         # Apply filter dengan zero-phase filtering
-        y = signal.filtfilt(b, a, clean_data)
+        from scipy import signal
+        y = signal.sosfiltfilt(sos, clean_data)
         
         # Validasi output
         filtered_data, is_filtered_valid = validate_signal(y)
@@ -205,6 +334,7 @@ def detrend(data):
     
     try:
         # Apply detrend dengan scipy
+        from scipy import signal
         detrended = signal.detrend(clean_data)
         
         # Validasi hasil detrend
@@ -223,4 +353,432 @@ def detrend(data):
             mean_value = np.mean(clean_data)
             return clean_data - mean_value
         except:
-            return clean_data
\ No newline at end of file
+            return clean_data
+
+
+def resample_uniform(time_array, values, fs, anchor='start'):
+    """
+    Interpolasi linear sampel bertimestamp ke grid waktu seragam.
+    
+    Timestamp frame kamera tidak seragam (jitter, frame terbuang saat CPU
+    sibuk), sedangkan FFT dan filter digital mengasumsikan jarak sampel tetap.
+    Grid dimulai dari timestamp pertama dengan jarak 1/fs, atau berakhir
+    tepat pada timestamp terakhir jika anchor='end'.
+    
+    Parameter
+    ----------
+    time_array : numpy.ndarray
+        Timestamp sampel dalam detik, naik monoton
+    values : numpy.ndarray
+        Nilai sampel, 1D (n,) atau 2D (kanal, n)
+    fs : float
+        Laju sampling grid seragam dalam Hz
+    anchor : str, opsional
+        'start' (default) atau 'end', titik grid yang jatuh tepat pada timestamp sampel
+        
+    Returns
+    -------
+    tuple
+        (uniform_time, uniform_values) dengan bentuk values mengikuti input
+    """
+    time_array = np.asarray(time_array, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    
+    if len(time_array) < 2 or fs <= 0:
+        return time_array, values
+    
+    duration = time_array[-1] - time_array[0]
+    if not np.isfinite(duration) or duration <= 0:
+        return time_array, values
+    
+    n = int(np.floor(duration * fs + 1e-9)) + 1
+    if anchor == 'end':
+        uniform_time = time_array[-1] - np.arange(n - 1, -1, -1, dtype=np.float64) / fs
+    else:
+        uniform_time = time_array[0] + np.arange(n, dtype=np.float64) / fs
+    
+    if values.ndim == 1:
+        return uniform_time, np.interp(uniform_time, time_array, values)
+    
+    uniform_values = np.empty((values.shape[0], n), dtype=np.float64)
+    for i, row in enumerate(values):
+        uniform_values[i] = np.interp(uniform_time, time_array, row)
+    return uniform_time, uniform_values
+
+
+class UniformResampler:
+    """
+    Versi streaming resample_uniform: sampel bertimestamp -> sampel grid seragam.
+    
+    Setiap sampel baru menghasilkan nol atau lebih titik grid berjarak 1/fs
+    di antara sampel sebelumnya dan sampel baru, diinterpolasi linear.
+    Dipakai untuk mengumpankan SlidingDFT, yang mengasumsikan jarak sampel
+    tepat 1/fs.
+    """
+    
+    def __init__(self, fs):
+        """
+        Parameter
+        ----------
+        fs : float
+            Laju sampling grid dalam Hz
+        """
+        self.fs = float(fs)
+        self.reset()
+    
+    def reset(self):
+        """Hapus sampel terakhir; sampel berikutnya menjadi titik awal grid."""
+        self._last = None      # (timestamp, nilai) sampel input terakhir
+        self._origin = None    # Timestamp titik grid ke-0
+        self._index = 0        # Indeks titik grid berikutnya
+    
+    def set_sampling_rate(self, fs):
+        """
+        Ganti laju grid; grid baru berlanjut dari timestamp sampel terakhir.
+        
+        Parameter
+        ----------
+        fs : float
+            Laju sampling grid baru dalam Hz
+        """
+        self.fs = float(fs)
+        if self._last is not None:
+            self._origin = self._last[0]
+            self._index = 1
+    
+    def update(self, timestamp, x):
+        """
+        Tambahkan satu sampel bertimestamp.
+        
+        Parameter
+        ----------
+        timestamp : float
+            Timestamp sampel dalam detik
+        x : float
+            Nilai sampel
+            
+        Returns
+        -------
+        list
+            Nilai titik grid dengan timestamp dalam (sampel sebelumnya, timestamp]
+        """
+        if self._last is None:
+            self._last = (timestamp, x)
+            self._origin = timestamp
+            self._index = 1
+            return [x]
+        
+        t0, x0 = self._last
+        if timestamp <= t0:
+            # Timestamp tidak naik, abaikan
+            return []
+        
+        out = []
+        slope = (x - x0) / (timestamp - t0)
+        # Indeks absolut (bukan akumulasi 1/fs) agar grid tidak bergeser
+        grid_time = self._origin + self._index / self.fs
+        while grid_time <= timestamp + 1e-9:
+            out.append(x0 + slope * (grid_time - t0))
+            self._index += 1
+            grid_time = self._origin + self._index / self.fs
+        self._last = (timestamp, x)
+        return out
+
+
+class SampleRateEstimator:
+    """
+    Estimasi laju sampling efektif secara online dari timestamp sampel.
+    
+    Laju dihitung dari rentang waktu jendela sampel terakhir, sehingga frame
+    yang terbuang ikut menurunkan laju efektif. Biaya O(1) per sampel.
+    """
+    
+    def __init__(self, nominal_fs, window_size=60, min_samples=10):
+        """
+        Parameter
+        ----------
+        nominal_fs : float
+            Laju sampling nominal, dipakai sampai estimasi tersedia
+        window_size : int, opsional
+            Jumlah timestamp terakhir untuk estimasi, default 60
+        min_samples : int, opsional
+            Jumlah timestamp minimum sebelum estimasi dipakai, default 10
+        """
+        self.nominal_fs = float(nominal_fs)
+        self.window_size = max(2, int(window_size))
+        self.min_samples = max(2, int(min_samples))
+        self.reset()
+    
+    def reset(self):
+        """Reset jendela timestamp."""
+        self._times = deque(maxlen=self.window_size)
+        self.fs = self.nominal_fs
+    
+    def update(self, timestamp):
+        """
+        Tambahkan satu timestamp dan kembalikan laju sampling efektif.
+        
+        Parameter
+        ----------
+        timestamp : float
+            Timestamp sampel dalam detik
+            
+        Returns
+        -------
+        float
+            Laju sampling efektif dalam Hz
+        """
+        if self._times and timestamp <= self._times[-1]:
+            # Timestamp tidak naik, abaikan
+            return self.fs
+        
+        self._times.append(timestamp)
+        n = len(self._times)
+        if n >= self.min_samples:
+            span = self._times[-1] - self._times[0]
+            if span > 0:
+                self.fs = (n - 1) / span
+        return self.fs
+
+
+class RunningMean:
+    """Rata-rata bergerak dengan jendela geser, biaya O(1) per sampel."""
+    
+    def __init__(self, window_size):
+        """
+        Parameter
+        ----------
+        window_size : int
+            Ukuran jendela rata-rata
+        """
+        self.window_size = max(1, int(window_size))
+        self.reset()
+    
+    def reset(self):
+        """Reset isi jendela."""
+        self._values = deque()
+        self._sum = 0.0
+    
+    def update(self, x):
+        """Tambahkan satu sampel dan kembalikan rata-rata jendela saat ini."""
+        self._values.append(x)
+        self._sum += x
+        if len(self._values) > self.window_size:
+            self._sum -= self._values.popleft()
+        return self._sum / len(self._values)
+
+
+class IncrementalDetrend:
+    """
+    Detrend linear inkremental pada jendela geser.
+    
+    Menyimpan jumlah berjalan (sum y dan sum k*y) sehingga garis least-squares
+    dari jendela dapat dihitung dalam O(1) per sampel. Output adalah residu
+    sampel terbaru terhadap garis tersebut.
+    """
+    
+    # Indeks absolut di-rebase berkala agar jumlah berjalan tetap presisi
+    _REBASE_INTERVAL = 10000
+    
+    def __init__(self, window_size):
+        """
+        Parameter
+        ----------
+        window_size : int
+            Jumlah sampel terakhir yang dipakai untuk fitting garis trend
+        """
+        self.window_size = max(2, int(window_size))
+        self.reset()
+    
+    def reset(self):
+        """Reset state detrend."""
+        self._values = deque()
+        self._next_k = 0
+        self._sum_y = 0.0
+        self._sum_ky = 0.0
+    
+    def _rebase(self):
+        """Hitung ulang jumlah berjalan dengan indeks mulai dari nol."""
+        self._sum_y = 0.0
+        self._sum_ky = 0.0
+        for k, y in enumerate(self._values):
+            self._sum_y += y
+            self._sum_ky += k * y
+        self._next_k = len(self._values)
+    
+    def update(self, x):
+        """Tambahkan satu sampel dan kembalikan nilai yang sudah di-detrend."""
+        k = self._next_k
+        self._values.append(x)
+        self._sum_y += x
+        self._sum_ky += k * x
+        self._next_k += 1
+        
+        if len(self._values) > self.window_size:
+            old = self._values.popleft()
+            k_old = k - self.window_size
+            self._sum_y -= old
+            self._sum_ky -= k_old * old
+        
+        n = len(self._values)
+        k0 = self._next_k - n  # Indeks absolut sampel tertua
+        if k0 >= self._REBASE_INTERVAL:
+            self._rebase()
+            k0 = 0
+        
+        if n < 2:
+            return 0.0
+        
+        # Regresi linear dengan indeks lokal i = k - k0
+        mean_i = (n - 1) / 2.0
+        sum_iy = self._sum_ky - k0 * self._sum_y
+        sxx = n * (n * n - 1) / 12.0
+        slope = (sum_iy - mean_i * self._sum_y) / sxx
+        intercept = self._sum_y / n - slope * mean_i
+        
+        return x - (intercept + slope * (n - 1))
+
+
+class StreamingFilter:
+    """
+    Filter sinyal streaming yang stateful untuk pemrosesan per sampel.
+    
+    Rantai yang sama dengan pemrosesan batch (detrend -> bandpass -> moving
+    average) namun setiap sampel baru hanya membutuhkan O(1): detrend
+    inkremental, bandpass Butterworth SOS dengan state zi yang disimpan,
+    dan dua tahap running mean. Bersifat kausal; untuk hasil zero-phase
+    gunakan bandpass_filter pada seluruh data (mis. saat export).
+    """
+    
+    def __init__(self, lowcut, highcut, fs, order=4, window_size=5, detrend_window=None):
+        """
+        Parameter
+        ----------
+        lowcut : float
+            Frekuensi cutoff rendah dalam Hz
+        highcut : float
+            Frekuensi cutoff tinggi dalam Hz
+        fs : float
+            Frekuensi sampling dalam Hz
+        order : int, opsional
+            Orde filter, default 4
+        window_size : int, opsional
+            Ukuran jendela moving average, default 5
+        detrend_window : int, opsional
+            Ukuran jendela detrend, default 10 detik data
+        """
+        self.lowcut = lowcut
+        self.highcut = highcut
+        self.fs = fs
+        self.order = order
+        self.window_size = max(1, int(window_size))
+        self.detrend_window = detrend_window or int(fs * 10)
+        
+        # Desain filter dari cache, None jika parameter tidak valid
+        # (tahap bandpass dilewati)
+        self.sos = design_bandpass_sos(lowcut, highcut, fs, order)
+        
+        self._detrend = IncrementalDetrend(self.detrend_window)
+        # Moving average dua tahap seperti pada moving_average()
+        self._smooth_1 = RunningMean(self.window_size)
+        self._smooth_2 = RunningMean(max(3, self.window_size // 2))
+        self.reset()
+    
+    def reset(self):
+        """Reset seluruh state filter."""
+        self._detrend.reset()
+        self._smooth_1.reset()
+        self._smooth_2.reset()
+        self._last_valid = 0.0
+        if self.sos is not None:
+            self._sections = [tuple(float(c) for c in row) for row in self.sos]
+            self._zi = [[0.0, 0.0] for _ in self._sections]
+        else:
+            self._sections = []
+            self._zi = []
+    
+    def set_sampling_rate(self, fs):
+        """
+        Ganti laju sampling dan desain ulang bandpass (melalui cache desain).
+        
+        State zi dipertahankan jika jumlah section sama agar output tidak
+        melompat ke nol; transien kecil akibat pergantian koefisien lebih
+        baik daripada mengulang settling filter dari awal.
+        
+        Parameter
+        ----------
+        fs : float
+            Laju sampling baru dalam Hz
+        """
+        sos = design_bandpass_sos(self.lowcut, self.highcut, fs, self.order)
+        self.fs = fs
+        self.sos = sos
+        if sos is None:
+            self._sections = []
+            self._zi = []
+            return
+        
+        self._sections = [tuple(float(c) for c in row) for row in sos]
+        if len(self._zi) != len(self._sections):
+            self._zi = [[0.0, 0.0] for _ in self._sections]
+    
+    @property
+    def zi(self):
+        """State internal filter SOS, bentuk (n_sections, 2)."""
+        return np.array(self._zi, dtype=np.float64).reshape(-1, 2)
+    
+    def _bandpass_step(self, x):
+        """Satu langkah sosfilt (direct form II transposed) per section."""
+        for (b0, b1, b2, _, a1, a2), z in zip(self._sections, self._zi):
+            y = b0 * x + z[0]
+            z[0] = b1 * x - a1 * y + z[1]
+            z[1] = b2 * x - a2 * y
+            x = y
+        return x
+    
+    def update(self, x):
+        """
+        Proses satu sampel baru.
+        
+        Parameter
+        ----------
+        x : float
+            Sampel input
+            
+        Returns
+        -------
+        float
+            Sampel output yang sudah difilter
+        """
+        x = float(x)
+        if not math.isfinite(x):
+            # Ganti sampel tidak valid dengan sampel valid terakhir
+            x = self._last_valid
+        self._last_valid = x
+        
+        y = self._detrend.update(x)
+        y = self._bandpass_step(y)
+        y = self._smooth_1.update(y)
+        y = self._smooth_2.update(y)
+        
+        if not math.isfinite(y):
+            # State rusak, mulai ulang filter
+            self.reset()
+            return 0.0
+        return y
+    
+    def process(self, data):
+        """
+        Proses sekumpulan sampel secara berurutan.
+        
+        Parameter
+        ----------
+        data : array-like
+            Sampel input
+            
+        Returns
+        -------
+        numpy.ndarray
+            Sampel output yang sudah difilter
+        """
+        return np.array([self.update(x) for x in data], dtype=np.float64)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modul ekstraksi gerakan dada untuk sinyal respirasi.
+Menggunakan sparse optical flow Lucas-Kanade pada sekumpulan titik tetap di
+ROI dada, pada region tetap yang pyramid-nya dibangun sekali per frame dan
+dipakai ulang sebagai frame sebelumnya pada frame berikutnya.
+"""
+
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+class ChestMotionTracker:
+    """
+    Pelacak gerakan dada berbasis sparse optical flow Lucas-Kanade.
+    
+    Grid titik tetap ditempatkan pada region dada dan dilacak antar frame.
+    Perpindahan median titik per frame diproyeksikan ke sumbu napas (arah
+    dominan gerakan, awalnya vertikal) lalu diakumulasi menjadi sinyal
+    posisi. Region crop tetap antar frame (hanya diganti jika ROI bergeser
+    jauh). Pyramid crop frame saat ini dibangun sekali dan disimpan sebagai
+    pyramid frame sebelumnya untuk pemanggilan berikutnya, sehingga setiap
+    frame hanya dipiramidkan satu kali.
+    """
+    
+    def __init__(self, grid=(6, 6), win_size=15, max_level=2, margin=0.1,
+                 min_points=8, max_step_ratio=0.1, axis_window=90, reseed_interval=150):
+        """
+        Parameter
+        ----------
+        grid : tuple, opsional
+            Jumlah titik (baris, kolom) pada region dada, default (6, 6)
+        win_size : int, opsional
+            Ukuran jendela Lucas-Kanade, default 15
+        max_level : int, opsional
+            Level pyramid maksimum, default 2
+        margin : float, opsional
+            Margin tepi region (relatif ukuran) yang tidak diberi titik
+        min_points : int, opsional
+            Jumlah titik terlacak minimum sebelum grid ditanam ulang
+        max_step_ratio : float, opsional
+            Perpindahan per frame maksimum (relatif tinggi region); lebih
+            besar dianggap gerakan badan, bukan napas
+        axis_window : int, opsional
+            Jumlah perpindahan terakhir untuk estimasi sumbu napas
+        reseed_interval : int, opsional
+            Tanam ulang grid titik setiap N frame agar titik tidak menyebar
+        """
+        self.grid = grid
+        self.win_size = (win_size, win_size)
+        self.max_level = max_level
+        self.margin = margin
+        self.min_points = min_points
+        self.max_step_ratio = max_step_ratio
+        self.axis_window = axis_window
+        self.reseed_interval = reseed_interval
+        self._criteria = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+        self.reset()
+    
+    def reset(self):
+        """Reset region, titik, dan sinyal posisi."""
+        self._region = None
+        self._prev_pyramid = None
+        self._prev_shape = None
+        self._points = None
+        self._frames_since_seed = 0
+        self._steps = deque(maxlen=self.axis_window)
+        self._step_count = 0
+        self.axis = np.array([0.0, 1.0])
+        self.position = 0.0
+        self.tracked_points = 0
+    
+    def _needs_new_region(self, rect):
+        """True jika rect bergeser atau berubah ukuran cukup jauh dari region aktif."""
+        if self._region is None:
+            return True
+        x, y, w, h = rect
+        rx, ry, rw, rh = self._region
+        if abs(w - rw) > 0.25 * rw or abs(h - rh) > 0.25 * rh:
+            return True
+        return (abs((x + w / 2) - (rx + rw / 2)) > 0.25 * rw or
+                abs((y + h / 2) - (ry + rh / 2)) > 0.25 * rh)
+    
+    def _seed_points(self, shape):
+        """Grid titik tetap di dalam region (koordinat lokal region)."""
+        h, w = shape[:2]
+        rows, cols = self.grid
+        xs = np.linspace(w * self.margin, w * (1 - self.margin), cols)
+        ys = np.linspace(h * self.margin, h * (1 - self.margin), rows)
+        grid_x, grid_y = np.meshgrid(xs, ys)
+        self._frames_since_seed = 0
+        return np.stack([grid_x.ravel(), grid_y.ravel()], axis=1).astype(np.float32).reshape(-1, 1, 2)
+    
+    def _update_axis(self):
+        """Sumbu napas = arah utama (PCA) perpindahan terakhir, komponen y positif."""
+        if len(self._steps) < 10:
+            return
+        steps = np.asarray(self._steps)
+        cov = np.cov(steps, rowvar=False)
+        if not np.all(np.isfinite(cov)) or np.trace(cov) == 0:
+            return
+        _, vectors = np.linalg.eigh(cov)
+        axis = vectors[:, -1]
+        if axis[1] < 0:
+            axis = -axis
+        self.axis = axis
+    
+    def _build_pyramid(self, image):
+        """
+        Pyramid Gaussian image sampai max_level (level 0 = resolusi penuh).
+        
+        Level yang lebih kecil dari jendela Lucas-Kanade tidak dibangun.
+        """
+        pyramid = [image]
+        for _ in range(self.max_level):
+            h, w = pyramid[-1].shape[:2]
+            if w // 2 < self.win_size[0] or h // 2 < self.win_size[1]:
+                break
+            pyramid.append(cv2.pyrDown(pyramid[-1]))
+        return pyramid
+    
+    def _track_pyramid(self, prev_pyramid, pyramid, points):
+        """
+        Lucas-Kanade coarse-to-fine pada dua pyramid yang sudah dibangun.
+        
+        Binding Python calcOpticalFlowPyrLK hanya menerima satu gambar per
+        argumen (bukan list pyramid dari buildOpticalFlowPyramid) dan
+        membangun pyramid kedua frame ulang setiap panggilan. Karena itu
+        setiap level dilacak dengan maxLevel=0 dan tebakan dari level di
+        atasnya, sehingga pyramid frame sebelumnya dipakai ulang apa adanya.
+        
+        Returns
+        -------
+        tuple
+            (next_points, status) dalam koordinat level 0
+        """
+        top = min(len(prev_pyramid), len(pyramid)) - 1
+        guess = None
+        status = None
+        for level in range(top, -1, -1):
+            factor = float(2 ** level)
+            level_points = points / factor
+            if guess is None:
+                guess = level_points.copy()
+            next_points, status, _ = cv2.calcOpticalFlowPyrLK(
+                prev_pyramid[level], pyramid[level], level_points, guess,
+                winSize=self.win_size, maxLevel=0, criteria=self._criteria,
+                flags=cv2.OPTFLOW_USE_INITIAL_FLOW)
+            if level > 0:
+                # Tebakan untuk level berikutnya (resolusi dua kali lipat)
+                guess = next_points * 2.0
+        return next_points, status
+    
+    def update(self, gray, rect):
+        """
+        Lacak titik pada frame baru dan perbarui sinyal posisi dada.
+        
+        Parameter
+        ----------
+        gray : numpy.ndarray
+            Frame (atau ROI) grayscale
+        rect : tuple
+            (x, y, w, h) ROI dada dalam koordinat gray
+        
+        Returns
+        -------
+        float
+            Posisi dada terakumulasi sepanjang sumbu napas (piksel)
+        """
+        frame_h, frame_w = gray.shape[:2]
+        if self._needs_new_region(rect):
+            x, y, w, h = rect
+            x0, y0 = max(0, int(x)), max(0, int(y))
+            x1, y1 = min(frame_w, int(x + w)), min(frame_h, int(y + h))
+            self._region = (x0, y0, x1 - x0, y1 - y0)
+            self._prev_pyramid = None
+        
+        x, y, w, h = self._region
+        if w < self.win_size[0] or h < self.win_size[1]:
+            return self.position
+        
+        # Region tetap antar frame; crop adalah view tanpa salinan
+        crop = gray[y:y + h, x:x + w]
+        
+        # ROI mentah (tanpa frame penuh) bisa berubah ukuran: mulai ulang pelacakan
+        if self._prev_pyramid is not None and crop.shape != self._prev_shape:
+            self._prev_pyramid = None
+        
+        # Pyramid frame ini dibangun sekali dan dipakai lagi sebagai frame sebelumnya
+        pyramid = self._build_pyramid(crop)
+        prev_pyramid, self._prev_pyramid, self._prev_shape = self._prev_pyramid, pyramid, crop.shape
+        
+        if prev_pyramid is None or self._points is None or len(self._points) == 0:
+            self._points = self._seed_points(crop.shape)
+            return self.position
+        
+        next_points, status = self._track_pyramid(prev_pyramid, pyramid, self._points)
+        
+        good = status.ravel() == 1
+        self.tracked_points = int(np.count_nonzero(good))
+        if self.tracked_points < self.min_points:
+            self._points = self._seed_points(crop.shape)
+            return self.position
+        
+        # Median perpindahan titik: robust terhadap titik yang salah lacak
+        step = np.median((next_points[good] - self._points[good]).reshape(-1, 2), axis=0)
+        if np.hypot(step[0], step[1]) > self.max_step_ratio * h:
+            # Gerakan badan besar: abaikan langkah ini dan tanam ulang titik
+            self._points = self._seed_points(crop.shape)
+            return self.position
+        
+        self._steps.append(step)
+        self._step_count += 1
+        if self._step_count % 30 == 0:
+            self._update_axis()
+        self.position += float(np.dot(step, self.axis))
+        
+        self._frames_since_seed += 1
+        if self._frames_since_seed >= self.reseed_interval:
+            self._points = self._seed_points(crop.shape)
+        else:
+            self._points = next_points[good].reshape(-1, 1, 2)
+        
+        return self.position
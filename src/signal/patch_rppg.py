@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modul ekstraksi sinyal rPPG multi-ROI (CHROM/POS) pada grid patch kulit.
+Rata-rata RGB semua patch dihitung dalam satu operasi vektor, proyeksi
+CHROM/POS dijalankan sebagai operasi matriks untuk seluruh patch, lalu
+sinyal patch difusi dengan bobot SNR per patch.
+"""
+
+import numpy as np
+import cv2
+
+from src.utils.ring_buffer import RingBuffer
+
+
+class PatchPulseExtractor:
+    """
+    Ekstraktor sinyal pulsa dari grid patch ROI kulit.
+    
+    Setiap frame: rata-rata RGB per patch (reduksi area cv2.resize), proyeksi
+    POS atau CHROM pada jendela geser per patch, lalu fusi berbobot SNR.
+    Bobot SNR dihitung ulang secara berkala dari spektrum riwayat pulsa patch.
+    """
+    
+    # Matriks proyeksi POS (Wang et al., 2017)
+    _POS_PROJECTION = np.array([[0.0, 1.0, -1.0],
+                                [-2.0, 1.0, 1.0]])
+    
+    # Proyeksi CHROM (de Haan & Jeanne, 2013): X = 3R - 2G, Y = 1.5R + G - 1.5B
+    _CHROM_PROJECTION = np.array([[3.0, -2.0, 0.0],
+                                  [1.5, 1.0, -1.5]])
+    
+    def __init__(self, grid=(2, 4), method='pos', fs=30, window_seconds=1.6,
+                 band=(0.7, 3.0), snr_seconds=8.0, snr_interval=15):
+        """
+        Parameter
+        ----------
+        grid : tuple, opsional
+            Jumlah patch (baris, kolom), default (2, 4)
+        method : str, opsional
+            'pos' atau 'chrom', default 'pos'
+        fs : float, opsional
+            Laju sampling dalam Hz, default 30
+        window_seconds : float, opsional
+            Panjang jendela proyeksi dalam detik, default 1.6
+        band : tuple, opsional
+            Pita frekuensi pulsa (Hz) untuk perhitungan SNR
+        snr_seconds : float, opsional
+            Panjang riwayat pulsa untuk SNR dalam detik, default 8
+        snr_interval : int, opsional
+            Hitung ulang bobot SNR setiap N frame, default 15
+        """
+        if method not in ('pos', 'chrom'):
+            raise ValueError(f"Metode rPPG tidak dikenal: {method}")
+        
+        self.grid = (max(1, int(grid[0])), max(1, int(grid[1])))
+        self.n_patches = self.grid[0] * self.grid[1]
+        self.method = method
+        self.window_seconds = window_seconds
+        self.band = band
+        self.snr_seconds = snr_seconds
+        self.snr_interval = max(1, int(snr_interval))
+        self._projection = self._POS_PROJECTION if method == 'pos' else self._CHROM_PROJECTION
+        self.set_sampling_rate(fs)
+    
+    def set_sampling_rate(self, fs):
+        """
+        Ganti laju sampling; ukuran jendela (dalam sampel) dihitung ulang.
+        
+        Parameter
+        ----------
+        fs : float
+            Laju sampling baru dalam Hz
+        """
+        self.fs = float(fs)
+        self.window_size = max(4, int(round(self.window_seconds * self.fs)))
+        channels = [f"p{p}_{c}" for p in range(self.n_patches) for c in 'rgb']
+        self._rgb = RingBuffer(self.window_size, channels)
+        self._pulse = RingBuffer(max(16, int(round(self.snr_seconds * self.fs))),
+                                 [f"p{p}" for p in range(self.n_patches)])
+        self.reset()
+    
+    def reset(self):
+        """Reset riwayat patch dan bobot fusi."""
+        self._rgb.clear()
+        self._pulse.clear()
+        self.weights = np.full(self.n_patches, 1.0 / self.n_patches)
+        self.snr = np.zeros(self.n_patches)
+        self._frames_since_snr = 0
+    
+    def patch_means(self, roi):
+        """
+        Rata-rata RGB setiap patch dalam satu operasi vektor.
+        
+        Parameter
+        ----------
+        roi : numpy.ndarray
+            ROI BGR (h, w, 3)
+        
+        Returns
+        -------
+        numpy.ndarray
+            Array (n_patches, 3) dengan urutan kanal R, G, B
+        """
+        rows, cols = self.grid
+        h, w = roi.shape[:2]
+        if h < rows or w < cols:
+            # ROI lebih kecil dari grid: semua patch memakai rata-rata ROI
+            mean_bgr = roi.reshape(-1, 3).mean(axis=0)
+            return np.tile(mean_bgr[::-1], (self.n_patches, 1))
+        
+        # INTER_AREA = rata-rata piksel per sel grid
+        reduced = cv2.resize(roi, (cols, rows), interpolation=cv2.INTER_AREA)
+        return reduced.reshape(-1, 3)[:, ::-1].astype(np.float64)
+    
+    def update(self, means):
+        """
+        Tambahkan rata-rata patch satu frame dan hitung sampel pulsa hasil fusi.
+        
+        Parameter
+        ----------
+        means : numpy.ndarray
+            Rata-rata RGB per patch (n_patches, 3) dari patch_means()
+        
+        Returns
+        -------
+        float
+            Sampel pulsa hasil fusi berbobot SNR
+        """
+        self._rgb.append(means.ravel())
+        n = self._rgb.count
+        if n < 2:
+            return 0.0
+        
+        # (patch, kanal, waktu) tanpa salinan dari ring buffer
+        rgb = self._rgb.view().reshape(self.n_patches, 3, n)
+        
+        # Normalisasi temporal per patch dan kanal
+        channel_mean = rgb.mean(axis=2, keepdims=True)
+        channel_mean[channel_mean <= 0] = 1.0
+        normalized = rgb / channel_mean
+        
+        # Proyeksi dua komponen untuk semua patch sekaligus: (patch, 2, waktu)
+        projected = np.einsum('ij,pjn->pin', self._projection, normalized)
+        std = projected.std(axis=2)
+        alpha = np.divide(std[:, 0], std[:, 1], out=np.zeros(self.n_patches),
+                          where=std[:, 1] > 0)
+        
+        # POS: h = S1 + alpha * S2; CHROM: s = X - alpha * Y
+        sign = 1.0 if self.method == 'pos' else -1.0
+        latest = projected[:, 0, -1] + sign * alpha * projected[:, 1, -1]
+        window_mean = projected[:, 0].mean(axis=1) + sign * alpha * projected[:, 1].mean(axis=1)
+        values = latest - window_mean
+        
+        # Patch di luar rentang intensitas wajar tidak ikut difusi
+        valid = np.all((means >= 10) & (means <= 250), axis=1)
+        values = np.where(valid & np.isfinite(values), values, 0.0)
+        self._pulse.append(values)
+        
+        self._frames_since_snr += 1
+        if self._frames_since_snr >= self.snr_interval:
+            self._update_weights()
+        
+        weights = self.weights * valid
+        total = weights.sum()
+        if total <= 0:
+            return float(values.mean())
+        return float(np.dot(weights, values) / total)
+    
+    def _update_weights(self):
+        """Hitung SNR per patch dari spektrum riwayat pulsa dan perbarui bobot fusi."""
+        self._frames_since_snr = 0
+        history = self._pulse.view()
+        n = history.shape[1]
+        if n < 16:
+            return
+        
+        spectrum = np.abs(np.fft.rfft(history - history.mean(axis=1, keepdims=True), axis=1)) ** 2
+        freqs = np.fft.rfftfreq(n, 1 / self.fs)
+        band_idx = np.where((freqs >= self.band[0]) & (freqs <= self.band[1]))[0]
+        if len(band_idx) < 3:
+            return
+        
+        band_power = spectrum[:, band_idx]
+        total_power = spectrum[:, 1:].sum(axis=1)
+        
+        # Daya sinyal: puncak pita beserta dua bin tetangga (padding nol di tepi)
+        peak = np.argmax(band_power, axis=1) + 1
+        padded = np.pad(band_power, ((0, 0), (1, 1)))
+        rows = np.arange(self.n_patches)
+        signal_power = padded[rows, peak - 1] + padded[rows, peak] + padded[rows, peak + 1]
+        
+        noise_power = total_power - signal_power
+        snr = np.divide(signal_power, noise_power, out=np.zeros(self.n_patches),
+                        where=noise_power > 0)
+        self.snr = snr
+        
+        if snr.sum() > 0:
+            self.weights = snr / snr.sum()
+        else:
+            self.weights = np.full(self.n_patches, 1.0 / self.n_patches)
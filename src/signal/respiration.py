@@ -3,17 +3,22 @@
 """
 Modul untuk ekstraksi dan pemrosesan sinyal respirasi.
 Algoritma dioptimasi dengan validasi untuk menangani NaN dan Inf values.
-Fixed optical flow size mismatch issue.
+Gerakan dada diekstrak dengan sparse optical flow Lucas-Kanade.
 """
 
 import numpy as np
 import cv2
-from src.signal.filters import bandpass_filter, moving_average, detrend
+from src.utils.helpers import GenerationCache
+from src.utils.ring_buffer import RingBuffer
+from src.signal.filters import (bandpass_filter, moving_average, detrend,
+                                resample_uniform, UniformResampler, StreamingFilter, SampleRateEstimator)
+from src.signal.spectral import SlidingDFT
+from src.signal.motion import ChestMotionTracker
 
 class RespirationSignalProcessor:
     """Kelas untuk memproses dan mengekstrak sinyal respirasi dengan algoritma yang dioptimasi dan robust."""
     
-    def __init__(self, buffer_size=None, sampling_rate=None):
+    def __init__(self, buffer_size=None, sampling_rate=None, method=None):
         """
         Inisialisasi processor sinyal respirasi.
         
@@ -22,7 +27,10 @@ class RespirationSignalProcessor:
         buffer_size : int, opsional
             Ukuran buffer untuk menyimpan nilai sinyal, ambil dari config jika None
         sampling_rate : int, opsional
-            Laju sampling dalam Hz, ambil dari config jika None
+            Laju sampling nominal dalam Hz, ambil dari config jika None.
+            Laju efektif diukur dari timestamp frame selama berjalan.
+        method : str, opsional
+            Metode ekstraksi 'flow' atau 'rgb', ambil dari config jika None
         """
         # Import konfigurasi
         from src.utils.utils import RESPIRATION_CONFIG
@@ -30,39 +38,90 @@ class RespirationSignalProcessor:
         # Gunakan nilai konfigurasi sebagai default
         self.buffer_size = buffer_size or RESPIRATION_CONFIG['buffer_size']
         self.sampling_rate = sampling_rate or RESPIRATION_CONFIG['sampling_rate']
+        self.rate_tolerance = RESPIRATION_CONFIG['rate_tolerance']
         
-        # Inisialisasi buffer
-        self.signal_buffer = np.zeros(self.buffer_size)
-        self.time_buffer = np.zeros(self.buffer_size)
-        self.current_idx = 0
+        # Estimasi laju sampling efektif dari timestamp frame
+        self.rate_estimator = SampleRateEstimator(self.sampling_rate)
+        
+        # Ring buffer untuk waktu, sinyal mentah, dan output filter streaming
+        self.buffer = RingBuffer(self.buffer_size, ('time', 'signal', 'filtered'))
         self.start_time = None
         
+        # Cache hasil per generasi, di-invalidate setiap ada sampel baru
+        self.result_cache = GenerationCache()
+        
+        # Filter streaming: setiap sampel baru diproses O(1)
+        self.stream_filter = StreamingFilter(0.08, 0.5, self.sampling_rate,
+                                             window_size=8,
+                                             detrend_window=self.buffer_size)
+        
+        # Sliding DFT pada pita respirasi (5-30 napas/menit), diperbarui per sampel grid seragam
+        # (timestamp frame tidak seragam, sedangkan DFT mengasumsikan jarak 1/fs)
+        self.spectrum_sampler = UniformResampler(self.sampling_rate)
+        self.spectrum = SlidingDFT(self.buffer_size, self.sampling_rate, 0.08, 0.5)
+        
         # Buffer untuk menyimpan estimasi terbaru untuk stabilitas
         self.recent_estimates = []
         self.max_recent_estimates = 5
         
-        # Buffer untuk optical flow analysis
-        self.prev_gray_roi = None
-        self.prev_roi_size = None  # Track ROI size untuk konsistensi
-        self.flow_buffer = []
-        self.max_flow_buffer = 10
+        # Pelacak gerakan dada (sparse optical flow); None untuk metode RGB
+        self.method = method or RESPIRATION_CONFIG['method']
+        self.motion_tracker = ChestMotionTracker() if self.method == 'flow' else None
         
         # Kalibrasi awal untuk adaptive threshold
         self.baseline_values = []
         self.is_calibrated = False
+        self.baseline_mean = 0.0
+        self.baseline_std = 0.0
+        self.last_inlier_value = None
     
     def reset(self):
         """Reset buffer sinyal dan state."""
-        self.signal_buffer = np.zeros(self.buffer_size)
-        self.time_buffer = np.zeros(self.buffer_size)
-        self.current_idx = 0
+        self.buffer.clear()
+        self.rate_estimator.reset()
+        self.stream_filter.set_sampling_rate(self.sampling_rate)
+        self.stream_filter.reset()
+        self.spectrum.set_sampling_rate(self.sampling_rate)
+        self.spectrum.reset()
+        self.spectrum_sampler.set_sampling_rate(self.sampling_rate)
+        self.spectrum_sampler.reset()
         self.start_time = None
         self.recent_estimates = []
-        self.prev_gray_roi = None
-        self.prev_roi_size = None
-        self.flow_buffer = []
+        if self.motion_tracker is not None:
+            self.motion_tracker.reset()
         self.baseline_values = []
         self.is_calibrated = False
+        self.baseline_mean = 0.0
+        self.baseline_std = 0.0
+        self.last_inlier_value = None
+        self.result_cache.invalidate()
+    
+    @property
+    def effective_sampling_rate(self):
+        """Laju sampling efektif terukur dalam Hz (nominal sampai cukup sampel)."""
+        return self.rate_estimator.fs
+    
+    def _update_sampling_rate(self, elapsed_time):
+        """Perbarui estimasi laju sampling dan desain ulang filter jika bergeser."""
+        fs = self.rate_estimator.update(elapsed_time)
+        if abs(fs - self.stream_filter.fs) > self.rate_tolerance * self.stream_filter.fs:
+            # Dibulatkan ke 0.5 Hz agar desain filter dipakai ulang dari cache
+            fs = max(1.0, round(fs * 2) / 2)
+            self.stream_filter.set_sampling_rate(fs)
+            self._resample_spectrum(fs)
+    
+    def _resample_spectrum(self, fs):
+        """
+        Pindahkan sliding DFT ke laju grid fs.
+        
+        Riwayat output filter di-resample ke grid baru yang berakhir pada
+        sampel terakhir, dan grid streaming berlanjut dari sampel yang sama,
+        sehingga isi jendela DFT tetap berjarak tepat 1/fs.
+        """
+        self.spectrum_sampler.set_sampling_rate(fs)
+        time_array, filtered = self._stream_output()
+        _, history = resample_uniform(time_array, filtered, fs, anchor='end')
+        self.spectrum.set_sampling_rate(fs, history)
     
     def _validate_signal_value(self, value):
         """
@@ -91,7 +150,7 @@ class RespirationSignalProcessor:
         
         return float(value)
     
-    def process_roi(self, roi, timestamp):
+    def process_roi(self, roi, timestamp, roi_stats=None, rect=None, gray=None):
         """
         Proses ROI untuk mendapatkan sinyal respirasi dengan multiple methods.
         
@@ -101,6 +160,14 @@ class RespirationSignalProcessor:
             Region of Interest dari frame video
         timestamp : float
             Waktu pengambilan frame dalam detik
+        roi_stats : ROIStatistics, opsional
+            Statistik integral image frame; jika diberikan bersama rect,
+            rata-rata warna diambil dari sini tanpa membaca ulang piksel ROI
+        rect : tuple, opsional
+            (x, y, w, h) ROI dalam koordinat frame
+        gray : numpy.ndarray, opsional
+            Frame grayscale penuh; jika diberikan bersama rect, optical flow
+            dihitung pada region tetap di koordinat frame
             
         Returns
         -------
@@ -114,129 +181,90 @@ class RespirationSignalProcessor:
         if self.start_time is None:
             self.start_time = timestamp
         
-        # Gunakan RGB method yang lebih stabil (skip optical flow untuk menghindari error)
-        signal_value = self._process_rgb_changes(roi)
+        if self.motion_tracker is not None:
+            signal_value = self._process_chest_motion(roi, rect, gray)
+        else:
+            means = None
+            if roi_stats is not None and rect is not None:
+                means = roi_stats.mean(rect)
+            signal_value = self._process_rgb_changes(roi, means)
         
         # Validasi nilai sinyal
         validated_value = self._validate_signal_value(signal_value)
         if validated_value is not None:
-            # Simpan nilai dan waktu ke buffer
-            self.signal_buffer[self.current_idx] = validated_value
-            self.time_buffer[self.current_idx] = timestamp - self.start_time
+            elapsed_time = timestamp - self.start_time
+            self._update_sampling_rate(elapsed_time)
             
-            # Kalibrasi baseline values untuk 5 detik pertama
-            if len(self.baseline_values) < self.sampling_rate * 5:
+            # Kalibrasi baseline values untuk 5 detik pertama (metode RGB;
+            # optical flow sudah menolak langkah gerakan badan yang besar)
+            if self.motion_tracker is None and (elapsed_time < 5.0 or not self.baseline_values):
                 self.baseline_values.append(validated_value)
-            elif not self.is_calibrated:
+            elif self.motion_tracker is None and not self.is_calibrated:
                 self.is_calibrated = True
+                self.baseline_mean = np.mean(self.baseline_values)
+                self.baseline_std = np.std(self.baseline_values)
+            
+            # Filter streaming, outlier (>3 std dari baseline) diganti nilai sebelumnya
+            filter_input = validated_value
+            if self.is_calibrated and self.baseline_std > 0:
+                if abs(validated_value - self.baseline_mean) >= 3 * self.baseline_std:
+                    if self.last_inlier_value is not None:
+                        filter_input = self.last_inlier_value
+                else:
+                    self.last_inlier_value = validated_value
+            filtered = self.stream_filter.update(filter_input)
+            for value in self.spectrum_sampler.update(elapsed_time, filtered):
+                self.spectrum.update(value)
             
-            # Perbarui indeks, reset jika mencapai akhir buffer
-            self.current_idx = (self.current_idx + 1) % self.buffer_size
+            # Simpan waktu, nilai mentah, dan output filter ke ring buffer
+            self.buffer.append((elapsed_time, validated_value, filtered))
+            
+            # Sampel baru: hasil komputasi generasi sebelumnya tidak berlaku
+            self.result_cache.invalidate()
             
             return validated_value
         
         return None
     
-    def _process_optical_flow_fixed(self, roi):
+    def _process_chest_motion(self, roi, rect=None, gray=None):
         """
-        Proses ROI menggunakan optical flow dengan size validation yang proper.
-        DISABLED untuk menghindari size mismatch error.
+        Posisi dada dari sparse optical flow Lucas-Kanade.
         
         Parameter
         ----------
         roi : numpy.ndarray
             Region of Interest dari frame video
+        rect : tuple, opsional
+            (x, y, w, h) ROI dalam koordinat frame
+        gray : numpy.ndarray, opsional
+            Frame grayscale penuh
             
         Returns
         -------
         float
-            Nilai sinyal dari optical flow analysis
+            Posisi dada terakumulasi sepanjang sumbu napas (piksel)
         """
         try:
-            # Convert to grayscale untuk analysis
-            gray_roi = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-            
-            # Gaussian blur untuk mengurangi noise
-            gray_roi = cv2.GaussianBlur(gray_roi, (5, 5), 0)
-            
-            current_size = gray_roi.shape
-            
-            if self.prev_gray_roi is not None and self.prev_roi_size is not None:
-                # Check jika ukuran ROI berubah
-                if current_size != self.prev_roi_size:
-                    # ROI size berubah, resize previous ROI untuk match
-                    try:
-                        resized_prev = cv2.resize(self.prev_gray_roi, (current_size[1], current_size[0]))
-                        
-                        # Frame difference dengan size yang sudah match
-                        frame_diff = cv2.absdiff(gray_roi, resized_prev)
-                        movement_intensity = np.mean(frame_diff)
-                        
-                        # Validasi movement intensity
-                        if np.isfinite(movement_intensity) and movement_intensity >= 0:
-                            # Simpan ke flow buffer untuk smoothing
-                            self.flow_buffer.append(movement_intensity)
-                            if len(self.flow_buffer) > self.max_flow_buffer:
-                                self.flow_buffer.pop(0)
-                            
-                            # Return smoothed value
-                            if len(self.flow_buffer) > 0:
-                                signal_value = np.mean(self.flow_buffer)
-                                
-                                # Update tracking variables
-                                self.prev_gray_roi = gray_roi.copy()
-                                self.prev_roi_size = current_size
-                                
-                                return signal_value
-                    except Exception as resize_error:
-                        # Jika resize gagal, reset tracking dan return fallback
-                        print(f"Warning: Resize gagal: {resize_error}")
-                        self.prev_gray_roi = gray_roi.copy()
-                        self.prev_roi_size = current_size
-                        return 0.0
-                else:
-                    # Same size, safe untuk absdiff
-                    frame_diff = cv2.absdiff(gray_roi, self.prev_gray_roi)
-                    movement_intensity = np.mean(frame_diff)
-                    
-                    # Validasi movement intensity
-                    if np.isfinite(movement_intensity) and movement_intensity >= 0:
-                        # Simpan ke flow buffer untuk smoothing
-                        self.flow_buffer.append(movement_intensity)
-                        if len(self.flow_buffer) > self.max_flow_buffer:
-                            self.flow_buffer.pop(0)
-                        
-                        # Return smoothed value
-                        if len(self.flow_buffer) > 0:
-                            signal_value = np.mean(self.flow_buffer)
-                            
-                            # Update tracking variables
-                            self.prev_gray_roi = gray_roi.copy()
-                            self.prev_roi_size = current_size
-                            
-                            return signal_value
-            
-            # Frame pertama atau jika ada error, simpan sebagai reference
-            self.prev_gray_roi = gray_roi.copy()
-            self.prev_roi_size = current_size
-            return 0.0
-                
+            if gray is None or rect is None:
+                # Tanpa frame penuh: lacak di dalam ROI itu sendiri
+                gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+                rect = (0, 0, gray.shape[1], gray.shape[0])
+            return self.motion_tracker.update(gray, rect)
         except Exception as e:
             print(f"Warning: Error dalam optical flow: {e}")
-            # Reset state jika ada error
-            self.prev_gray_roi = None
-            self.prev_roi_size = None
-            self.flow_buffer = []
+            self.motion_tracker.reset()
             return None
     
-    def _process_rgb_changes(self, roi):
+    def _process_rgb_changes(self, roi, means=None):
         """
-        RGB analysis method untuk deteksi respirasi - more stable than optical flow.
+        RGB analysis method untuk deteksi respirasi (metode 'rgb').
         
         Parameter
         ----------
         roi : numpy.ndarray
             Region of Interest dari frame video
+        means : numpy.ndarray, opsional
+            Rata-rata BGR ROI yang sudah dihitung (mis. dari integral image)
             
         Returns
         -------
@@ -244,10 +272,10 @@ class RespirationSignalProcessor:
             Nilai sinyal dari RGB analysis
         """
         try:
-            # Ekstrak nilai rata-rata RGB
-            b_mean = np.mean(roi[:, :, 0])
-            g_mean = np.mean(roi[:, :, 1])
-            r_mean = np.mean(roi[:, :, 2])
+            # Ekstrak nilai rata-rata RGB dalam satu pass
+            if means is None:
+                means = cv2.mean(roi)[:3]
+            b_mean, g_mean, r_mean = means
             
             # Validasi nilai RGB
             if not (np.isfinite(b_mean) and np.isfinite(g_mean) and np.isfinite(r_mean)):
@@ -266,24 +294,78 @@ class RespirationSignalProcessor:
             print(f"Warning: Error dalam RGB analysis: {e}")
             return None
     
-    def get_filtered_signal(self):
+    def get_filtered_signal(self, zero_phase=False):
         """
-        Dapatkan sinyal respirasi yang telah difilter dengan algoritma yang dioptimasi.
+        Dapatkan sinyal respirasi yang telah difilter.
+        
+        Secara default mengembalikan output filter streaming yang sudah
+        dihitung per sampel. Pemfilteran zero-phase pada seluruh buffer
+        hanya dijalankan jika diminta (mis. saat export data).
+        
+        Hasil di-cache per generasi sampai process_roi menambah sampel baru;
+        array yang dikembalikan dipakai bersama dan tidak boleh diubah.
+        
+        Parameter
+        ----------
+        zero_phase : bool, opsional
+            True untuk memfilter ulang seluruh buffer dengan filtfilt
         
         Returns
         -------
         tuple
             (time_array, signal_array) dari buffer saat ini
         """
-        # Reorder buffer berdasarkan indeks terbaru
-        if self.current_idx == 0:
-            time_array = self.time_buffer.copy()
-            signal_array = self.signal_buffer.copy()
-        else:
-            time_array = np.concatenate((self.time_buffer[self.current_idx:], 
-                                         self.time_buffer[:self.current_idx]))
-            signal_array = np.concatenate((self.signal_buffer[self.current_idx:], 
-                                           self.signal_buffer[:self.current_idx]))
+        # Satu hasil per generasi dipakai bersama oleh semua konsumen
+        compute = self._filter_batch if zero_phase else self._stream_output
+        return self.result_cache.get(('filtered', zero_phase), compute)
+    
+    def _stream_output(self):
+        """
+        Output filter streaming dari sampel terlama ke terbaru (view tanpa salinan).
+        
+        Returns
+        -------
+        tuple
+            (time_array, signal_array) untuk sampel valid di buffer
+        """
+        return self.buffer.column('time'), self.buffer.column('filtered')
+    
+    def get_uniform_signal(self):
+        """
+        Sinyal respirasi terfilter yang diinterpolasi ke grid waktu seragam.
+        
+        Grid memakai laju sampling efektif terukur sehingga estimasi
+        frekuensi tetap benar saat FPS kamera turun atau tidak stabil.
+        
+        Returns
+        -------
+        tuple
+            (time_array, signal_array, fs) dengan fs laju grid dalam Hz
+        """
+        return self.result_cache.get('uniform', self._resample_output)
+    
+    def _resample_output(self):
+        """Resample output filter streaming ke grid seragam (lihat get_uniform_signal)."""
+        fs = self.effective_sampling_rate
+        time_array, signal_array = self.get_filtered_signal()
+        uniform_time, uniform_signal = resample_uniform(time_array, signal_array, fs)
+        return uniform_time, uniform_signal, fs
+    
+    def _filter_batch(self):
+        """
+        Filter zero-phase pada seluruh buffer (resample, outlier, detrend, filtfilt, smoothing).
+        
+        Returns
+        -------
+        tuple
+            (time_array, signal_array) pada grid waktu seragam
+        """
+        # Interpolasi ke grid seragam pada laju terukur (hasilnya salinan baru,
+        # outlier diganti in-place di bawah)
+        fs = self.effective_sampling_rate
+        time_array, raw_array = resample_uniform(self.buffer.column('time'),
+                                                 self.buffer.column('signal'), fs)
+        signal_array = raw_array.copy()
         
         # Filter sinyal dengan robust processing
         if len(signal_array) > 5:  # Cukup data minimal untuk filter
@@ -312,14 +394,14 @@ class RespirationSignalProcessor:
                 
                 # Jika detrend menghasilkan array kosong, return original
                 if len(signal_array) == 0:
-                    return time_array, self.signal_buffer[:len(time_array)]
+                    return time_array, raw_array
                 
                 # Stage 4: Bandpass filter untuk respirasi
-                signal_array = bandpass_filter(signal_array, 0.08, 0.5, self.sampling_rate)
+                signal_array = bandpass_filter(signal_array, 0.08, 0.5, fs)
                 
                 # Jika filter menghasilkan array kosong, return simple version
                 if len(signal_array) == 0:
-                    return time_array, self.signal_buffer[:len(time_array)]
+                    return time_array, raw_array
                 
                 # Stage 5: Smoothing dengan validasi
                 if len(signal_array) > 8:
@@ -327,7 +409,7 @@ class RespirationSignalProcessor:
                     if window_size > 2:
                         signal_array = moving_average(signal_array, window_size)
                         if len(signal_array) == 0:
-                            return time_array, self.signal_buffer[:len(time_array)]
+                            return time_array, raw_array
                 
                 # Update time array sesuai panjang sinyal
                 if len(signal_array) > 0:
@@ -337,13 +419,13 @@ class RespirationSignalProcessor:
                 if len(signal_array) > 0 and np.all(np.isfinite(signal_array)):
                     return time_array, signal_array
                 else:
-                    # Return original buffer jika filtering gagal
-                    return self.time_buffer[:len(self.signal_buffer)], self.signal_buffer
+                    # Return sinyal mentah jika filtering gagal
+                    return time_array, raw_array
                 
             except Exception as e:
                 print(f"Warning: Error dalam filtering respirasi: {e}")
-                # Return original buffer jika ada error
-                return self.time_buffer[:len(self.signal_buffer)], self.signal_buffer
+                # Return sinyal mentah jika ada error
+                return time_array, raw_array
         
         return time_array, signal_array
     
@@ -356,11 +438,15 @@ class RespirationSignalProcessor:
         float
             Perkiraan laju pernapasan dalam napas per menit, atau None jika data tidak cukup
         """
-        # Dapatkan sinyal yang telah difilter
-        _, signal = self.get_filtered_signal()
+        return self.result_cache.get('respiration_rate', self._compute_respiration_rate)
+    
+    def _compute_respiration_rate(self):
+        """Hitung estimasi laju pernapasan tanpa cache (lihat estimate_respiration_rate)."""
+        # Sinyal terfilter pada grid seragam dengan laju terukur
+        _, signal, fs = self.get_uniform_signal()
         
         # Minimal 3 detik data untuk estimasi
-        if len(signal) < self.sampling_rate * 3:
+        if len(signal) < fs * 3:
             return None
         
         # Validasi sinyal
@@ -370,13 +456,13 @@ class RespirationSignalProcessor:
         # Multi-method estimation dengan error handling
         estimations = []
         
-        # Method 1: FFT Analysis (primary)
-        fft_estimation = self._estimate_fft_method_safe(signal)
-        if fft_estimation is not None:
-            estimations.append(fft_estimation)
+        # Method 1: Spektral pita sempit (primary)
+        spectral_estimation = self._estimate_spectral_method_safe()
+        if spectral_estimation is not None:
+            estimations.append(spectral_estimation)
         
         # Method 2: Peak Detection (secondary)
-        peak_estimation = self._estimate_peak_method_safe(signal)
+        peak_estimation = self._estimate_peak_method_safe(signal, fs)
         if peak_estimation is not None:
             estimations.append(peak_estimation)
         
@@ -400,42 +486,23 @@ class RespirationSignalProcessor:
                 return final_estimation
         
         # Default jika semua metode gagal tapi sudah ada data cukup lama
-        if len(signal) > self.sampling_rate * 8:
+        if len(signal) > fs * 8:
             return 15.0  # Nilai default orang dewasa rata-rata
             
         return None
     
-    def _estimate_fft_method_safe(self, signal):
-        """Estimasi menggunakan FFT analysis dengan error handling."""
+    def _estimate_spectral_method_safe(self):
+        """Estimasi dari puncak sliding DFT pada pita respirasi dengan error handling."""
         try:
-            n = len(signal)
-            if n < 10:  # Data terlalu sedikit
+            if self.spectrum.count < 10:  # Data terlalu sedikit
                 return None
             
-            fft_data = np.abs(np.fft.rfft(signal))
-            freqs = np.fft.rfftfreq(n, 1 / self.sampling_rate)
-            
-            # Validasi FFT result
-            if not np.all(np.isfinite(fft_data)):
+            peak_freq = self.spectrum.peak_frequency()
+            if peak_freq is None:
                 return None
             
-            # Range frekuensi respirasi (0.08-0.5 Hz = 5-30 napas/menit)
-            valid_idx = np.where((freqs >= 0.08) & (freqs <= 0.5))[0]
-            if len(valid_idx) == 0:
-                return None
-            
-            valid_fft = fft_data[valid_idx]
-            valid_freqs = freqs[valid_idx]
-            
-            if len(valid_fft) == 0 or np.max(valid_fft) == 0:
-                return None
-            
-            # Cari frekuensi dengan amplitudo tertinggi
-            max_idx = np.argmax(valid_fft)
-            dominant_freq = valid_freqs[max_idx]
-            
             # Konversi ke napas per menit
-            result = dominant_freq * 60
+            result = peak_freq * 60
             
             # Validasi hasil
             if np.isfinite(result) and 5 <= result <= 40:
@@ -443,15 +510,15 @@ class RespirationSignalProcessor:
             
             return None
         except Exception as e:
-            print(f"Warning: Error dalam FFT estimation: {e}")
+            print(f"Warning: Error dalam spectral estimation: {e}")
             return None
     
-    def _estimate_peak_method_safe(self, signal):
-        """Estimasi menggunakan peak detection dengan error handling."""
+    def _estimate_peak_method_safe(self, signal, fs):
+        """Estimasi menggunakan peak detection pada sinyal dengan laju sampling fs."""
         try:
             from scipy.signal import find_peaks
             
-            if len(signal) < self.sampling_rate * 2:  # Butuh minimal 2 detik
+            if len(signal) < fs * 2:  # Butuh minimal 2 detik
                 return None
             
             # Deteksi peaks dengan parameter yang aman
@@ -461,7 +528,7 @@ class RespirationSignalProcessor:
             
             peaks, _ = find_peaks(signal, 
                                 height=signal_std*0.3,  # Threshold berdasarkan std
-                                distance=self.sampling_rate*2)  # Min 2 detik antar peak
+                                distance=max(1, int(fs * 2)))  # Min 2 detik antar peak
             
             if len(peaks) >= 2:
                 # Hitung jarak rata-rata antar puncak dalam sampel
@@ -472,7 +539,7 @@ class RespirationSignalProcessor:
                     
                     if avg_peak_diff > 0:
                         # Konversi ke napas per menit
-                        result = 60 / (avg_peak_diff / self.sampling_rate)
+                        result = 60 / (avg_peak_diff / fs)
                         
                         # Validasi hasil
                         if np.isfinite(result) and 5 <= result <= 40:
@@ -492,9 +559,13 @@ class RespirationSignalProcessor:
         str
             Rating kualitas: 'Excellent', 'Good', 'Fair', 'Poor'
         """
-        _, signal = self.get_filtered_signal()
+        return self.result_cache.get('signal_quality', self._compute_signal_quality)
+    
+    def _compute_signal_quality(self):
+        """Hitung evaluasi kualitas sinyal tanpa cache (lihat get_signal_quality)."""
+        _, signal, fs = self.get_uniform_signal()
         
-        if len(signal) < self.sampling_rate * 3:
+        if len(signal) < fs * 3:
             return 'Poor'
         
         try:
@@ -7,12 +7,18 @@ Algoritma dioptimasi dengan validasi untuk menangani NaN dan Inf values.
 
 import numpy as np
 import cv2
-from src.signal.filters import bandpass_filter, moving_average, detrend
+from src.utils.helpers import GenerationCache
+from src.utils.ring_buffer import RingBuffer
+from src.signal.filters import (bandpass_filter, moving_average, detrend,
+                                resample_uniform, UniformResampler, StreamingFilter, RunningMean,
+                                SampleRateEstimator)
+from src.signal.spectral import SlidingDFT
+from src.signal.patch_rppg import PatchPulseExtractor
 
 class RPPGSignalProcessor:
     """Kelas untuk memproses dan mengekstrak sinyal rPPG dengan algoritma yang dioptimasi dan robust."""
     
-    def __init__(self, buffer_size=None, sampling_rate=None):
+    def __init__(self, buffer_size=None, sampling_rate=None, method=None):
         """
         Inisialisasi processor sinyal rPPG.
         
@@ -21,7 +27,10 @@ class RPPGSignalProcessor:
         buffer_size : int, opsional
             Ukuran buffer untuk menyimpan nilai sinyal, ambil dari config jika None  
         sampling_rate : int, opsional
-            Laju sampling dalam Hz, ambil dari config jika None
+            Laju sampling nominal dalam Hz, ambil dari config jika None.
+            Laju efektif diukur dari timestamp frame selama berjalan.
+        method : str, opsional
+            Metode ekstraksi pulsa 'pos', 'chrom', atau 'green', ambil dari config jika None
         """
         # Import konfigurasi
         from src.utils.utils import RPPG_CONFIG
@@ -29,29 +38,91 @@ class RPPGSignalProcessor:
         # Gunakan nilai konfigurasi sebagai default
         self.buffer_size = buffer_size or RPPG_CONFIG['buffer_size']
         self.sampling_rate = sampling_rate or RPPG_CONFIG['sampling_rate']
+        self.rate_tolerance = RPPG_CONFIG['rate_tolerance']
         
-        # Buffer terpisah untuk kanal RGB
-        self.r_buffer = np.zeros(self.buffer_size)
-        self.g_buffer = np.zeros(self.buffer_size)
-        self.b_buffer = np.zeros(self.buffer_size)
-        self.time_buffer = np.zeros(self.buffer_size)
+        # Estimasi laju sampling efektif dari timestamp frame
+        self.rate_estimator = SampleRateEstimator(self.sampling_rate)
         
-        self.current_idx = 0
+        # Ring buffer untuk waktu, kanal RGB, sinyal pulsa mentah, dan output filter streaming
+        self.buffer = RingBuffer(self.buffer_size, ('time', 'r', 'g', 'b', 'pulse', 'filtered'))
         self.start_time = None
         
+        # Cache hasil per generasi, di-invalidate setiap ada sampel baru
+        self.result_cache = GenerationCache()
+        
+        # Filter streaming: setiap sampel baru diproses O(1)
+        self.stream_filter = StreamingFilter(0.8, 3.0, self.sampling_rate,
+                                             window_size=7,
+                                             detrend_window=self.buffer_size)
+        
+        # Sliding DFT pada pita denyut jantung (50-130 BPM), diperbarui per sampel grid seragam
+        # (timestamp frame tidak seragam, sedangkan DFT mengasumsikan jarak 1/fs)
+        self.spectrum_sampler = UniformResampler(self.sampling_rate)
+        self.spectrum = SlidingDFT(self.buffer_size, self.sampling_rate, 0.83, 2.17)
+        
+        # Ekstraktor multi-patch POS/CHROM; None untuk kombinasi Green-Red lama
+        self.method = method or RPPG_CONFIG['method']
+        if self.method in ('pos', 'chrom'):
+            self.extractor = PatchPulseExtractor(RPPG_CONFIG['patch_grid'], self.method,
+                                                 self.sampling_rate,
+                                                 RPPG_CONFIG['projection_window'])
+        else:
+            self.extractor = None
+        
+        # Rata-rata berjalan per kanal untuk normalisasi RGB (metode 'green')
+        self.r_mean = RunningMean(self.buffer_size)
+        self.g_mean = RunningMean(self.buffer_size)
+        
         # Buffer untuk estimasi heart rate yang stabil
         self.recent_hr_estimates = []
         self.max_recent_estimates = 5
     
     def reset(self):
         """Reset buffer sinyal."""
-        self.r_buffer = np.zeros(self.buffer_size)
-        self.g_buffer = np.zeros(self.buffer_size)
-        self.b_buffer = np.zeros(self.buffer_size)
-        self.time_buffer = np.zeros(self.buffer_size)
-        self.current_idx = 0
+        self.buffer.clear()
         self.start_time = None
+        self.rate_estimator.reset()
+        self.stream_filter.set_sampling_rate(self.sampling_rate)
+        self.stream_filter.reset()
+        self.spectrum.set_sampling_rate(self.sampling_rate)
+        self.spectrum.reset()
+        self.spectrum_sampler.set_sampling_rate(self.sampling_rate)
+        self.spectrum_sampler.reset()
+        if self.extractor is not None:
+            self.extractor.set_sampling_rate(self.sampling_rate)
+        self.r_mean.reset()
+        self.g_mean.reset()
         self.recent_hr_estimates = []
+        self.result_cache.invalidate()
+    
+    @property
+    def effective_sampling_rate(self):
+        """Laju sampling efektif terukur dalam Hz (nominal sampai cukup sampel)."""
+        return self.rate_estimator.fs
+    
+    def _update_sampling_rate(self, elapsed_time):
+        """Perbarui estimasi laju sampling dan desain ulang filter jika bergeser."""
+        fs = self.rate_estimator.update(elapsed_time)
+        if abs(fs - self.stream_filter.fs) > self.rate_tolerance * self.stream_filter.fs:
+            # Dibulatkan ke 0.5 Hz agar desain filter dipakai ulang dari cache
+            fs = max(1.0, round(fs * 2) / 2)
+            self.stream_filter.set_sampling_rate(fs)
+            self._resample_spectrum(fs)
+            if self.extractor is not None:
+                self.extractor.set_sampling_rate(fs)
+    
+    def _resample_spectrum(self, fs):
+        """
+        Pindahkan sliding DFT ke laju grid fs.
+        
+        Riwayat output filter di-resample ke grid baru yang berakhir pada
+        sampel terakhir, dan grid streaming berlanjut dari sampel yang sama,
+        sehingga isi jendela DFT tetap berjarak tepat 1/fs.
+        """
+        self.spectrum_sampler.set_sampling_rate(fs)
+        time_array, filtered = self._stream_output()
+        _, history = resample_uniform(time_array, filtered, fs, anchor='end')
+        self.spectrum.set_sampling_rate(fs, history)
     
     def _validate_rgb_values(self, r, g, b):
         """
@@ -83,7 +154,7 @@ class RPPGSignalProcessor:
         
         return (r, g, b)
     
-    def process_roi(self, roi, timestamp):
+    def process_roi(self, roi, timestamp, roi_stats=None, rect=None):
         """
         Proses ROI untuk mendapatkan sinyal rPPG dengan preprocessing yang lebih baik.
         
@@ -93,6 +164,11 @@ class RPPGSignalProcessor:
             Region of Interest dari frame video
         timestamp : float
             Waktu pengambilan frame dalam detik
+        roi_stats : ROIStatistics, opsional
+            Statistik integral image frame; jika diberikan bersama rect,
+            rata-rata warna diambil dari sini tanpa membaca ulang piksel ROI
+        rect : tuple, opsional
+            (x, y, w, h) ROI dalam koordinat frame
             
         Returns
         -------
@@ -107,14 +183,24 @@ class RPPGSignalProcessor:
             self.start_time = timestamp
         
         try:
-            # Preprocessing ROI untuk kualitas sinyal yang lebih baik
-            # Gunakan gaussian blur untuk mengurangi noise spasial
-            roi_blurred = cv2.GaussianBlur(roi, (5, 5), 0)
-            
-            # Ekstrak nilai rata-rata RGB dari ROI yang sudah di-blur
-            mean_b = np.mean(roi_blurred[:, :, 0])
-            mean_g = np.mean(roi_blurred[:, :, 1])
-            mean_r = np.mean(roi_blurred[:, :, 2])
+            # Blur tidak mengubah rata-rata secara berarti, jadi rata-rata
+            # diambil langsung (dari integral image jika tersedia)
+            use_stats = roi_stats is not None and rect is not None
+            if self.extractor is not None:
+                # Rata-rata RGB per patch; rata-rata ROI diturunkan dari patch
+                patch_means = None
+                if use_stats:
+                    patch_bgr = roi_stats.grid_means(rect, *self.extractor.grid)
+                    if patch_bgr is not None:
+                        patch_means = patch_bgr[:, ::-1]
+                if patch_means is None:
+                    patch_means = self.extractor.patch_means(roi)
+                mean_r, mean_g, mean_b = patch_means.mean(axis=0)
+            else:
+                if use_stats:
+                    mean_b, mean_g, mean_r = roi_stats.mean(rect)
+                else:
+                    mean_b, mean_g, mean_r = cv2.mean(roi)[:3]
             
             # Validasi nilai RGB
             validated_rgb = self._validate_rgb_values(mean_r, mean_g, mean_b)
@@ -122,15 +208,27 @@ class RPPGSignalProcessor:
                 return None
             
             mean_r, mean_g, mean_b = validated_rgb
+            elapsed_time = timestamp - self.start_time
+            self._update_sampling_rate(elapsed_time)
             
-            # Simpan nilai dan waktu ke buffer
-            self.r_buffer[self.current_idx] = mean_r
-            self.g_buffer[self.current_idx] = mean_g
-            self.b_buffer[self.current_idx] = mean_b
-            self.time_buffer[self.current_idx] = timestamp - self.start_time
+            if self.extractor is not None:
+                # Proyeksi POS/CHROM per patch lalu fusi berbobot SNR
+                pulse = self.extractor.update(patch_means)
+            else:
+                # Normalisasi dengan rata-rata berjalan lalu kombinasi Green-Red
+                r_n = mean_r / self.r_mean.update(mean_r)
+                g_n = mean_g / self.g_mean.update(mean_g)
+                pulse = g_n - 0.5 * r_n
+            
+            filtered = self.stream_filter.update(pulse)
+            for value in self.spectrum_sampler.update(elapsed_time, filtered):
+                self.spectrum.update(value)
+            
+            # Simpan waktu, nilai RGB, pulsa mentah, dan output filter ke ring buffer
+            self.buffer.append((elapsed_time, mean_r, mean_g, mean_b, pulse, filtered))
             
-            # Perbarui indeks, reset jika mencapai akhir buffer
-            self.current_idx = (self.current_idx + 1) % self.buffer_size
+            # Sampel baru: hasil komputasi generasi sebelumnya tidak berlaku
+            self.result_cache.invalidate()
             
             # Nilai rPPG yang belum difilter - menggunakan kanal hijau
             return mean_g
@@ -139,79 +237,143 @@ class RPPGSignalProcessor:
             print(f"Warning: Error dalam process_roi rPPG: {e}")
             return None
     
-    def get_filtered_signal(self):
+    def get_filtered_signal(self, zero_phase=False):
         """
-        Dapatkan sinyal rPPG yang telah difilter dengan algoritma yang dioptimasi.
+        Dapatkan sinyal rPPG yang telah difilter.
+        
+        Secara default mengembalikan output filter streaming yang sudah
+        dihitung per sampel. Pemfilteran zero-phase pada seluruh buffer
+        hanya dijalankan jika diminta (mis. saat export data).
+        
+        Hasil di-cache per generasi sampai process_roi menambah sampel baru;
+        array yang dikembalikan dipakai bersama dan tidak boleh diubah.
+        
+        Parameter
+        ----------
+        zero_phase : bool, opsional
+            True untuk memfilter ulang seluruh buffer dengan filtfilt
         
         Returns
         -------
         tuple
             (time_array, signal_array) dari buffer saat ini
         """
-        # Reorder buffer berdasarkan indeks terbaru
-        if self.current_idx == 0:
-            time_array = self.time_buffer.copy()
-            r_array = self.r_buffer.copy()
-            g_array = self.g_buffer.copy()
-            b_array = self.b_buffer.copy()
-        else:
-            time_array = np.concatenate((self.time_buffer[self.current_idx:], 
-                                         self.time_buffer[:self.current_idx]))
-            r_array = np.concatenate((self.r_buffer[self.current_idx:], 
-                                      self.r_buffer[:self.current_idx]))
-            g_array = np.concatenate((self.g_buffer[self.current_idx:], 
-                                      self.g_buffer[:self.current_idx]))
-            b_array = np.concatenate((self.b_buffer[self.current_idx:], 
-                                      self.b_buffer[:self.current_idx]))
+        # Satu hasil per generasi dipakai bersama oleh semua konsumen
+        compute = self._filter_batch if zero_phase else self._stream_output
+        return self.result_cache.get(('filtered', zero_phase), compute)
+    
+    def _stream_output(self):
+        """
+        Output filter streaming dari sampel terlama ke terbaru (view tanpa salinan).
+        
+        Returns
+        -------
+        tuple
+            (time_array, signal_array) untuk sampel valid di buffer
+        """
+        return self.buffer.column('time'), self.buffer.column('filtered')
+    
+    def get_uniform_signal(self):
+        """
+        Sinyal rPPG terfilter yang diinterpolasi ke grid waktu seragam.
+        
+        Grid memakai laju sampling efektif terukur sehingga estimasi
+        frekuensi tetap benar saat FPS kamera turun atau tidak stabil.
+        
+        Returns
+        -------
+        tuple
+            (time_array, signal_array, fs) dengan fs laju grid dalam Hz
+        """
+        return self.result_cache.get('uniform', self._resample_output)
+    
+    def _resample_output(self):
+        """Resample output filter streaming ke grid seragam (lihat get_uniform_signal)."""
+        fs = self.effective_sampling_rate
+        time_array, signal_array = self.get_filtered_signal()
+        uniform_time, uniform_signal = resample_uniform(time_array, signal_array, fs)
+        return uniform_time, uniform_signal, fs
+    
+    def _combine_green_red(self, r_array, g_array, b_array, min_samples):
+        """
+        Kombinasi Green-Red dengan normalisasi median per kanal (metode 'green').
+        
+        Returns
+        -------
+        numpy.ndarray atau None
+            Sinyal gabungan, atau None jika harus fallback ke kanal hijau mentah
+        """
+        # Filter data yang valid (tidak nol)
+        valid_mask = (r_array > 0) & (g_array > 0) & (b_array > 0)
+        if np.sum(valid_mask) < min_samples:
+            # Tidak cukup data valid, gunakan simple green channel
+            return None
+        
+        # Gunakan hanya data yang valid
+        r_valid = r_array[valid_mask]
+        g_valid = g_array[valid_mask]
+        b_valid = b_array[valid_mask]
+        
+        # Normalisasi RGB yang robust
+        try:
+            # Gunakan percentile untuk normalisasi yang lebih robust
+            r_norm_val = np.percentile(r_valid, 50)  # Median
+            g_norm_val = np.percentile(g_valid, 50)
+            b_norm_val = np.percentile(b_valid, 50)
+            
+            # Pastikan nilai normalisasi tidak nol
+            if r_norm_val == 0 or g_norm_val == 0 or b_norm_val == 0:
+                # Fallback ke mean
+                r_norm_val = np.mean(r_valid)
+                g_norm_val = np.mean(g_valid)
+                b_norm_val = np.mean(b_valid)
+            
+            if r_norm_val > 0 and g_norm_val > 0 and b_norm_val > 0:
+                r_n = r_array / r_norm_val
+                g_n = g_array / g_norm_val
+                b_n = b_array / b_norm_val
+            else:
+                # Jika normalisasi gagal, gunakan raw green channel
+                return None
+                
+        except Exception as e:
+            print(f"Warning: Normalisasi RGB gagal: {e}")
+            # Fallback ke raw green channel
+            return None
+        
+        # Kombinasi kanal yang optimal untuk rPPG
+        # Menggunakan kombinasi Green-Red yang lebih sensitif
+        signal_array = g_n - 0.5 * r_n
+        return signal_array
+    
+    def _filter_batch(self):
+        """
+        Filter zero-phase pada seluruh buffer (resample, detrend, filtfilt, moving average).
+        
+        Returns
+        -------
+        tuple
+            (time_array, signal_array) pada grid waktu seragam
+        """
+        # Interpolasi kanal RGB dan pulsa ke grid seragam pada laju terukur sebelum filter
+        fs = self.effective_sampling_rate
+        view = self.buffer.view()
+        time_array, channels = resample_uniform(view[0], view[1:5], fs)
+        r_array, g_array, b_array, pulse_array = channels
         
         # Setidaknya butuh 3 detik data untuk proses yang berguna
-        min_samples = self.sampling_rate * 3
+        min_samples = fs * 3
         if len(g_array) < min_samples:
             return time_array, g_array
         
         try:
-            # Filter data yang valid (tidak nol)
-            valid_mask = (r_array > 0) & (g_array > 0) & (b_array > 0)
-            if np.sum(valid_mask) < min_samples:
-                # Tidak cukup data valid, gunakan simple green channel
-                return time_array, g_array
-            
-            # Gunakan hanya data yang valid
-            r_valid = r_array[valid_mask]
-            g_valid = g_array[valid_mask]
-            b_valid = b_array[valid_mask]
-            
-            # Normalisasi RGB yang robust
-            try:
-                # Gunakan percentile untuk normalisasi yang lebih robust
-                r_norm_val = np.percentile(r_valid, 50)  # Median
-                g_norm_val = np.percentile(g_valid, 50)
-                b_norm_val = np.percentile(b_valid, 50)
-                
-                # Pastikan nilai normalisasi tidak nol
-                if r_norm_val == 0 or g_norm_val == 0 or b_norm_val == 0:
-                    # Fallback ke mean
-                    r_norm_val = np.mean(r_valid)
-                    g_norm_val = np.mean(g_valid)
-                    b_norm_val = np.mean(b_valid)
-                
-                if r_norm_val > 0 and g_norm_val > 0 and b_norm_val > 0:
-                    r_n = r_array / r_norm_val
-                    g_n = g_array / g_norm_val
-                    b_n = b_array / b_norm_val
-                else:
-                    # Jika normalisasi gagal, gunakan raw green channel
-                    signal_array = g_array
-                    return time_array, signal_array
-                    
-            except Exception as e:
-                print(f"Warning: Normalisasi RGB gagal: {e}")
-                # Fallback ke raw green channel
-                return time_array, g_array
-            
-            # Kombinasi kanal yang optimal untuk rPPG
-            # Menggunakan kombinasi Green-Red yang lebih sensitif
-            signal_array = g_n - 0.5 * r_n
+            if self.extractor is not None:
+                # Sinyal pulsa hasil fusi patch (POS/CHROM) sudah ternormalisasi
+                signal_array = pulse_array
+            else:
+                signal_array = self._combine_green_red(r_array, g_array, b_array, min_samples)
+                if signal_array is None:
+                    return time_array, g_array
             
             # Validasi sinyal sebelum filtering
             if not np.all(np.isfinite(signal_array)):
@@ -227,7 +389,7 @@ class RPPGSignalProcessor:
                 return time_array, g_array
             
             # Bandpass filter untuk sinyal denyut jantung
-            signal_array = bandpass_filter(signal_array, 0.8, 3.0, self.sampling_rate)
+            signal_array = bandpass_filter(signal_array, 0.8, 3.0, fs)
             
             # Jika filter menghasilkan array kosong, return simple green
             if len(signal_array) == 0:
@@ -263,11 +425,15 @@ class RPPGSignalProcessor:
         float
             Perkiraan denyut jantung dalam BPM, atau None jika data tidak cukup
         """
-        # Dapatkan sinyal yang telah difilter
-        _, signal = self.get_filtered_signal()
+        return self.result_cache.get('heart_rate', self._compute_heart_rate)
+    
+    def _compute_heart_rate(self):
+        """Hitung estimasi denyut jantung tanpa cache (lihat estimate_heart_rate)."""
+        # Sinyal terfilter pada grid seragam dengan laju terukur
+        _, signal, fs = self.get_uniform_signal()
         
         # Butuh setidaknya 5 detik data untuk estimasi yang berguna
-        min_samples = self.sampling_rate * 5
+        min_samples = fs * 5
         if len(signal) < min_samples:
             return None
         
@@ -279,13 +445,13 @@ class RPPGSignalProcessor:
             # Multi-method estimation untuk akurasi yang lebih baik
             heart_rates = []
             
-            # Method 1: FFT-based (primary method)
-            fft_hr = self._estimate_fft_heart_rate(signal)
-            if fft_hr is not None:
-                heart_rates.append(fft_hr)
+            # Method 1: Spektral pita sempit (primary method)
+            spectral_hr = self._estimate_spectral_heart_rate()
+            if spectral_hr is not None:
+                heart_rates.append(spectral_hr)
             
             # Method 2: Peak detection (secondary validation)
-            peak_hr = self._estimate_peak_heart_rate(signal)
+            peak_hr = self._estimate_peak_heart_rate(signal, fs)
             if peak_hr is not None:
                 heart_rates.append(peak_hr)
             
@@ -315,42 +481,29 @@ class RPPGSignalProcessor:
             print(f"Warning: Error dalam estimasi heart rate: {e}")
             return None
     
-    def _estimate_fft_heart_rate(self, signal):
-        """Estimasi heart rate menggunakan FFT."""
+    def _estimate_spectral_heart_rate(self):
+        """Estimasi heart rate dari puncak sliding DFT pada pita 50-130 BPM."""
         try:
-            n = len(signal)
-            fft_data = np.abs(np.fft.rfft(signal))
-            freqs = np.fft.rfftfreq(n, 1 / self.sampling_rate)
-            
-            # Range frekuensi heart rate (50-130 BPM)
-            valid_idx = np.where((freqs >= 0.83) & (freqs <= 2.17))[0]
-            if len(valid_idx) == 0:
+            peak_freq = self.spectrum.peak_frequency()
+            if peak_freq is None:
                 return None
-            
-            valid_fft = fft_data[valid_idx]
-            valid_freqs = freqs[valid_idx]
-            
-            # Cari frekuensi dengan amplitude tertinggi
-            max_idx = np.argmax(valid_fft)
-            dominant_freq = valid_freqs[max_idx]
-            
-            return dominant_freq * 60
+            return peak_freq * 60
         except:
             return None
     
-    def _estimate_peak_heart_rate(self, signal):
-        """Estimasi heart rate menggunakan peak detection."""
+    def _estimate_peak_heart_rate(self, signal, fs):
+        """Estimasi heart rate menggunakan peak detection pada sinyal dengan laju sampling fs."""
         try:
             from scipy.signal import find_peaks
             
             # Deteksi peaks dengan parameter yang dioptimasi
             peaks, _ = find_peaks(signal, 
-                                distance=self.sampling_rate//3,  # Min 200ms between peaks
+                                distance=max(1, int(fs // 3)),  # Min 333ms between peaks
                                 height=np.std(signal)*0.3)       # Threshold berdasarkan std
             
             if len(peaks) >= 3:
                 # Gunakan median interval untuk robustness
-                peak_intervals = np.diff(peaks) / self.sampling_rate
+                peak_intervals = np.diff(peaks) / fs
                 
                 # Filter interval yang masuk akal
                 valid_intervals = peak_intervals[(peak_intervals >= 0.46) & 
@@ -373,9 +526,13 @@ class RPPGSignalProcessor:
         str
             Rating kualitas: 'Excellent', 'Good', 'Fair', 'Poor'
         """
-        _, signal = self.get_filtered_signal()
+        return self.result_cache.get('signal_quality', self._compute_signal_quality)
+    
+    def _compute_signal_quality(self):
+        """Hitung evaluasi kualitas sinyal tanpa cache (lihat get_signal_quality)."""
+        _, signal, fs = self.get_uniform_signal()
         
-        if len(signal) < self.sampling_rate * 3:
+        if len(signal) < fs * 3:
             return 'Poor'
         
         try:
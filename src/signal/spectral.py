@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modul estimasi spektral terbatas pita untuk estimasi laju (denyut jantung, napas).
+Hanya pita frekuensi yang relevan yang dievaluasi: zoom DFT (chirp-z) untuk
+analisis sekali jalan dan sliding DFT yang diperbarui per sampel untuk
+pemrosesan real-time, keduanya dengan interpolasi puncak parabolik.
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+def parabolic_interpolation(values, idx):
+    """
+    Interpolasi parabolik puncak dari tiga titik di sekitar indeks maksimum.
+    
+    Parameter
+    ----------
+    values : numpy.ndarray
+        Nilai spektrum (magnitudo)
+    idx : int
+        Indeks maksimum diskrit
+    
+    Returns
+    -------
+    tuple
+        (offset, peak_value) dengan offset dalam satuan bin pada range [-0.5, 0.5]
+    """
+    if idx <= 0 or idx >= len(values) - 1:
+        return 0.0, float(values[idx])
+    
+    left, center, right = values[idx - 1], values[idx], values[idx + 1]
+    denom = left - 2 * center + right
+    if denom == 0:
+        return 0.0, float(center)
+    
+    offset = 0.5 * (left - right) / denom
+    offset = max(-0.5, min(0.5, offset))
+    peak_value = center - 0.25 * (left - right) * offset
+    return float(offset), float(peak_value)
+
+
+def _band_frequencies(f_low, f_high, resolution):
+    """Grid frekuensi seragam pada pita [f_low, f_high] dengan jarak resolution."""
+    n_bins = max(3, int(round((f_high - f_low) / resolution)) + 1)
+    return np.linspace(f_low, f_high, n_bins)
+
+
+def zoom_dft(signal, fs, f_low, f_high, resolution=None):
+    """
+    DFT hanya pada pita frekuensi [f_low, f_high] menggunakan chirp-z transform.
+    
+    Parameter
+    ----------
+    signal : numpy.ndarray
+        Sinyal dengan laju sampling seragam
+    fs : float
+        Laju sampling dalam Hz
+    f_low, f_high : float
+        Batas pita frekuensi dalam Hz
+    resolution : float, opsional
+        Jarak antar bin dalam Hz, default seperempat resolusi DFT biasa (fs / n)
+    
+    Returns
+    -------
+    tuple
+        (freqs, spectrum) dengan spectrum kompleks sum x[m] * exp(-j 2 pi f m / fs)
+    """
+    signal = np.asarray(signal, dtype=np.float64)
+    if resolution is None:
+        resolution = fs / max(1, len(signal)) / 4
+    freqs = _band_frequencies(f_low, f_high, resolution)
+    
+    # Import lazy agar scipy tidak dimuat saat startup aplikasi
+    from scipy.signal import zoom_fft
+    spectrum = zoom_fft(signal, [freqs[0], freqs[-1]], m=len(freqs), fs=fs, endpoint=True)
+    return freqs, spectrum
+
+
+def band_peak_frequency(signal, fs, f_low, f_high, resolution=None):
+    """
+    Frekuensi dominan dalam pita menggunakan zoom DFT dan interpolasi parabolik.
+    
+    Parameter
+    ----------
+    signal : numpy.ndarray
+        Sinyal dengan laju sampling seragam
+    fs : float
+        Laju sampling dalam Hz
+    f_low, f_high : float
+        Batas pita frekuensi dalam Hz
+    resolution : float, opsional
+        Jarak antar bin dalam Hz (lihat zoom_dft)
+    
+    Returns
+    -------
+    float atau None
+        Frekuensi puncak dalam Hz, atau None jika sinyal tidak valid
+    """
+    signal = np.asarray(signal, dtype=np.float64)
+    if len(signal) < 4 or not np.all(np.isfinite(signal)):
+        return None
+    
+    # Hann window mengurangi kebocoran spektral dari komponen di luar pita
+    windowed = (signal - np.mean(signal)) * np.hanning(len(signal))
+    freqs, spectrum = zoom_dft(windowed, fs, f_low, f_high, resolution)
+    magnitudes = np.abs(spectrum)
+    if np.max(magnitudes) == 0:
+        return None
+    
+    idx = int(np.argmax(magnitudes))
+    offset, _ = parabolic_interpolation(magnitudes, idx)
+    return float(freqs[idx] + offset * (freqs[1] - freqs[0]))
+
+
+class SlidingDFT:
+    """
+    Sliding DFT terbatas pita yang diperbarui O(K) per sampel.
+    
+    Menyimpan K bin kompleks S(f) = sum x[i] * exp(-j 2 pi f i / fs) untuk
+    sampel dalam jendela geser. Setiap sampel baru ditambahkan dan sampel
+    terlama dikurangkan, sehingga spektrum pita selalu tersedia tanpa FFT
+    ulang seluruh buffer. Bin tidak harus kelipatan fs / N, sehingga grid
+    bisa lebih rapat (zoom) dari resolusi DFT biasa.
+    """
+    
+    # Indeks fasor di-rebase berkala agar error pembulatan tidak terakumulasi
+    _REBASE_INTERVAL = 10000
+    
+    def __init__(self, window_size, fs, f_low, f_high, resolution=None):
+        """
+        Parameter
+        ----------
+        window_size : int
+            Jumlah sampel dalam jendela
+        fs : float
+            Laju sampling dalam Hz
+        f_low, f_high : float
+            Batas pita frekuensi dalam Hz
+        resolution : float, opsional
+            Jarak antar bin dalam Hz, default seperempat fs / window_size
+        """
+        self.window_size = max(4, int(window_size))
+        self.f_low = f_low
+        self.f_high = f_high
+        self.resolution = resolution
+        self._window = deque(maxlen=self.window_size)
+        self.set_sampling_rate(fs)
+    
+    def set_sampling_rate(self, fs, samples=None):
+        """
+        Ganti laju sampling; bin dihitung ulang dari sampel dalam jendela.
+        
+        Sampel lama berjarak 1 / fs lama, sehingga sebaiknya diganti dengan
+        riwayat yang sudah di-resample ke laju baru.
+        
+        Parameter
+        ----------
+        fs : float
+            Laju sampling baru dalam Hz
+        samples : array_like, opsional
+            Isi jendela baru dengan jarak 1 / fs (hanya window_size sampel
+            terakhir yang dipakai), default sampel jendela saat ini
+        """
+        if samples is not None:
+            self._window.clear()
+            self._window.extend(np.asarray(samples, dtype=np.float64)[-self.window_size:])
+        self.fs = float(fs)
+        resolution = self.resolution or self.fs / self.window_size / 4
+        self.freqs = _band_frequencies(self.f_low, self.f_high, resolution)
+        self._omega = 2 * np.pi * self.freqs / self.fs
+        self._step = np.exp(-1j * self._omega)
+        self._rebuild()
+    
+    def reset(self):
+        """Kosongkan jendela dan spektrum."""
+        self._window.clear()
+        self._rebuild()
+    
+    def _rebuild(self):
+        """Hitung ulang bin dari isi jendela dengan indeks mulai dari nol."""
+        n = len(self._window)
+        if n > 0:
+            # Zoom DFT satu kali; sampel terlama berindeks 0
+            _, self._bins = zoom_dft(np.fromiter(self._window, dtype=np.float64, count=n),
+                                     self.fs, self.freqs[0], self.freqs[-1],
+                                     self.freqs[1] - self.freqs[0])
+        else:
+            self._bins = np.zeros(len(self.freqs), dtype=np.complex128)
+        # Fasor untuk sampel berikutnya (indeks n) dan sampel terlama (indeks 0)
+        self._phasor_new = np.exp(-1j * self._omega * n)
+        self._phasor_old = np.ones(len(self.freqs), dtype=np.complex128)
+        self._count_since_rebase = 0
+    
+    @property
+    def count(self):
+        """Jumlah sampel dalam jendela."""
+        return len(self._window)
+    
+    def update(self, x):
+        """
+        Tambahkan satu sampel ke jendela.
+        
+        Parameter
+        ----------
+        x : float
+            Sampel baru (diasumsikan berjarak 1 / fs dari sampel sebelumnya)
+        """
+        if len(self._window) == self.window_size:
+            # Keluarkan sampel terlama beserta kontribusinya
+            old = self._window[0]
+            self._bins -= old * self._phasor_old
+            self._phasor_old *= self._step
+        
+        self._window.append(x)
+        self._bins += x * self._phasor_new
+        self._phasor_new *= self._step
+        
+        self._count_since_rebase += 1
+        if self._count_since_rebase >= self._REBASE_INTERVAL:
+            self._rebuild()
+    
+    def magnitudes(self):
+        """
+        Magnitudo spektrum pita saat ini.
+        
+        Returns
+        -------
+        tuple
+            (freqs, magnitudes)
+        """
+        return self.freqs, np.abs(self._bins)
+    
+    def peak_frequency(self):
+        """
+        Frekuensi dominan dalam pita dengan interpolasi parabolik.
+        
+        Returns
+        -------
+        float atau None
+            Frekuensi puncak dalam Hz, atau None jika spektrum kosong
+        """
+        _, magnitudes = self.magnitudes()
+        if len(self._window) == 0 or not np.all(np.isfinite(magnitudes)):
+            return None
+        
+        idx = int(np.argmax(magnitudes))
+        if magnitudes[idx] == 0:
+            return None
+        
+        offset, _ = parabolic_interpolation(magnitudes, idx)
+        return float(self.freqs[idx] + offset * (self.freqs[1] - self.freqs[0]))
@@ -0,0 +1,652 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modul benchmark pipeline frame tanpa kamera.
+Memutar ulang fixture (frame sintetis atau video rekaman) melalui
+FramePipeline yang sama dengan aplikasi, lalu melaporkan persentil latensi per tahap, throughput, dan alokasi memori per
+frame, serta membandingkannya dengan baseline untuk mendeteksi regresi.
+"""
+
+import json
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from src.signal.respiration import RespirationSignalProcessor
+from src.signal.rppg import RPPGSignalProcessor
+from src.utils.metrics import MetricsRegistry
+from src.utils.utils import BENCHMARK_CONFIG
+from src.video.pipeline import FramePipeline
+from src.video.processor import FrameContext
+
+# Urutan tahap pipeline yang diukur
+STAGES = ('detect', 'filter', 'estimate', 'render')
+
+# Timer FramePipeline per tahap; 'render' adalah sisa frame.total
+STAGE_METRICS = {
+    'detect': ('analyze_frame',),
+    'filter': ('rppg.process_roi', 'rppg.get_filtered_signal',
+               'resp.process_roi', 'resp.get_filtered_signal'),
+    'estimate': ('rppg.estimate', 'resp.estimate'),
+}
+
+
+class SyntheticFixture:
+    """
+    Fixture frame sintetis deterministik dengan ground truth laju.
+    
+    Frame berisi latar bertekstur, wajah dengan modulasi warna kulit sesuai
+    denyut jantung, dan area dada bertekstur yang bergeser vertikal sesuai
+    napas. Posisi ROI diketahui sehingga benchmark tetap dapat berjalan
+    tanpa detektor MediaPipe.
+    """
+    
+    def __init__(self, n_frames=None, fps=None, width=None, height=None,
+                 heart_rate=72.0, resp_rate=15.0, seed=0):
+        """
+        Parameter
+        ----------
+        n_frames : int, opsional
+            Jumlah frame, default dari BENCHMARK_CONFIG
+        fps : float, opsional
+            Laju frame dalam Hz, default dari BENCHMARK_CONFIG
+        width, height : int, opsional
+            Ukuran frame, default dari BENCHMARK_CONFIG
+        heart_rate : float, opsional
+            Denyut jantung sintetis dalam BPM, default 72
+        resp_rate : float, opsional
+            Laju napas sintetis dalam napas/menit, default 15
+        seed : int, opsional
+            Seed generator noise, default 0
+        """
+        self.n_frames = n_frames or BENCHMARK_CONFIG['frames']
+        self.fps = float(fps or BENCHMARK_CONFIG['fps'])
+        self.width = width or BENCHMARK_CONFIG['width']
+        self.height = height or BENCHMARK_CONFIG['height']
+        self.seed = seed
+        self.name = f"synthetic_{self.width}x{self.height}"
+        self.truth = {'heart_rate': float(heart_rate), 'resp_rate': float(resp_rate)}
+        
+        rng = np.random.default_rng(seed)
+        w, h = self.width, self.height
+        
+        # Latar bertekstur (noise yang dihaluskan)
+        background = rng.integers(40, 200, (h, w, 3), dtype=np.uint8)
+        self._background = cv2.GaussianBlur(background, (0, 0), 3)
+        
+        # Geometri ROI relatif terhadap ukuran frame
+        fw, fh = int(w * 0.19), int(h * 0.31)
+        fx, fy = (w - fw) // 2, int(h * 0.18)
+        self.rects = {
+            'face': (fx, fy, fw, fh),
+            'forehead': (fx + fw // 5, fy + fh // 10, fw * 3 // 5, int(fh * 0.25)),
+            'chest': (fx - fw // 2, fy + fh + fh // 6, fw * 2, int(h * 0.3)),
+        }
+        
+        # Masker elips kulit wajah
+        yy, xx = np.ogrid[:h, :w]
+        cx, cy = fx + fw / 2, fy + fh / 2
+        self._face_mask = ((xx - cx) / (fw / 2)) ** 2 + ((yy - cy) / (fh / 2)) ** 2 <= 1.0
+        self._skin = np.array([120.0, 150.0, 190.0])  # BGR
+        # Amplitudo pulsa per kanal (BGR): dominan hijau seperti sinyal PPG
+        self._pulse_gain = np.array([0.3, 1.0, 0.5])
+        
+        # Tekstur dada lebih tinggi dari ROI agar bisa digeser tanpa tepi kosong
+        cx, cy, cw, ch = self.rects['chest']
+        self._chest_margin = 8
+        texture = rng.integers(30, 220, (ch + 2 * self._chest_margin, cw, 3), dtype=np.uint8)
+        self._chest_texture = cv2.GaussianBlur(texture, (0, 0), 1.5)
+    
+    def __len__(self):
+        return self.n_frames
+    
+    def __iter__(self):
+        """
+        Hasilkan frame satu per satu.
+        
+        Yields
+        ------
+        tuple
+            (frame, timestamp, rects) dengan rects dict ROI ground truth
+        """
+        rng = np.random.default_rng(self.seed + 1)
+        hr_hz = self.truth['heart_rate'] / 60.0
+        rr_hz = self.truth['resp_rate'] / 60.0
+        cx, cy, cw, ch = self.rects['chest']
+        margin = self._chest_margin
+        n_skin = int(np.count_nonzero(self._face_mask))
+        
+        for i in range(self.n_frames):
+            t = i / self.fps
+            frame = self._background.copy()
+            
+            # Warna kulit + pulsa + noise sensor
+            pulse = np.sin(2 * np.pi * hr_hz * t)
+            skin = self._skin + pulse * self._pulse_gain + rng.normal(0, 0.5, (n_skin, 3))
+            frame[self._face_mask] = np.clip(np.rint(skin), 0, 255).astype(np.uint8)
+            
+            # Dada bergeser vertikal (sub-piksel) mengikuti napas
+            shift = 3.0 * np.sin(2 * np.pi * rr_hz * t)
+            matrix = np.float32([[1, 0, 0], [0, 1, shift - margin]])
+            frame[cy:cy + ch, cx:cx + cw] = cv2.warpAffine(
+                self._chest_texture, matrix, (cw, ch), flags=cv2.INTER_LINEAR,
+                borderMode=cv2.BORDER_REFLECT)
+            
+            yield frame, t, self.rects
+
+
+class VideoFixture:
+    """
+    Fixture dari file video rekaman.
+    
+    Seluruh frame (hingga max_frames) dimuat ke memori terlebih dahulu agar
+    waktu decode video tidak ikut terukur. Tidak ada ground truth ROI,
+    sehingga fixture ini membutuhkan detektor.
+    """
+    
+    def __init__(self, path, max_frames=None):
+        """
+        Parameter
+        ----------
+        path : str
+            Path file video
+        max_frames : int, opsional
+            Batas jumlah frame yang dimuat, default dari BENCHMARK_CONFIG
+        """
+        max_frames = max_frames or BENCHMARK_CONFIG['frames']
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            raise RuntimeError(f"Tidak dapat membuka video: {path}")
+        
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        self.fps = float(fps) if fps and np.isfinite(fps) and fps > 0 else 30.0
+        self.frames = []
+        try:
+            while len(self.frames) < max_frames:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                self.frames.append(frame)
+        finally:
+            cap.release()
+        
+        if not self.frames:
+            raise RuntimeError(f"Video tidak berisi frame: {path}")
+        
+        self.n_frames = len(self.frames)
+        self.height, self.width = self.frames[0].shape[:2]
+        self.name = path
+        self.truth = None
+        self.rects = None
+    
+    def __len__(self):
+        return self.n_frames
+    
+    def __iter__(self):
+        for i, frame in enumerate(self.frames):
+            yield frame, i / self.fps, None
+
+
+def _percentiles(samples_ms):
+    """Ringkasan persentil (ms) dari daftar durasi."""
+    values = np.asarray(samples_ms, dtype=np.float64)
+    if len(values) == 0:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'mean': 0.0, 'max': 0.0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99),
+            'mean': float(values.mean()), 'max': float(values.max())}
+
+
+class _FrameStageRegistry(MetricsRegistry):
+    """
+    Registry metrik FramePipeline yang juga menyimpan durasi timer frame terakhir.
+    
+    Histogram bergulir hanya menyimpan window_size sampel terakhir, sedangkan
+    benchmark membutuhkan durasi setiap frame; frame_times berisi jumlah
+    durasi per nama timer sejak begin_frame().
+    """
+    
+    def __init__(self):
+        super().__init__(enabled=True)
+        self.frame_times = {}
+    
+    def begin_frame(self):
+        """Mulai pencatatan durasi frame baru."""
+        self.frame_times = {}
+    
+    def record(self, name, value_ms):
+        self.frame_times[name] = self.frame_times.get(name, 0.0) + value_ms
+        super().record(name, value_ms)
+    
+    def stage(self, names):
+        """Jumlah durasi (ms) timer bernama pada frame terakhir."""
+        return sum(self.frame_times.get(name, 0.0) for name in names)
+
+
+class PipelineBenchmark:
+    """
+    Pemutar ulang fixture melalui FramePipeline yang sama dengan aplikasi.
+    
+    Setiap frame diproses oleh FramePipeline.process_frame, sehingga
+    perubahan pada pipeline (estimate_interval, frame_ring, recorder, dan
+    sebagainya) ikut terukur. Durasi tahap diambil dari timer pipeline itu
+    sendiri: detect (analyze_frame), filter (process_roi termasuk integral
+    image ROI, dan pembacaan sinyal terfilter), estimate (estimasi laju),
+    dan render (sisa frame.total: salinan frame, overlay ROI, salinan
+    sinyal untuk GUI).
+    """
+    
+    def __init__(self, fixture, use_detector=None):
+        """
+        Parameter
+        ----------
+        fixture : SyntheticFixture atau VideoFixture
+            Sumber frame
+        use_detector : bool, opsional
+            Jalankan VideoProcessor; jika False (atau MediaPipe tidak
+            tersedia) dipakai ROI ground truth dari fixture. Default True
+            hanya untuk fixture tanpa ground truth (video), karena detektor
+            belum tentu mengenali wajah sintetis.
+        """
+        self.fixture = fixture
+        if use_detector is None:
+            use_detector = fixture.rects is None
+        
+        video_processor = None
+        if use_detector:
+            try:
+                from src.video.processor import VideoProcessor
+                # Pose sinkron agar hasil deterministik tanpa pacing real-time
+                video_processor = VideoProcessor(async_pose=False)
+            except ImportError as e:
+                if fixture.rects is None:
+                    raise RuntimeError(f"Detektor tidak tersedia untuk fixture video: {e}")
+                print(f"Warning: Detektor tidak tersedia ({e}), memakai ROI ground truth")
+        elif fixture.rects is None:
+            raise RuntimeError("Fixture video membutuhkan detektor")
+        self.video_processor = video_processor
+        
+        self.metrics = _FrameStageRegistry()
+        self.pipeline = FramePipeline(
+            resp_processor=RespirationSignalProcessor(sampling_rate=fixture.fps),
+            rppg_processor=RPPGSignalProcessor(sampling_rate=fixture.fps),
+            video_processor=video_processor,
+            metrics=self.metrics,
+        )
+    
+    def reset(self):
+        """Reset state pipeline (processor sinyal dan tracking)."""
+        self.pipeline.reset()
+        self.metrics.reset()
+    
+    def _truth_context(self, frame, rects):
+        """FrameContext berisi ROI ground truth fixture (pengganti analyze_frame)."""
+        context = FrameContext(frame)
+        context.face_rect = rects['face']
+        for key in ('forehead', 'chest'):
+            x, y, w, h = rects[key]
+            setattr(context, key, (frame[y:y + h, x:x + w], rects[key]))
+        return context
+    
+    def process_frame(self, frame, timestamp, rects, durations=None):
+        """
+        Proses satu frame dengan FramePipeline dan catat durasi per tahap.
+        
+        Parameter
+        ----------
+        frame : numpy.ndarray
+            Frame video BGR
+        timestamp : float
+            Timestamp frame dalam detik
+        rects : dict atau None
+            ROI ground truth dari fixture
+        durations : dict, opsional
+            Dict tahap -> list durasi (ms) yang ditambahkan hasil pengukuran
+        
+        Returns
+        -------
+        dict
+            Hasil FramePipeline.process_frame
+        """
+        context = None
+        if self.video_processor is None:
+            context = self._truth_context(frame, rects)
+        
+        metrics = self.metrics
+        metrics.begin_frame()
+        result = self.pipeline.process_frame(frame, timestamp, context=context)
+        
+        if durations is not None:
+            measured = 0.0
+            for stage, names in STAGE_METRICS.items():
+                elapsed = metrics.stage(names)
+                durations[stage].append(elapsed)
+                measured += elapsed
+            durations['render'].append(max(0.0, metrics.stage(('frame.total',)) - measured))
+        return result
+    
+    def run(self, warmup=None, alloc_frames=None):
+        """
+        Jalankan benchmark lengkap: warm-up, pengukuran waktu, dan pengukuran alokasi.
+        
+        Pengukuran alokasi memakai tracemalloc pada putaran terpisah karena
+        tracing memperlambat eksekusi dan akan mengotori persentil latensi.
+        
+        Parameter
+        ----------
+        warmup : int, opsional
+            Jumlah frame awal yang tidak diukur, default dari BENCHMARK_CONFIG
+        alloc_frames : int, opsional
+            Jumlah frame putaran tracemalloc, default dari BENCHMARK_CONFIG
+        
+        Returns
+        -------
+        dict
+            Laporan benchmark (lihat format_report)
+        """
+        if warmup is None:
+            warmup = BENCHMARK_CONFIG['warmup_frames']
+        if alloc_frames is None:
+            alloc_frames = BENCHMARK_CONFIG['alloc_frames']
+        
+        durations = {stage: [] for stage in STAGES}
+        totals = []
+        result = None
+        
+        self.reset()
+        measured = 0
+        detected = 0
+        wall_start = None
+        for i, (frame, timestamp, rects) in enumerate(self.fixture):
+            if i == warmup:
+                wall_start = time.perf_counter()
+            
+            frame_start = time.perf_counter()
+            result = self.process_frame(frame, timestamp, rects, durations if i >= warmup else None)
+            if i >= warmup:
+                totals.append((time.perf_counter() - frame_start) * 1000.0)
+                measured += 1
+                if result['face_rect'] is not None:
+                    detected += 1
+        
+        if measured == 0:
+            raise RuntimeError("Jumlah frame fixture tidak melebihi jumlah frame warm-up")
+        if detected == 0:
+            # Tanpa wajah tahap filter/estimate kosong dan laporan tidak bermakna
+            raise RuntimeError("Tidak ada wajah terdeteksi pada fixture; "
+                               "gunakan ROI ground truth (--no-detector) untuk fixture sintetis")
+        
+        # Throughput murni pemrosesan (tanpa waktu pembuatan frame sintetis)
+        processing_time = sum(totals) / 1000.0
+        wall_time = time.perf_counter() - wall_start
+        
+        allocations = self._measure_allocations(alloc_frames)
+        
+        report = {
+            'fixture': self.fixture.name,
+            'frame_size': [self.fixture.width, self.fixture.height],
+            'detector': self.video_processor is not None,
+            'frames': measured,
+            'detection_rate': detected / measured,
+            'stages': {stage: _percentiles(durations[stage]) for stage in STAGES},
+            'total': _percentiles(totals),
+            'throughput_fps': measured / processing_time if processing_time > 0 else 0.0,
+            'wall_fps': measured / wall_time if wall_time > 0 else 0.0,
+            'allocations': allocations,
+            'estimates': {'heart_rate': result['heart_rate'], 'resp_rate': result['resp_rate']},
+            'truth': self.fixture.truth,
+        }
+        return report
+    
+    def _measure_allocations(self, n_frames):
+        """Byte yang dialokasikan (puncak sementara dan yang tertahan) per frame."""
+        if n_frames <= 0:
+            return None
+        
+        peaks, retained = [], []
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        try:
+            # Lanjutkan dari state processor saat ini (buffer sudah penuh)
+            for i, (frame, timestamp, rects) in enumerate(self.fixture):
+                if i >= n_frames:
+                    break
+                # Timestamp digeser agar tetap monoton setelah putaran waktu
+                timestamp += self.fixture.n_frames / self.fixture.fps
+                before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                self.process_frame(frame, timestamp, rects)
+                after, peak = tracemalloc.get_traced_memory()
+                peaks.append(peak - before)
+                retained.append(after - before)
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+        
+        peaks = np.asarray(peaks, dtype=np.float64) / 1024.0
+        retained = np.asarray(retained, dtype=np.float64) / 1024.0
+        return {
+            'frames': len(peaks),
+            'peak_kb_mean': float(peaks.mean()),
+            'peak_kb_p95': float(np.percentile(peaks, 95)),
+            'retained_kb_mean': float(retained.mean()),
+        }
+
+
+def _iou(a, b):
+    """Intersection over union dua bbox (x, y, w, h)."""
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[0] + a[2], b[0] + b[2]), min(a[1] + a[3], b[1] + b[3])
+    inter = max(0, x2 - x1) * max(0, y2 - y1)
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union > 0 else 0.0
+
+
+def benchmark_detectors(fixture, names=None, scale=None, warmup=None):
+    """
+    Bandingkan latensi dan hasil backend detektor wajah pada fixture yang sama.
+    
+    Setiap backend dijalankan pada semua frame fixture (tanpa tracking),
+    sehingga latensi yang dilaporkan adalah biaya satu keyframe deteksi.
+    Backend yang gagal dimuat (mis. file model DNN tidak ada) dilaporkan
+    dengan pesan error dan dilewati.
+    
+    Parameter
+    ----------
+    fixture : SyntheticFixture atau VideoFixture
+        Sumber frame
+    names : sequence of str, opsional
+        Nama backend, default semua backend di FACE_DETECTORS
+    scale : float, opsional
+        Skala frame untuk deteksi, default dari ROI_CONFIG
+    warmup : int, opsional
+        Jumlah frame awal yang tidak diukur per backend
+    
+    Returns
+    -------
+    dict
+        Nama backend -> {'scale', 'latency' (persentil ms), 'detection_rate',
+        'iou' (rata-rata terhadap ground truth, None untuk fixture video)},
+        atau {'error': pesan} jika backend tidak tersedia
+    """
+    from src.video.detectors import FACE_DETECTORS, create_face_detector
+    
+    if warmup is None:
+        warmup = min(BENCHMARK_CONFIG['warmup_frames'], max(0, len(fixture) - 1))
+    frames = [(frame, rects) for frame, _, rects in fixture]
+    
+    results = {}
+    for name in names or FACE_DETECTORS:
+        try:
+            detector = create_face_detector(name, scale)
+        except Exception as e:
+            results[name] = {'error': str(e)}
+            continue
+        
+        durations, detected, ious = [], 0, []
+        try:
+            for i, (frame, rects) in enumerate(frames):
+                start = time.perf_counter()
+                faces = detector.detect(frame)
+                elapsed = (time.perf_counter() - start) * 1000.0
+                if i < warmup:
+                    continue
+                durations.append(elapsed)
+                if faces:
+                    detected += 1
+                    if rects is not None:
+                        ious.append(_iou(faces[0], rects['face']))
+        finally:
+            detector.close()
+        
+        measured = len(durations)
+        results[name] = {
+            'scale': detector.scale,
+            'latency': _percentiles(durations),
+            'detection_rate': detected / measured if measured else 0.0,
+            'iou': float(np.mean(ious)) if ious else None,
+        }
+    return results
+
+
+def format_detector_report(results):
+    """
+    Tabel perbandingan backend detektor wajah dari benchmark_detectors().
+    
+    Returns
+    -------
+    str
+        Satu baris per backend: skala, p50/p95 latensi, laju deteksi, IoU
+    """
+    lines = [f"{'Backend':<11}{'skala':>6}{'p50':>9}{'p95':>9}{'deteksi':>9}{'IoU':>7}  (ms)"]
+    for name, result in results.items():
+        if 'error' in result:
+            lines.append(f"{name:<11}tidak tersedia: {result['error']}")
+            continue
+        latency = result['latency']
+        iou = "-" if result['iou'] is None else f"{result['iou']:.2f}"
+        lines.append(f"{name:<11}{result['scale']:>6.2f}{latency['p50']:>9.3f}{latency['p95']:>9.3f}"
+                     f"{result['detection_rate']:>9.0%}{iou:>7}")
+    return "\n".join(lines)
+
+
+def compare_with_baseline(report, baseline, threshold=None, min_delta_ms=None):
+    """
+    Bandingkan laporan dengan baseline dan daftar metrik yang mengalami regresi.
+    
+    Latensi (p50 dan p95 per tahap dan total) dan alokasi puncak dianggap
+    regresi jika naik lebih dari threshold relatif; throughput jika turun
+    lebih dari threshold. Selisih latensi di bawah min_delta_ms diabaikan
+    sebagai noise timer.
+    
+    Parameter
+    ----------
+    report : dict
+        Laporan dari PipelineBenchmark.run()
+    baseline : dict
+        Laporan baseline dengan format yang sama
+    threshold : float, opsional
+        Perubahan relatif maksimum, default dari BENCHMARK_CONFIG
+    min_delta_ms : float, opsional
+        Selisih latensi absolut minimum, default dari BENCHMARK_CONFIG
+    
+    Returns
+    -------
+    list of tuple
+        (metrik, baseline, sekarang, perubahan relatif) untuk setiap regresi
+    """
+    if threshold is None:
+        threshold = BENCHMARK_CONFIG['regression_threshold']
+    if min_delta_ms is None:
+        min_delta_ms = BENCHMARK_CONFIG['min_delta_ms']
+    
+    def change(old, new):
+        return (new - old) / old if old > 0 else 0.0
+    
+    regressions = []
+    latency = [(f"{stage}.{key}", baseline['stages'].get(stage), report['stages'][stage], key)
+               for stage in STAGES for key in ('p50', 'p95')]
+    latency += [(f"total.{key}", baseline.get('total'), report['total'], key)
+                for key in ('p50', 'p95')]
+    for name, old_stats, new_stats, key in latency:
+        if not old_stats:
+            continue
+        old, new = old_stats[key], new_stats[key]
+        if new - old > min_delta_ms and change(old, new) > threshold:
+            regressions.append((name, old, new, change(old, new)))
+    
+    old, new = baseline.get('throughput_fps', 0.0), report['throughput_fps']
+    if old > 0 and new < old / (1 + threshold):
+        regressions.append(('throughput_fps', old, new, change(old, new)))
+    
+    old_alloc, new_alloc = baseline.get('allocations'), report.get('allocations')
+    if old_alloc and new_alloc:
+        old, new = old_alloc['peak_kb_mean'], new_alloc['peak_kb_mean']
+        if change(old, new) > threshold:
+            regressions.append(('allocations.peak_kb_mean', old, new, change(old, new)))
+    
+    return regressions
+
+
+def load_report(path):
+    """Baca laporan benchmark (baseline) dari file JSON."""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_report(report, path):
+    """Tulis laporan benchmark ke file JSON."""
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def format_report(report):
+    """
+    Ringkasan laporan benchmark dalam bentuk teks tabel.
+    
+    Parameter
+    ----------
+    report : dict
+        Laporan dari PipelineBenchmark.run()
+    
+    Returns
+    -------
+    str
+        Teks laporan
+    """
+    width, height = report['frame_size']
+    lines = [
+        f"Fixture    : {report['fixture']} ({width}x{height}, {report['frames']} frame)",
+        f"Detektor   : {'VideoProcessor' if report['detector'] else 'ROI ground truth'} "
+        f"(wajah pada {report.get('detection_rate', 1.0):.0%} frame)",
+        "",
+        f"{'Tahap':<10}{'p50':>9}{'p95':>9}{'p99':>9}{'mean':>9}{'max':>9}  (ms)",
+    ]
+    rows = [(stage, report['stages'][stage]) for stage in STAGES]
+    rows.append(('total', report['total']))
+    for name, stats in rows:
+        lines.append(f"{name:<10}" + "".join(f"{stats[key]:>9.3f}"
+                                             for key in ('p50', 'p95', 'p99', 'mean', 'max')))
+    
+    lines.append("")
+    lines.append(f"Throughput : {report['throughput_fps']:.1f} frame/detik "
+                 f"(wall {report['wall_fps']:.1f} termasuk pembuatan frame)")
+    
+    allocations = report.get('allocations')
+    if allocations:
+        lines.append(f"Alokasi    : puncak {allocations['peak_kb_mean']:.1f} KB/frame "
+                     f"(p95 {allocations['peak_kb_p95']:.1f}), tertahan "
+                     f"{allocations['retained_kb_mean']:.2f} KB/frame "
+                     f"({allocations['frames']} frame tracemalloc)")
+    
+    estimates, truth = report['estimates'], report.get('truth')
+    for key, label, unit in (('heart_rate', 'HR', 'BPM'), ('resp_rate', 'RR', 'napas/menit')):
+        value = estimates.get(key)
+        text = "-" if value is None else f"{value:.1f} {unit}"
+        if truth and value is not None:
+            text += f" (ground truth {truth[key]:.1f})"
+        lines.append(f"{label:<11}: {text}")
+    return "\n".join(lines)
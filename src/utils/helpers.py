@@ -57,4 +57,47 @@ def save_data_to_csv(time_array, signal_array, filename):
         Nama file untuk menyimpan data
     """
     data = np.column_stack((time_array, signal_array))
-    np.savetxt(filename, data, delimiter=',', header='time,signal', comments='')
\ No newline at end of file
+    np.savetxt(filename, data, delimiter=',', header='time,signal', comments='')
+
+class GenerationCache:
+    """
+    Cache hasil komputasi yang berlaku selama data sumber belum berubah.
+    
+    Setiap kali data sumber bertambah, panggil invalidate() untuk menaikkan
+    nomor generasi. Semua pemanggil dalam generasi yang sama (plot, estimator,
+    evaluasi kualitas, export) berbagi satu hasil komputasi.
+    """
+    
+    def __init__(self):
+        """Inisialisasi cache kosong pada generasi 0."""
+        self.generation = 0
+        self._entries = {}
+    
+    def invalidate(self):
+        """Tandai data sumber berubah sehingga semua hasil lama tidak berlaku."""
+        self.generation += 1
+        self._entries.clear()
+    
+    def get(self, key, compute):
+        """
+        Ambil hasil dari cache atau hitung jika belum ada di generasi ini.
+        
+        Parameters
+        ----------
+        key : hashable
+            Kunci hasil komputasi
+        compute : callable
+            Fungsi tanpa argumen untuk menghitung hasil
+            
+        Returns
+        -------
+        object
+            Hasil komputasi untuk generasi saat ini
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == self.generation:
+            return entry[1]
+        
+        value = compute()
+        self._entries[key] = (self.generation, value)
+        return value
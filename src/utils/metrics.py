@@ -0,0 +1,327 @@
+"""
+Modul instrumentasi ringan untuk hot path pemrosesan frame.
+Timer dan counter per tahap disimpan dalam histogram bergulir (jendela
+sampel terakhir) sehingga persentil latensi selalu tersedia untuk overlay
+GUI dan ekspor ke file metrik tanpa menumpuk data sepanjang sesi.
+"""
+
+import functools
+import json
+import threading
+import time
+
+import numpy as np
+
+from src.utils.utils import METRICS_CONFIG
+
+
+class RollingHistogram:
+    """
+    Histogram bergulir berisi N sampel durasi terakhir (ms).
+    
+    Sampel ditulis ke array melingkar yang dialokasikan sekali; statistik
+    (persentil, rata-rata, bucket) dihitung saat dibaca, bukan saat ditulis,
+    sehingga biaya pencatatan di hot path hanya satu penulisan array.
+    """
+    
+    def __init__(self, size=None, edges=None):
+        """
+        Parameter
+        ----------
+        size : int, opsional
+            Jumlah sampel dalam jendela, default dari METRICS_CONFIG
+        edges : sequence of float, opsional
+            Batas bucket histogram (ms), default dari METRICS_CONFIG
+        """
+        self.size = max(1, int(size or METRICS_CONFIG['window_size']))
+        self.edges = np.asarray(edges if edges is not None else METRICS_CONFIG['bucket_edges_ms'],
+                                dtype=np.float64)
+        self._samples = np.zeros(self.size, dtype=np.float64)
+        self._head = 0
+        self.count = 0   # Jumlah sampel dalam jendela
+        self.total = 0   # Jumlah sampel sepanjang sesi
+        self.last = 0.0
+    
+    def record(self, value):
+        """Tambahkan satu sampel durasi (ms)."""
+        self._samples[self._head] = value
+        self._head = (self._head + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+        self.total += 1
+        self.last = value
+    
+    def reset(self):
+        """Kosongkan jendela sampel."""
+        self._head = 0
+        self.count = 0
+        self.total = 0
+        self.last = 0.0
+    
+    def values(self):
+        """Salinan sampel dalam jendela (urutan tidak dijamin)."""
+        return self._samples[:self.count].copy()
+    
+    def summary(self):
+        """
+        Ringkasan statistik jendela.
+        
+        Returns
+        -------
+        dict
+            count, total, last, mean, p50, p95, p99, dan max (ms)
+        """
+        values = self._samples[:self.count]
+        if self.count == 0:
+            return {'count': 0, 'total': self.total, 'last': 0.0, 'mean': 0.0,
+                    'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {'count': self.count, 'total': self.total, 'last': float(self.last),
+                'mean': float(values.mean()), 'p50': float(p50), 'p95': float(p95),
+                'p99': float(p99), 'max': float(values.max())}
+    
+    def buckets(self):
+        """
+        Jumlah sampel per bucket histogram.
+        
+        Returns
+        -------
+        list of int
+            len(edges) + 1 bucket: (<edges[0]), [edges[i], edges[i+1]), (>=edges[-1])
+        """
+        idx = np.searchsorted(self.edges, self._samples[:self.count], side='right')
+        return np.bincount(idx, minlength=len(self.edges) + 1).tolist()
+
+
+class _Timer:
+    """Context manager pencatat durasi satu blok ke registry."""
+    
+    __slots__ = ('_registry', '_name', '_start')
+    
+    def __init__(self, registry, name):
+        self._registry = registry
+        self._name = name
+        self._start = 0.0
+    
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._registry.record(self._name, (time.perf_counter() - self._start) * 1000.0)
+        return False
+
+
+class _NullTimer:
+    """Timer kosong saat instrumentasi dinonaktifkan."""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """
+    Kumpulan timer (histogram bergulir) dan counter yang aman diakses lintas thread.
+    
+    Worker pipeline mencatat durasi dan counter; thread GUI membaca snapshot
+    untuk overlay dan ekspor. Jika enabled False, timer() mengembalikan
+    timer kosong sehingga biaya instrumentasi praktis nol.
+    """
+    
+    def __init__(self, window_size=None, enabled=None):
+        """
+        Parameter
+        ----------
+        window_size : int, opsional
+            Jumlah sampel per histogram, default dari METRICS_CONFIG
+        enabled : bool, opsional
+            Aktifkan pencatatan, default dari METRICS_CONFIG
+        """
+        self.window_size = window_size or METRICS_CONFIG['window_size']
+        self.enabled = METRICS_CONFIG['enabled'] if enabled is None else enabled
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._started = time.time()
+    
+    def timer(self, name):
+        """
+        Context manager pencatat durasi blok kode.
+        
+        Parameter
+        ----------
+        name : str
+            Nama metrik, mis. 'detect_face' atau 'rppg.process_roi'
+        
+        Contoh
+        ------
+        >>> with metrics.timer('rppg.process_roi'):
+        ...     processor.process_roi(roi, t)
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+    
+    def record(self, name, value_ms):
+        """Catat satu sampel durasi (ms) ke histogram bernama."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = RollingHistogram(self.window_size)
+                self._histograms[name] = histogram
+            histogram.record(value_ms)
+    
+    def increment(self, name, amount=1):
+        """Tambah counter bernama."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+    
+    def reset(self):
+        """Hapus semua histogram dan counter (mis. saat sesi baru)."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._started = time.time()
+    
+    def summary(self, name):
+        """Ringkasan satu histogram, atau None jika belum ada sampel."""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            return histogram.summary() if histogram is not None else None
+    
+    def rate(self, name):
+        """
+        Laju kejadian (Hz) dari histogram interval antar kejadian dalam ms.
+        
+        Returns
+        -------
+        float
+            1000 / rata-rata interval, atau 0 jika belum ada sampel
+        """
+        summary = self.summary(name)
+        if not summary or summary['mean'] <= 0:
+            return 0.0
+        return 1000.0 / summary['mean']
+    
+    def snapshot(self, buckets=False):
+        """
+        Snapshot semua metrik.
+        
+        Parameter
+        ----------
+        buckets : bool, opsional
+            Sertakan jumlah sampel per bucket histogram, default False
+        
+        Returns
+        -------
+        dict
+            {'time', 'uptime', 'timers': {nama: ringkasan}, 'counters': {nama: nilai}}
+        """
+        with self._lock:
+            timers = {}
+            for name, histogram in self._histograms.items():
+                timers[name] = histogram.summary()
+                if buckets:
+                    timers[name]['buckets'] = histogram.buckets()
+            counters = dict(self._counters)
+            started = self._started
+        now = time.time()
+        snapshot = {'time': now, 'uptime': now - started, 'timers': timers, 'counters': counters}
+        if buckets:
+            snapshot['bucket_edges_ms'] = METRICS_CONFIG['bucket_edges_ms']
+        return snapshot
+    
+    def export(self, path):
+        """
+        Tambahkan snapshot (dengan bucket histogram) sebagai satu baris JSON.
+        
+        Parameter
+        ----------
+        path : str
+            Path file metrik (format JSON Lines)
+        """
+        with open(path, 'a') as f:
+            f.write(json.dumps(self.snapshot(buckets=True)) + "\n")
+    
+    def format_overlay(self, names=None, budget_ms=None):
+        """
+        Teks ringkas latensi per tahap untuk overlay/status GUI.
+        
+        Parameter
+        ----------
+        names : sequence of str, opsional
+            Urutan metrik yang ditampilkan, default semua metrik terurut nama
+        budget_ms : float, opsional
+            Anggaran waktu per frame; jika diberikan, porsi p50 ditampilkan
+        
+        Returns
+        -------
+        str
+            Satu baris per metrik: nama, p50, p95, max (ms)
+        """
+        snapshot = self.snapshot()
+        timers = snapshot['timers']
+        if names is None:
+            names = sorted(timers)
+        
+        lines = [f"{'tahap':<34}{'p50':>7}{'p95':>7}{'max':>7}" +
+                 ("  %budget" if budget_ms else "")]
+        for name in names:
+            stats = timers.get(name)
+            if stats is None:
+                continue
+            line = f"{name:<34}{stats['p50']:>7.2f}{stats['p95']:>7.2f}{stats['max']:>7.2f}"
+            if budget_ms:
+                line += f"{100.0 * stats['p50'] / budget_ms:>8.0f}%"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def timed(name):
+    """
+    Decorator pencatat durasi metode ke registry milik instance.
+    
+    Registry diambil dari atribut metrics instance (mis. VideoProcessor
+    per sesi), atau registry global jika instance tidak memilikinya.
+    
+    Parameter
+    ----------
+    name : str
+        Nama metrik
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            registry = getattr(self, 'metrics', None)
+            if registry is None:
+                registry = get_metrics()
+            with registry.timer(name):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Registry global yang dipakai bersama oleh pipeline dan GUI
+_metrics = None
+_metrics_lock = threading.Lock()
+
+def get_metrics():
+    """Get singleton metrics registry."""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = MetricsRegistry()
+    return _metrics
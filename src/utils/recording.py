@@ -0,0 +1,487 @@
+"""
+Modul perekaman sesi dalam format biner kolumnar append-only.
+Setiap kolom (waktu, sampel mentah dan terfilter, ROI, estimasi laju) ditulis
+ke file biner mentahnya sendiri oleh writer thread di latar belakang,
+sehingga sesi panjang bisa direkam dengan biaya per frame hampir nol dan
+dibaca ulang secara instan dengan memory-map (SessionReader), termasuk
+analisis ulang per jendela waktu tanpa memuat seluruh file.
+
+Struktur direktori sesi:
+    session_YYYYmmdd_HHMMSS/
+        manifest.json   # skema kolom (nama, dtype, file), jumlah baris, metadata
+        time.bin        # satu file biner little-endian per kolom
+        rppg_r.bin
+        ...
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from src.signal.filters import bandpass_filter, resample_uniform
+from src.signal.spectral import band_peak_frequency
+from src.utils.utils import RECORDING_CONFIG, RPPG_CONFIG, RESPIRATION_CONFIG
+
+FORMAT_NAME = 'signalscope-session'
+FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+# Kolom sesi: (nama, dtype). Nilai kosong: NaN untuk float, -1 untuk integer.
+SESSION_COLUMNS = (
+    ('time', '<f8'),            # Waktu relatif frame pertama (detik)
+    ('rppg_r', '<f8'),          # Rata-rata RGB ROI dahi
+    ('rppg_g', '<f8'),
+    ('rppg_b', '<f8'),
+    ('rppg_pulse', '<f8'),      # Sampel pulsa mentah (POS/CHROM/green)
+    ('rppg_filtered', '<f8'),   # Output filter streaming rPPG
+    ('resp_raw', '<f8'),        # Sampel respirasi mentah (posisi dada/intensitas)
+    ('resp_filtered', '<f8'),   # Output filter streaming respirasi
+    ('heart_rate', '<f8'),      # Estimasi denyut jantung (BPM)
+    ('resp_rate', '<f8'),       # Estimasi laju napas (napas/menit)
+    ('face_x', '<i4'), ('face_y', '<i4'), ('face_w', '<i4'), ('face_h', '<i4'),
+    ('forehead_x', '<i4'), ('forehead_y', '<i4'), ('forehead_w', '<i4'), ('forehead_h', '<i4'),
+    ('chest_x', '<i4'), ('chest_y', '<i4'), ('chest_w', '<i4'), ('chest_h', '<i4'),
+    ('quality_level', '<i4'),   # Level QualityGovernor saat frame diproses (-1 jika nonaktif)
+)
+
+_STOP = object()
+
+
+def _fill_value(dtype):
+    """Nilai pengganti untuk data yang tidak tersedia."""
+    return np.nan if np.dtype(dtype).kind == 'f' else -1
+
+
+def read_manifest(directory):
+    """
+    Baca manifest sesi.
+    
+    Parameter
+    ----------
+    directory : str
+        Direktori sesi
+    
+    Returns
+    -------
+    dict
+        Isi manifest.json
+    """
+    with open(os.path.join(directory, MANIFEST_NAME), 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != FORMAT_NAME:
+        raise ValueError(f"Bukan direktori sesi SignalScope: {directory}")
+    return manifest
+
+
+class SessionRecorder:
+    """
+    Perekam sesi dengan writer thread latar belakang.
+    
+    record() hanya memasukkan dict nilai satu frame ke antrean; konversi ke
+    array kolom dan penulisan file dilakukan per batch oleh writer thread.
+    File kolom dibuka dalam mode append dan manifest diperbarui berkala,
+    sehingga sesi yang terputus (crash) tetap bisa dibaca sampai batch
+    terakhir yang sudah ditulis.
+    """
+    
+    def __init__(self, directory=None, columns=SESSION_COLUMNS, metadata=None,
+                 flush_interval=None):
+        """
+        Parameter
+        ----------
+        directory : str, opsional
+            Direktori sesi; default session_<timestamp> di dalam
+            RECORDING_CONFIG['directory']
+        columns : sequence of tuple, opsional
+            Skema kolom (nama, dtype), default SESSION_COLUMNS
+        metadata : dict, opsional
+            Metadata sesi (konfigurasi, metode, sumber kamera) untuk manifest
+        flush_interval : float, opsional
+            Interval maksimum (detik) antar penulisan batch ke disk
+        """
+        if directory is None:
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            directory = os.path.join(RECORDING_CONFIG['directory'], f"session_{stamp}")
+        self.directory = directory
+        self.columns = tuple((name, np.dtype(dtype).str) for name, dtype in columns)
+        self.metadata = dict(metadata or {})
+        self.flush_interval = flush_interval or RECORDING_CONFIG['flush_interval']
+        self.batch_size = RECORDING_CONFIG['batch_size']
+        
+        self._fill = {name: _fill_value(dtype) for name, dtype in self.columns}
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._files = {}
+        self._created = None
+        self._start_wall = None
+        self.rows = 0          # Jumlah baris yang sudah ditulis ke disk
+        self.is_recording = False
+        self.error = None
+    
+    def start(self):
+        """
+        Buat direktori sesi, tulis manifest awal, dan jalankan writer thread.
+        
+        Returns
+        -------
+        str
+            Direktori sesi
+        """
+        if self.is_recording:
+            return self.directory
+        
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(os.path.join(self.directory, MANIFEST_NAME)):
+            raise RuntimeError(f"Direktori sesi sudah berisi rekaman: {self.directory}")
+        
+        self._created = datetime.now().isoformat(timespec='seconds')
+        self._start_wall = time.monotonic()
+        self.rows = 0
+        self.error = None
+        self._files = {name: open(os.path.join(self.directory, f"{name}.bin"), 'ab')
+                       for name, _ in self.columns}
+        self._write_manifest('recording')
+        
+        self.is_recording = True
+        self._thread = threading.Thread(target=self._run, name="SessionRecorder", daemon=True)
+        self._thread.start()
+        return self.directory
+    
+    def record(self, values):
+        """
+        Antrekan satu baris (satu frame) untuk ditulis.
+        
+        Parameter
+        ----------
+        values : dict
+            Nilai per nama kolom; kolom yang tidak ada diisi NaN / -1.
+            Dict tidak boleh diubah pemanggil setelah diserahkan.
+        """
+        if self.is_recording:
+            self._queue.put(values)
+    
+    def stop(self, timeout=5.0):
+        """
+        Tulis sisa antrean, tutup file kolom, dan finalisasi manifest.
+        
+        Parameter
+        ----------
+        timeout : float, opsional
+            Waktu tunggu maksimum writer thread (detik)
+        """
+        if not self.is_recording:
+            return
+        self.is_recording = False
+        self._queue.put(_STOP)
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+    
+    def _run(self):
+        """Loop writer thread: kumpulkan batch lalu tulis per kolom."""
+        batch = []
+        last_flush = time.monotonic()
+        stopping = False
+        try:
+            while not stopping:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    item = None
+                
+                if item is _STOP:
+                    stopping = True
+                elif item is not None:
+                    batch.append(item)
+                
+                now = time.monotonic()
+                if batch and (stopping or len(batch) >= self.batch_size or
+                              now - last_flush >= self.flush_interval):
+                    self._write_batch(batch)
+                    batch = []
+                    last_flush = now
+        except Exception as e:
+            # Hentikan penerimaan baris agar antrean tidak tumbuh tanpa batas
+            self.is_recording = False
+            self.error = e
+            print(f"Warning: Error dalam perekaman sesi: {e}")
+        finally:
+            for f in self._files.values():
+                f.close()
+            self._files = {}
+            self._write_manifest('complete' if self.error is None else 'error')
+    
+    def _write_batch(self, batch):
+        """Konversi batch baris menjadi array kolom dan tambahkan ke file."""
+        n = len(batch)
+        for name, dtype in self.columns:
+            fill = self._fill[name]
+            column = np.array([row.get(name, fill) for row in batch], dtype=dtype)
+            self._files[name].write(column.tobytes())
+        
+        for f in self._files.values():
+            f.flush()
+        self.rows += n
+        self._write_manifest('recording')
+    
+    def _write_manifest(self, status):
+        """Tulis manifest secara atomik (file sementara lalu rename)."""
+        manifest = {
+            'format': FORMAT_NAME,
+            'version': FORMAT_VERSION,
+            'created': self._created,
+            'status': status,
+            'rows': self.rows,
+            'duration': time.monotonic() - self._start_wall if self._start_wall else 0.0,
+            'columns': [{'name': name, 'dtype': dtype, 'file': f"{name}.bin"}
+                        for name, dtype in self.columns],
+            'metadata': self.metadata,
+        }
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+
+
+class SessionReader:
+    """
+    Pembaca sesi rekaman berbasis memory-map.
+    
+    Setiap kolom dibuka sebagai np.memmap read-only tanpa membaca isinya;
+    halaman file baru dimuat OS saat diakses. Rentang waktu dicari dengan
+    binary search pada kolom waktu, sehingga irisan dan jendela analisis
+    hanya menyentuh bagian file yang dibutuhkan. Jumlah baris dihitung dari
+    ukuran file, sehingga sesi yang sedang/terputus direkam tetap terbaca.
+    """
+    
+    def __init__(self, directory):
+        """
+        Parameter
+        ----------
+        directory : str
+            Direktori sesi berisi manifest.json
+        """
+        self.directory = directory
+        self.manifest = read_manifest(directory)
+        self.metadata = self.manifest.get('metadata', {})
+        
+        mapped = {}
+        for column in self.manifest['columns']:
+            dtype = np.dtype(column['dtype'])
+            path = os.path.join(directory, column['file'])
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            n = size // dtype.itemsize
+            if n == 0:
+                mapped[column['name']] = np.empty(0, dtype=dtype)
+            else:
+                mapped[column['name']] = np.memmap(path, dtype=dtype, mode='r', shape=(n,))
+        
+        # Baris lengkap = baris yang sudah ditulis di semua kolom
+        self.rows = min((len(m) for m in mapped.values()), default=0)
+        self._columns = {name: m[:self.rows] for name, m in mapped.items()}
+    
+    def __len__(self):
+        return self.rows
+    
+    @property
+    def columns(self):
+        """Nama kolom sesi sesuai urutan manifest."""
+        return tuple(self._columns)
+    
+    @property
+    def duration(self):
+        """Durasi rekaman dalam detik (0 jika kosong)."""
+        if self.rows == 0:
+            return 0.0
+        time_column = self._columns['time']
+        return float(time_column[-1] - time_column[0])
+    
+    def column(self, name):
+        """
+        View memory-map satu kolom (tanpa salinan).
+        
+        Parameter
+        ----------
+        name : str
+            Nama kolom, mis. 'rppg_pulse'
+        
+        Returns
+        -------
+        numpy.ndarray
+            Array 1D read-only sepanjang sesi
+        """
+        if name not in self._columns:
+            raise KeyError(f"Kolom tidak ada dalam sesi: {name}")
+        return self._columns[name]
+    
+    def index_range(self, start=None, end=None):
+        """
+        Indeks baris [i0, i1) untuk rentang waktu [start, end).
+        
+        Parameter
+        ----------
+        start, end : float, opsional
+            Batas waktu dalam detik; None berarti awal/akhir sesi
+        
+        Returns
+        -------
+        tuple
+            (i0, i1)
+        """
+        time_column = self._columns['time']
+        i0 = 0 if start is None else int(np.searchsorted(time_column, start, side='left'))
+        i1 = self.rows if end is None else int(np.searchsorted(time_column, end, side='left'))
+        return i0, max(i0, i1)
+    
+    def slice(self, start=None, end=None, columns=None):
+        """
+        Irisan malas (view memory-map) kolom untuk rentang waktu.
+        
+        Parameter
+        ----------
+        start, end : float, opsional
+            Batas waktu dalam detik
+        columns : sequence of str, opsional
+            Kolom yang diambil, default semua kolom
+        
+        Returns
+        -------
+        dict
+            Nama kolom -> view array untuk baris dalam rentang
+        """
+        i0, i1 = self.index_range(start, end)
+        names = self.columns if columns is None else columns
+        return {name: self.column(name)[i0:i1] for name in names}
+    
+    def windows(self, window, step, start=None, end=None, columns=None):
+        """
+        Iterasi jendela waktu geser di atas sesi.
+        
+        Parameter
+        ----------
+        window : float
+            Panjang jendela dalam detik
+        step : float
+            Pergeseran antar jendela dalam detik
+        start, end : float, opsional
+            Rentang waktu yang dipindai, default seluruh sesi
+        columns : sequence of str, opsional
+            Kolom yang diambil, default semua kolom
+        
+        Yields
+        ------
+        tuple
+            (waktu akhir jendela, dict kolom -> view)
+        """
+        if self.rows == 0:
+            return
+        time_column = self._columns['time']
+        t_first = float(time_column[0]) if start is None else start
+        t_last = float(time_column[-1]) if end is None else end
+        
+        t_end = t_first + window
+        while t_end <= t_last + 1e-9:
+            yield t_end, self.slice(t_end - window, t_end, columns)
+            t_end += step
+    
+    def estimate_rates(self, step=1.0, hr_window=10.0, rr_window=30.0, start=None, end=None):
+        """
+        Analisis ulang denyut jantung dan laju napas per jendela dari sampel mentah.
+        
+        Setiap jendela: sampel valid diresample ke grid seragam pada laju
+        terukur, difilter bandpass (parameter config), lalu frekuensi puncak
+        dicari dengan zoom DFT pada pita fisiologis.
+        
+        Parameter
+        ----------
+        step : float, opsional
+            Jarak antar estimasi dalam detik, default 1
+        hr_window : float, opsional
+            Panjang jendela rPPG dalam detik, default 10
+        rr_window : float, opsional
+            Panjang jendela respirasi dalam detik, default 30
+        start, end : float, opsional
+            Rentang waktu yang dianalisis, default seluruh sesi
+        
+        Returns
+        -------
+        dict
+            'time', 'heart_rate' (BPM), dan 'resp_rate' (napas/menit) sebagai
+            array; NaN untuk jendela tanpa data cukup
+        """
+        if self.rows == 0:
+            return {'time': np.empty(0), 'heart_rate': np.empty(0), 'resp_rate': np.empty(0)}
+        
+        time_column = self._columns['time']
+        t_first = float(time_column[0]) if start is None else start
+        t_last = float(time_column[-1]) if end is None else end
+        
+        # Estimasi pertama saat jendela terpendek sudah terisi
+        times = np.arange(t_first + min(hr_window, rr_window), t_last + 1e-9, step)
+        heart_rates = np.full(len(times), np.nan)
+        resp_rates = np.full(len(times), np.nan)
+        
+        for i, t_end in enumerate(times):
+            if t_end - t_first >= hr_window:
+                window = self.slice(t_end - hr_window, t_end, ('time', 'rppg_pulse'))
+                heart_rates[i] = _window_rate(window['time'], window['rppg_pulse'],
+                                              (RPPG_CONFIG['lowcut'], RPPG_CONFIG['highcut']),
+                                              (0.83, 2.17), hr_window)
+            if t_end - t_first >= rr_window:
+                window = self.slice(t_end - rr_window, t_end, ('time', 'resp_raw'))
+                resp_rates[i] = _window_rate(window['time'], window['resp_raw'],
+                                             (RESPIRATION_CONFIG['lowcut'],
+                                              RESPIRATION_CONFIG['highcut']),
+                                             (0.08, 0.5), rr_window)
+        
+        return {'time': times, 'heart_rate': heart_rates, 'resp_rate': resp_rates}
+
+
+def _window_rate(time_array, values, filter_band, peak_band, window, min_coverage=0.5):
+    """
+    Laju dominan (per menit) satu jendela sampel bertimestamp.
+    
+    Parameter
+    ----------
+    time_array, values : numpy.ndarray
+        Timestamp dan nilai sampel (NaN = tidak ada sampel)
+    filter_band : tuple
+        (lowcut, highcut) filter bandpass dalam Hz
+    peak_band : tuple
+        (f_low, f_high) pita pencarian puncak dalam Hz
+    window : float
+        Panjang jendela nominal dalam detik
+    min_coverage : float, opsional
+        Porsi jendela minimum yang harus berisi sampel valid
+    
+    Returns
+    -------
+    float
+        Laju dalam per menit, atau NaN jika data tidak cukup
+    """
+    valid = np.isfinite(values)
+    time_array, values = time_array[valid], values[valid]
+    if len(time_array) < 16 or time_array[-1] - time_array[0] < min_coverage * window:
+        return np.nan
+    
+    # Timestamp ganda/macet: median langkah waktu bisa nol atau negatif
+    dt = np.median(np.diff(time_array))
+    if not np.isfinite(dt) or dt <= 0:
+        return np.nan
+    
+    # Laju dibulatkan ke 0.5 Hz (seperti processor real-time) agar desain
+    # filter diambil dari cache, bukan didesain ulang setiap jendela
+    fs = round(2.0 / dt) / 2.0
+    if fs <= 2 * filter_band[1]:
+        return np.nan
+    
+    _, uniform = resample_uniform(time_array, values, fs)
+    filtered = bandpass_filter(uniform, filter_band[0], filter_band[1], fs)
+    frequency = band_peak_frequency(filtered, fs, peak_band[0], peak_band[1])
+    return np.nan if frequency is None else frequency * 60.0
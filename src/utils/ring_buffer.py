@@ -0,0 +1,115 @@
+"""
+Modul ring buffer terstruktur untuk buffer sinyal real-time.
+"""
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Ring buffer multi-kolom dengan view linear tanpa alokasi per pemanggilan.
+    
+    Data disimpan dalam satu array 2D kontigu berukuran (kolom, 2 * kapasitas).
+    Setiap sampel ditulis dua kali (posisi p dan p + kapasitas), sehingga
+    sampel valid dari yang terlama ke terbaru selalu membentuk satu irisan
+    kontigu dan bisa dikembalikan sebagai view tanpa np.concatenate.
+    Jumlah sampel valid dicatat agar sampel nol saat startup tidak
+    dianggap sebagai data.
+    """
+    
+    def __init__(self, capacity, columns):
+        """
+        Inisialisasi ring buffer.
+        
+        Parameters
+        ----------
+        capacity : int
+            Jumlah sampel maksimum yang disimpan
+        columns : sequence of str
+            Nama kolom, mis. ('time', 'r', 'g', 'b')
+        """
+        self.capacity = max(1, int(capacity))
+        self.columns = tuple(columns)
+        self._column_idx = {name: i for i, name in enumerate(self.columns)}
+        self._data = np.zeros((len(self.columns), 2 * self.capacity), dtype=np.float64)
+        self._head = 0  # Posisi tulis berikutnya, dalam [0, capacity)
+        self.count = 0  # Jumlah sampel valid
+    
+    def __len__(self):
+        return self.count
+    
+    @property
+    def is_full(self):
+        """True jika buffer sudah berisi sampel sebanyak kapasitasnya."""
+        return self.count == self.capacity
+    
+    def clear(self):
+        """Kosongkan buffer tanpa alokasi ulang."""
+        self._data.fill(0.0)
+        self._head = 0
+        self.count = 0
+    
+    def append(self, values):
+        """
+        Tambahkan satu sampel (satu nilai untuk setiap kolom).
+        
+        Parameters
+        ----------
+        values : sequence of float
+            Nilai sampel dengan urutan sesuai kolom
+        """
+        head = self._head
+        self._data[:, head] = values
+        self._data[:, head + self.capacity] = values
+        self._head = (head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+    
+    def _valid_slice(self):
+        """Irisan kolom data untuk sampel valid dari terlama ke terbaru."""
+        end = self._head + self.capacity
+        return slice(end - self.count, end)
+    
+    def view(self):
+        """
+        View read-only seluruh kolom untuk sampel valid.
+        
+        Returns
+        -------
+        numpy.ndarray
+            Array (kolom, count) yang berbagi memori dengan buffer
+        """
+        view = self._data[:, self._valid_slice()]
+        view.flags.writeable = False
+        return view
+    
+    def column(self, name):
+        """
+        View read-only kontigu satu kolom untuk sampel valid.
+        
+        Parameters
+        ----------
+        name : str
+            Nama kolom
+        
+        Returns
+        -------
+        numpy.ndarray
+            Array 1D (count,) dari terlama ke terbaru, berbagi memori dengan buffer
+        """
+        view = self._data[self._column_idx[name], self._valid_slice()]
+        view.flags.writeable = False
+        return view
+    
+    def last(self, name):
+        """
+        Nilai terbaru pada satu kolom.
+        
+        Returns
+        -------
+        float atau None
+            Nilai sampel terakhir, atau None jika buffer kosong
+        """
+        if self.count == 0:
+            return None
+        return float(self._data[self._column_idx[name], self._head + self.capacity - 1])
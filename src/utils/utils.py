@@ -14,6 +14,8 @@ RESPIRATION_CONFIG = {
     'highcut': 0.5,            # Frekuensi cutoff tinggi (Hz)
     'filter_order': 4,         # Orde filter Butterworth
     'window_size': 10,         # Ukuran window untuk moving average
+    'rate_tolerance': 0.1,     # Deviasi relatif laju terukur sebelum filter didesain ulang
+    'method': 'flow',          # Ekstraksi sinyal: 'flow' (Lucas-Kanade) atau 'rgb' (rata-rata warna)
 }
 
 # Parameter filter rPPG
@@ -24,6 +26,10 @@ RPPG_CONFIG = {
     'highcut': 3.5,            # Frekuensi cutoff tinggi (Hz) ~ 210 BPM
     'filter_order': 4,         # Orde filter Butterworth
     'window_size': 5,          # Ukuran window untuk moving average
+    'rate_tolerance': 0.1,     # Deviasi relatif laju terukur sebelum filter didesain ulang
+    'method': 'pos',           # Ekstraksi pulsa: 'pos', 'chrom', atau 'green' (G - 0.5R)
+    'patch_grid': (2, 4),      # Grid patch ROI (baris, kolom) untuk POS/CHROM
+    'projection_window': 1.6,  # Panjang jendela proyeksi POS/CHROM (detik)
 }
 
 # Warna untuk visualisasi
@@ -50,5 +56,89 @@ ROI_CONFIG = {
     'face_min_neighbors': 5,   # Parameter untuk deteksi wajah
     'forehead_ratio': 0.3,     # Proporsi tinggi dahi relatif terhadap wajah
     'chest_width_factor': 1.5, # Faktor lebar dada relatif terhadap wajah
-    'chest_height_factor': 1.5 # Faktor tinggi dada relatif terhadap wajah
-}
\ No newline at end of file
+    'chest_height_factor': 1.5, # Faktor tinggi dada relatif terhadap wajah
+    'tracking_enabled': True,  # Tracking ROI di antara keyframe deteksi
+    'detect_interval': 5,      # Jalankan detektor setiap N frame
+    'tracker_min_confidence': 0.6,  # Korelasi minimum template matching
+    'tracker_search_margin': 0.25,  # Margin area pencarian relatif ukuran ROI
+    'tracker_scale': 0.5,      # Skala frame untuk tracking (lebih kecil = lebih cepat)
+    'async_pose': True,        # Jalankan pose detection di worker thread terpisah
+    'pose_max_age': 1.0,       # Umur maksimum (detik) hasil pose async yang masih dipakai
+    'warmup_iterations': 3,    # Inferensi dummy per model saat startup (0 = tanpa warm-up)
+    'face_detector': 'blazeface_tasks',  # Backend: 'blazeface_tasks', 'blazeface', 'haar', 'dnn'
+    'detection_scale': 0.5,    # Skala frame untuk deteksi wajah (1.0 = resolusi penuh)
+    'dnn_model': 'models/res10_300x300_ssd_iter_140000.caffemodel',  # Bobot detektor DNN
+    'dnn_config': 'models/deploy.prototxt',  # Arsitektur detektor DNN
+    'dnn_confidence': 0.5,     # Skor minimum deteksi DNN
+    'blaze_face_model': 'models/blaze_face_short_range.tflite',  # Model BlazeFace (Tasks)
+    'pose_model': 'models/pose_landmarker.task',  # Model PoseLandmarker (Tasks)
+    'pose_backend': 'tasks',   # 'tasks' (jika file model ada) atau 'solutions' (mp.solutions.pose)
+    'tasks_running_mode': 'video',  # Mode FaceDetector Tasks: 'video' atau 'live_stream' (hanya tanpa tracking)
+    'tasks_delegate': 'cpu',   # Delegate inferensi Tasks: 'cpu' atau 'gpu'
+}
+
+# Parameter benchmark pipeline (benchmark.py)
+BENCHMARK_CONFIG = {
+    'frames': 600,             # Jumlah frame fixture (20 detik pada 30 FPS)
+    'warmup_frames': 60,       # Frame awal yang tidak diukur (alokasi buffer, cache filter)
+    'alloc_frames': 120,       # Jumlah frame untuk pengukuran alokasi (tracemalloc)
+    'fps': 30,                 # Laju frame fixture sintetis
+    'width': 640,              # Ukuran frame fixture sintetis
+    'height': 480,
+    'regression_threshold': 0.2,  # Perubahan relatif maksimum terhadap baseline
+    'min_delta_ms': 0.05,      # Selisih latensi (ms) di bawah ini dianggap noise
+}
+
+# Parameter instrumentasi hot path (src/utils/metrics.py)
+METRICS_CONFIG = {
+    'enabled': True,           # Catat timer dan counter per tahap
+    'window_size': 300,        # Jumlah sampel per histogram bergulir (10 detik pada 30 FPS)
+    'bucket_edges_ms': [0.5, 1, 2, 5, 10, 20, 33.3, 50, 100],  # Batas bucket histogram (ms)
+    'frame_budget_ms': 33.3,   # Anggaran waktu per frame pada 30 FPS
+    'overlay_interval_ms': 500,  # Interval pembaruan panel metrik di GUI
+    'export_path': 'data/metrics.jsonl',  # File ekspor metrik (JSON Lines)
+    'export_interval': 10.0,   # Ekspor berkala (detik) selama kamera aktif, 0 untuk nonaktif
+}
+
+# Parameter perekaman sesi biner (src/utils/recording.py)
+RECORDING_CONFIG = {
+    'directory': 'data/sessions',  # Direktori induk rekaman sesi
+    'flush_interval': 1.0,     # Interval maksimum (detik) penulisan batch ke disk
+    'batch_size': 64,          # Tulis segera jika antrean mencapai N baris
+}
+
+# Parameter ring buffer frame mentah (src/video/frame_ring.py)
+FRAME_RING_CONFIG = {
+    'enabled': True,           # Simpan frame terbaru untuk ekspor klip
+    'seconds': 10.0,           # Panjang riwayat di memori (detik)
+    'fps': 30,                 # Laju frame nominal untuk kapasitas ring
+    'mode': 'roi',             # 'roi' (crop dahi + dada, hemat memori) atau 'frame' (frame penuh)
+    'codec': 'FFV1',           # Codec video lossless, fallback npz jika tidak tersedia
+    'directory': 'data/clips', # Direktori induk klip
+}
+
+# Parameter governor kualitas adaptif (src/video/governor.py)
+QUALITY_CONFIG = {
+    'enabled': True,           # Turunkan kualitas otomatis saat latensi frame melebihi anggaran
+    'window_frames': 60,       # Jumlah frame per evaluasi (~2 detik pada 30 FPS)
+    'degrade_ratio': 0.9,      # p95 latensi > rasio x anggaran dianggap kelebihan beban
+    'restore_ratio': 0.5,      # p95 latensi < rasio x anggaran dianggap ada ruang
+    'degrade_after': 1,        # Jumlah evaluasi berturut-turut sebelum level naik
+    'restore_after': 3,        # Jumlah evaluasi berturut-turut sebelum level turun
+    # Level 0 = kualitas penuh (menggantikan detect_interval/detection_scale ROI_CONFIG
+    # selama governor aktif); setiap level berikutnya menurunkan satu aspek lagi
+    'levels': [
+        {'pose_complexity': 1, 'detect_interval': 5, 'detection_scale': 0.5,
+         'plot_interval_ms': 30, 'estimate_interval': 1},
+        {'pose_complexity': 0, 'detect_interval': 5, 'detection_scale': 0.5,
+         'plot_interval_ms': 30, 'estimate_interval': 1},
+        {'pose_complexity': 0, 'detect_interval': 10, 'detection_scale': 0.5,
+         'plot_interval_ms': 30, 'estimate_interval': 1},
+        {'pose_complexity': 0, 'detect_interval': 10, 'detection_scale': 0.35,
+         'plot_interval_ms': 30, 'estimate_interval': 1},
+        {'pose_complexity': 0, 'detect_interval': 10, 'detection_scale': 0.35,
+         'plot_interval_ms': 66, 'estimate_interval': 1},
+        {'pose_complexity': 0, 'detect_interval': 15, 'detection_scale': 0.25,
+         'plot_interval_ms': 100, 'estimate_interval': 5},
+    ],
+}
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modul analisis batch (headless) untuk file video hasil rekaman.
+Memproses video secepat mungkin tanpa pacing 30 FPS dan dapat berjalan
+paralel untuk banyak file menggunakan process pool.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+
+from src.utils.helpers import ensure_directory_exists
+
+
+def analyze_video(video_path, output_dir="data", max_frames=None, output_name=None):
+    """
+    Analisis satu file video dan tulis time series laju per sesi.
+    
+    Parameter
+    ----------
+    video_path : str
+        Path file video input
+    output_dir : str, opsional
+        Direktori output, default "data"
+    max_frames : int, opsional
+        Batas jumlah frame yang diproses, None untuk seluruh video
+    output_name : str, opsional
+        Prefix nama file output, default nama file video tanpa ekstensi
+    
+    Returns
+    -------
+    dict
+        Ringkasan sesi: jumlah frame, durasi, throughput, estimasi median, dan path output
+    """
+    # Import di sini agar proses worker memuat model MediaPipe sendiri
+    from src.video.processor import VideoProcessor
+    from src.video.pipeline import FramePipeline
+    
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Tidak dapat membuka video: {video_path}")
+    
+    # Timestamp dari FPS video (waktu rekaman), bukan waktu proses
+    video_fps = cap.get(cv2.CAP_PROP_FPS)
+    if not video_fps or not np.isfinite(video_fps) or video_fps <= 0:
+        video_fps = 30.0
+    
+    # Detektor baru per file agar state tracking tidak terbawa antar sesi.
+    # Pose sinkron: tanpa pacing real-time hasil pose async akan tertinggal.
+    pipeline = FramePipeline(video_processor=VideoProcessor(async_pose=False))
+    
+    times = []
+    heart_rates = []
+    resp_rates = []
+    frame_idx = 0
+    
+    start = time.perf_counter()
+    try:
+        while max_frames is None or frame_idx < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            
+            timestamp = frame_idx / video_fps
+            result = pipeline.process_frame(frame, timestamp, draw_overlay=False)
+            
+            heart_rate = result['heart_rate']
+            resp_rate = result['resp_rate']
+            times.append(result['timestamp'])
+            heart_rates.append(np.nan if heart_rate is None else heart_rate)
+            resp_rates.append(np.nan if resp_rate is None else resp_rate)
+            frame_idx += 1
+    finally:
+        cap.release()
+    processing_time = time.perf_counter() - start
+    
+    # Tulis time series laju
+    ensure_directory_exists(output_dir)
+    stem = output_name or os.path.splitext(os.path.basename(video_path))[0]
+    rates_file = os.path.join(output_dir, f"{stem}_rates.csv")
+    data = np.column_stack((times, heart_rates, resp_rates)) if times else np.empty((0, 3))
+    np.savetxt(rates_file, data, delimiter=',', header='time,heart_rate,resp_rate',
+               comments='', fmt='%.6f')
+    
+    heart_rates = np.asarray(heart_rates, dtype=np.float64)
+    resp_rates = np.asarray(resp_rates, dtype=np.float64)
+    summary = {
+        'video': video_path,
+        'frames': frame_idx,
+        'video_fps': video_fps,
+        'duration': frame_idx / video_fps,
+        'processing_time': processing_time,
+        'throughput_fps': frame_idx / processing_time if processing_time > 0 else 0.0,
+        'median_heart_rate': _nanmedian_or_none(heart_rates),
+        'median_resp_rate': _nanmedian_or_none(resp_rates),
+        'rates_file': rates_file,
+    }
+    
+    summary_file = os.path.join(output_dir, f"{stem}_summary.json")
+    with open(summary_file, 'w') as f:
+        json.dump(summary, f, indent=2)
+    summary['summary_file'] = summary_file
+    
+    return summary
+
+
+def _nanmedian_or_none(values):
+    """Median nilai finite, atau None jika tidak ada."""
+    finite = values[np.isfinite(values)]
+    if len(finite) == 0:
+        return None
+    return float(np.median(finite))
+
+
+def output_names(video_paths):
+    """
+    Prefix nama file output yang unik untuk setiap video.
+    
+    Nama file tanpa ekstensi dipakai jika unik; video dengan nama sama di
+    direktori berbeda diberi prefix dari path relatif terhadap direktori
+    bersama (mis. cam1/sesi1.mp4 dan cam2/sesi1.mp4 menjadi cam1_sesi1 dan
+    cam2_sesi1) agar _rates.csv/_summary.json tidak saling menimpa.
+    
+    Parameter
+    ----------
+    video_paths : list of str
+        Daftar path file video
+    
+    Returns
+    -------
+    list of str
+        Prefix nama output dengan urutan sesuai video_paths
+    """
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in video_paths]
+    groups = {}
+    for i, stem in enumerate(stems):
+        groups.setdefault(stem, []).append(i)
+    
+    names = list(stems)
+    for stem, indices in groups.items():
+        if len(indices) < 2:
+            continue
+        paths = [os.path.abspath(video_paths[i]) for i in indices]
+        common = os.path.commonpath([os.path.dirname(path) for path in paths])
+        for i, path in zip(indices, paths):
+            relative = os.path.splitext(os.path.relpath(path, common))[0]
+            names[i] = relative.replace(os.sep, '_')
+    
+    # Path yang sama diberikan lebih dari sekali tetap diberi nama berbeda
+    seen = {}
+    for i, name in enumerate(names):
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        if count:
+            names[i] = f"{name}_{count + 1}"
+    return names
+
+
+def _init_worker():
+    """Inisialisasi proses worker: cegah oversubscription thread OpenCV."""
+    cv2.setNumThreads(1)
+
+
+def analyze_videos(video_paths, output_dir="data", workers=None, max_frames=None):
+    """
+    Analisis banyak file video secara paralel dengan process pool.
+    
+    Parameter
+    ----------
+    video_paths : list of str
+        Daftar path file video
+    output_dir : str, opsional
+        Direktori output, default "data"
+    workers : int, opsional
+        Jumlah proses worker, default jumlah CPU
+    max_frames : int, opsional
+        Batas jumlah frame per video
+    
+    Returns
+    -------
+    tuple
+        (summaries, stats) - daftar ringkasan per video yang berhasil dan
+        statistik throughput keseluruhan
+    """
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(video_paths)))
+    
+    summaries = []
+    failures = []
+    start = time.perf_counter()
+    
+    names = output_names(video_paths)
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = {
+            executor.submit(analyze_video, path, output_dir, max_frames, name): path
+            for path, name in zip(video_paths, names)
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                print(f"Warning: Gagal menganalisis {path}: {e}")
+                failures.append(path)
+                continue
+            
+            summaries.append(summary)
+            print(f"{path}: {summary['frames']} frame, "
+                  f"{summary['throughput_fps']:.1f} frame/detik")
+    
+    wall_time = time.perf_counter() - start
+    total_frames = sum(s['frames'] for s in summaries)
+    stats = {
+        'videos': len(summaries),
+        'failed': failures,
+        'workers': workers,
+        'total_frames': total_frames,
+        'wall_time': wall_time,
+        'throughput_fps': total_frames / wall_time if wall_time > 0 else 0.0,
+    }
+    
+    return summaries, stats
@@ -4,6 +4,10 @@ Modul untuk mengakses dan memproses video dari webcam.
 
 import cv2
 import numpy as np
+import os
+import threading
+import time
+from collections import deque
 
 class Camera:
     """Kelas untuk mengakses webcam dan mengambil frame video."""
@@ -73,4 +77,237 @@ class Camera:
             
     def __del__(self):
         """Destruktor kelas untuk memastikan kamera dilepaskan."""
-        self.stop()
\ No newline at end of file
+        self.stop()
+
+
+class ThreadedCamera(Camera):
+    """
+    Kamera dengan thread capture terpisah dari event loop GUI.
+    
+    Frame diambil terus-menerus oleh thread khusus dan dimasukkan ke antrean
+    terbatas. Jika antrean penuh, frame paling lama dibuang (drop-oldest)
+    sehingga konsumen selalu mendapat frame terbaru. Setiap frame diberi
+    timestamp monotonic yang diambil tepat saat grab.
+    
+    Sumber file video dibaca tanpa pacing real-time, sehingga untuk file
+    (realtime False) thread capture menunggu saat antrean penuh alih-alih
+    membuang frame, dan timestamp diambil dari waktu media frame
+    (CAP_PROP_POS_MSEC, atau indeks frame / FPS) bukan waktu decode.
+    
+    Jika grab gagal beberapa kali berturut-turut (akhir file, kamera
+    dicabut), thread capture berhenti dan is_running menjadi False sehingga
+    konsumen yang menunggu di get_frame() ikut berhenti.
+    """
+    
+    def __init__(self, camera_id=0, width=640, height=480, fps=30, queue_size=4,
+                 frame_callback=None, max_grab_failures=20, realtime=None):
+        """
+        Inisialisasi kamera ber-thread.
+        
+        Parameter
+        ----------
+        camera_id, width, height, fps
+            Sama seperti pada Camera
+        queue_size : int, opsional
+            Kapasitas antrean frame, default 4
+        frame_callback : callable, opsional
+            Dipanggil dari thread capture (tanpa argumen) setiap ada frame baru
+        max_grab_failures : int, opsional
+            Jumlah grab gagal berturut-turut sebelum capture dihentikan, default 20
+        realtime : bool, opsional
+            True untuk sumber langsung (drop-oldest, timestamp monotonic), False
+            untuk file (backpressure, timestamp media). Default None: False jika
+            camera_id adalah path file yang ada
+        """
+        super().__init__(camera_id, width, height, fps)
+        self.queue_size = max(1, int(queue_size))
+        self.frame_callback = frame_callback
+        self.max_grab_failures = max(1, int(max_grab_failures))
+        if realtime is None:
+            realtime = not (isinstance(camera_id, str) and os.path.isfile(camera_id))
+        self.realtime = realtime
+        self._frames = deque(maxlen=self.queue_size)
+        self._condition = threading.Condition()
+        self._thread = None
+        self._thread_done = None
+        
+        # Statistik capture
+        self.frame_count = 0
+        self.dropped_count = 0
+        self._fps_window = deque(maxlen=60)
+    
+    def start(self):
+        """Memulai kamera beserta thread capture."""
+        super().start()
+        
+        with self._condition:
+            self._frames.clear()
+            self.frame_count = 0
+            self.dropped_count = 0
+            self._fps_window.clear()
+        
+        self._thread_done = threading.Event()
+        self._thread = threading.Thread(target=self._capture_loop,
+                                        args=(self.cap, self._thread_done),
+                                        name="CameraCapture", daemon=True)
+        self._thread.start()
+        return True
+    
+    def _capture_loop(self, cap, done):
+        """Loop thread capture: grab, beri timestamp, masukkan ke antrean."""
+        failures = 0
+        frame_index = 0
+        media_fps = cap.get(cv2.CAP_PROP_FPS) if not self.realtime else 0.0
+        if not media_fps or not np.isfinite(media_fps) or media_fps <= 0:
+            media_fps = float(self.fps)
+        last_media_time = -np.inf
+        try:
+            while self.is_running:
+                if not self.realtime:
+                    # Backpressure: tunggu konsumen alih-alih membuang frame file
+                    with self._condition:
+                        self._condition.wait_for(
+                            lambda: len(self._frames) < self.queue_size or not self.is_running)
+                    if not self.is_running:
+                        break
+                
+                # Blocking grab, timestamp diambil saat frame diperoleh
+                if not cap.grab():
+                    failures += 1
+                    if failures >= self.max_grab_failures:
+                        break
+                    time.sleep(0.005)
+                    continue
+                failures = 0
+                grab_time = time.monotonic()
+                if self.realtime:
+                    timestamp = grab_time
+                else:
+                    # Waktu media frame; fallback indeks/FPS jika backend tidak mendukung
+                    timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                    if not np.isfinite(timestamp) or timestamp <= last_media_time:
+                        timestamp = frame_index / media_fps
+                    last_media_time = timestamp
+                frame_index += 1
+                
+                ret, frame = cap.retrieve()
+                if not ret or frame is None:
+                    continue
+                
+                with self._condition:
+                    # deque dengan maxlen otomatis membuang frame paling lama
+                    if len(self._frames) == self.queue_size:
+                        self.dropped_count += 1
+                    self._frames.append((frame, timestamp))
+                    self.frame_count += 1
+                    self._fps_window.append(grab_time)
+                    self._condition.notify_all()
+                
+                if self.frame_callback is not None:
+                    self.frame_callback()
+        finally:
+            with self._condition:
+                done.set()
+                detached = self.cap is not cap
+                if not detached:
+                    # Sumber habis/terputus: bangunkan konsumen yang menunggu
+                    self.is_running = False
+                    self._condition.notify_all()
+            if detached:
+                # stop() tidak menunggu grab yang masih blocking; lepaskan di sini
+                cap.release()
+    
+    def get_frame(self, timeout=None):
+        """
+        Ambil frame berikutnya (paling lama) dari antrean.
+        
+        Parameter
+        ----------
+        timeout : float, opsional
+            Waktu tunggu maksimum dalam detik, None untuk menunggu terus
+            
+        Returns
+        -------
+        tuple atau None
+            (frame, timestamp) dengan timestamp monotonic saat grab (waktu
+            media untuk sumber file), atau None jika tidak ada frame dalam
+            waktu tunggu
+        """
+        with self._condition:
+            if not self._frames:
+                self._condition.wait_for(
+                    lambda: self._frames or not self.is_running, timeout)
+            if not self._frames:
+                return None
+            item = self._frames.popleft()
+            # Bangunkan thread capture yang menunggu ruang antrean (sumber file)
+            self._condition.notify_all()
+            return item
+    
+    def get_latest_frame(self):
+        """
+        Ambil frame terbaru dan buang frame lain di antrean.
+        
+        Returns
+        -------
+        tuple atau None
+            (frame, timestamp), atau None jika antrean kosong
+        """
+        with self._condition:
+            if not self._frames:
+                return None
+            item = self._frames.pop()
+            self.dropped_count += len(self._frames)
+            self._frames.clear()
+            self._condition.notify_all()
+            return item
+    
+    def read_frame(self):
+        """
+        Membaca frame terbaru tanpa blocking (kompatibel dengan Camera).
+        
+        Returns
+        -------
+        numpy.ndarray atau None
+            Frame video dalam format BGR, None jika belum ada frame
+        """
+        item = self.get_latest_frame()
+        if item is None:
+            return None
+        return item[0]
+    
+    @property
+    def pending_count(self):
+        """Jumlah frame yang menunggu di antrean."""
+        with self._condition:
+            return len(self._frames)
+    
+    @property
+    def measured_fps(self):
+        """FPS capture aktual berdasarkan waktu grab frame terakhir."""
+        with self._condition:
+            if len(self._fps_window) < 2:
+                return 0.0
+            span = self._fps_window[-1] - self._fps_window[0]
+            if span <= 0:
+                return 0.0
+            return (len(self._fps_window) - 1) / span
+    
+    def stop(self):
+        """Menghentikan thread capture lalu melepaskan kamera."""
+        self.is_running = False
+        with self._condition:
+            self._condition.notify_all()
+        
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+        self._thread = None
+        
+        with self._condition:
+            done = self._thread_done
+            if done is not None and not done.is_set() and thread is not threading.current_thread():
+                # Thread masih tertahan di grab(): serahkan pelepasan cap ke thread
+                self.cap = None
+        
+        super().stop()
@@ -0,0 +1,533 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modul backend detektor wajah yang dapat dipilih (BlazeFace, Haar, OpenCV DNN).
+Setiap backend menjalankan deteksi pada salinan frame yang diperkecil
+(skala deteksi) lalu memetakan bbox kembali ke resolusi penuh, dan
+mencatat latensinya sendiri ke registry metrik agar detektor termurah
+yang masih memadai bisa dipilih per mesin. Backend MediaPipe Tasks memuat
+file model dari folder models/ secara langsung (mode VIDEO atau
+LIVE_STREAM dengan callback hasil async).
+"""
+
+import os
+import threading
+import time
+
+import cv2
+
+from src.utils.metrics import get_metrics
+from src.utils.utils import ROI_CONFIG
+
+
+class FaceDetectorBackend:
+    """
+    Antarmuka backend detektor wajah.
+    
+    Subclass menentukan name, color ('rgb', 'gray', atau 'bgr') untuk
+    format input yang dibutuhkan model, dan _detect() yang mengembalikan
+    bbox dalam koordinat gambar input (yang sudah diperkecil). Penskalaan,
+    pemetaan balik, clipping ke batas frame, dan pencatatan latensi
+    (metrik 'detect_face.<name>' pada registry metrics) dikerjakan oleh detect().
+    """
+    
+    name = None
+    color = 'bgr'
+    
+    def __init__(self, scale=None, metrics=None):
+        """
+        Parameter
+        ----------
+        scale : float, opsional
+            Skala frame untuk deteksi (0 < scale <= 1), default dari ROI_CONFIG
+        metrics : MetricsRegistry, opsional
+            Registry latensi deteksi, default registry global
+        """
+        self.set_scale(ROI_CONFIG['detection_scale'] if scale is None else scale)
+        self.metrics = metrics or get_metrics()
+        self._metric = f"detect_face.{self.name}"
+    
+    def set_scale(self, scale):
+        """
+        Ganti skala deteksi (mis. oleh QualityGovernor), berlaku mulai deteksi berikutnya.
+        
+        Parameter
+        ----------
+        scale : float
+            Skala frame untuk deteksi (0 < scale <= 1)
+        """
+        if not 0 < scale <= 1:
+            raise ValueError(f"Skala deteksi harus di antara 0 dan 1: {scale}")
+        self.scale = float(scale)
+    
+    def _input(self, frame, context=None):
+        """
+        Gambar input detektor dalam format warna backend.
+        
+        Pada skala penuh konversi warna dibagi dengan FrameContext; jika
+        diperkecil, frame BGR di-resize dulu sehingga konversi warna hanya
+        dikerjakan pada gambar kecil.
+        """
+        if self.scale == 1.0:
+            if context is not None and self.color == 'rgb':
+                return context.rgb
+            if context is not None and self.color == 'gray':
+                return context.gray
+            image = frame
+        else:
+            image = cv2.resize(frame, None, fx=self.scale, fy=self.scale,
+                               interpolation=cv2.INTER_AREA)
+        
+        if self.color == 'rgb':
+            return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        if self.color == 'gray':
+            return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return image
+    
+    def detect(self, frame, context=None):
+        """
+        Deteksi wajah pada frame.
+        
+        Parameter
+        ----------
+        frame : numpy.ndarray
+            Frame video BGR resolusi penuh
+        context : FrameContext, opsional
+            Konteks frame untuk berbagi konversi warna pada skala penuh
+        
+        Returns
+        -------
+        list
+            Daftar (x, y, w, h) wajah dalam koordinat frame penuh
+        """
+        with self.metrics.timer(self._metric):
+            image = self._input(frame, context)
+            boxes = self._detect(image)
+        return self._to_frame(boxes, self.scale, frame.shape)
+    
+    @staticmethod
+    def _to_frame(boxes, scale, frame_shape):
+        """Petakan bbox dari gambar berskala scale ke frame penuh, dipotong ke batas frame."""
+        frame_h, frame_w = frame_shape[:2]
+        faces = []
+        for bx, by, bw, bh in boxes:
+            x = max(0, int(bx / scale))
+            y = max(0, int(by / scale))
+            w = min(int(bw / scale), frame_w - x)
+            h = min(int(bh / scale), frame_h - y)
+            if w > 0 and h > 0:
+                faces.append((x, y, w, h))
+        return faces
+    
+    def _detect(self, image):
+        """Bbox (x, y, w, h) dalam koordinat image; diimplementasikan subclass."""
+        raise NotImplementedError
+    
+    def close(self):
+        """Lepaskan resource model."""
+        pass
+
+
+class BlazeFaceDetector(FaceDetectorBackend):
+    """
+    BlazeFace short-range melalui MediaPipe FaceDetection.
+    
+    Model menerima input 128x128, sehingga memperkecil frame sebelum
+    inferensi hanya memangkas biaya konversi dan resize internal tanpa
+    mengubah resolusi efektif model.
+    """
+    
+    name = 'blazeface'
+    color = 'rgb'
+    
+    def __init__(self, scale=None, min_detection_confidence=0.5, metrics=None):
+        """
+        Parameter
+        ----------
+        scale : float, opsional
+            Skala frame untuk deteksi, default dari ROI_CONFIG
+        min_detection_confidence : float, opsional
+            Skor minimum deteksi, default 0.5
+        metrics : MetricsRegistry, opsional
+            Registry latensi deteksi, default registry global
+        """
+        super().__init__(scale, metrics)
+        import mediapipe as mp
+        
+        self.detector = mp.solutions.face_detection.FaceDetection(
+            model_selection=0,  # 0 untuk short-range model
+            min_detection_confidence=min_detection_confidence
+        )
+    
+    def _detect(self, image):
+        results = self.detector.process(image)
+        if not results.detections:
+            return []
+        
+        h, w = image.shape[:2]
+        boxes = []
+        for detection in results.detections:
+            bbox = detection.location_data.relative_bounding_box
+            boxes.append((bbox.xmin * w, bbox.ymin * h, bbox.width * w, bbox.height * h))
+        return boxes
+    
+    def close(self):
+        self.detector.close()
+
+
+class _TaskTimestamps:
+    """Timestamp ms yang naik ketat, syarat mode VIDEO/LIVE_STREAM MediaPipe Tasks."""
+    
+    def __init__(self):
+        self._last = -1
+    
+    def next(self):
+        """Timestamp monotonic berikutnya dalam milidetik."""
+        timestamp = int(time.monotonic() * 1000)
+        if timestamp <= self._last:
+            timestamp = self._last + 1
+        self._last = timestamp
+        return timestamp
+
+
+def _tasks_base_options(mp, model_path):
+    """BaseOptions Tasks untuk file model dengan delegate dari ROI_CONFIG."""
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"File model tidak ditemukan: {model_path}")
+    delegate = mp.tasks.BaseOptions.Delegate.GPU if ROI_CONFIG['tasks_delegate'] == 'gpu' \
+        else mp.tasks.BaseOptions.Delegate.CPU
+    return mp.tasks.BaseOptions(model_asset_path=model_path, delegate=delegate)
+
+
+class BlazeFaceTasksDetector(FaceDetectorBackend):
+    """
+    BlazeFace short-range dari file .tflite bawaan melalui MediaPipe Tasks FaceDetector.
+    
+    Mode 'video': detect_for_video() sinkron di thread pemanggil, tanpa
+    overhead graph legacy mp.solutions. Mode 'live_stream': frame dikirim
+    dengan detect_async() dan inferensi berjalan di thread internal
+    MediaPipe; detect() langsung mengembalikan hasil callback terbaru, yaitu
+    hasil dari pemanggilan detect() sebelumnya (bukan frame saat ini), dan
+    daftar kosong sebelum callback pertama. Jika detect() hanya dipanggil
+    pada keyframe, hasilnya tertinggal satu interval keyframe penuh, karena
+    itu VideoProcessor memakai mode 'video' saat tracking ROI aktif.
+    Frame baru tidak dikirim selama inferensi sebelumnya belum selesai,
+    sehingga antrean tidak menumpuk. Setiap hasil menyimpan skala deteksi
+    dan nomor frame saat dikirim: bbox dipetakan dengan skala tersebut
+    (bukan skala saat ini, yang bisa diubah QualityGovernor di antaranya),
+    dan result_lag mencatat selisih frame hasil terhadap frame saat ini.
+    Latensi inferensi async dicatat sebagai 'detect_face.blazeface_tasks.async'.
+    """
+    
+    name = 'blazeface_tasks'
+    color = 'rgb'
+    
+    def __init__(self, scale=None, running_mode=None, model_path=None,
+                 min_detection_confidence=0.5, metrics=None):
+        """
+        Parameter
+        ----------
+        scale : float, opsional
+            Skala frame untuk deteksi, default dari ROI_CONFIG
+        running_mode : str, opsional
+            'video' atau 'live_stream', default dari ROI_CONFIG
+        model_path : str, opsional
+            Path model .tflite, default dari ROI_CONFIG
+        min_detection_confidence : float, opsional
+            Skor minimum deteksi, default 0.5
+        metrics : MetricsRegistry, opsional
+            Registry latensi deteksi, default registry global
+        """
+        super().__init__(scale, metrics)
+        import mediapipe as mp
+        
+        self.running_mode = running_mode or ROI_CONFIG['tasks_running_mode']
+        if self.running_mode not in ('video', 'live_stream'):
+            raise ValueError(f"Running mode Tasks tidak dikenal: {self.running_mode}")
+        live = self.running_mode == 'live_stream'
+        
+        vision = mp.tasks.vision
+        options = vision.FaceDetectorOptions(
+            base_options=_tasks_base_options(mp, model_path or ROI_CONFIG['blaze_face_model']),
+            running_mode=vision.RunningMode.LIVE_STREAM if live else vision.RunningMode.VIDEO,
+            min_detection_confidence=min_detection_confidence,
+            result_callback=self._on_result if live else None,
+        )
+        self.detector = vision.FaceDetector.create_from_options(options)
+        self._mp = mp
+        self._timestamps = _TaskTimestamps()
+        self._lock = threading.Lock()
+        self._frame_index = 0
+        self._in_flight = None   # (timestamp, skala, nomor frame) yang sedang diinferensi
+        self._latest = ([], self.scale, None)  # (bbox, skala, nomor frame) hasil terakhir
+        self.result_lag = None   # Umur hasil live_stream terakhir dalam pemanggilan detect()
+    
+    @staticmethod
+    def _boxes(result):
+        """Bbox piksel (x, y, w, h) dari FaceDetectorResult."""
+        return [(d.bounding_box.origin_x, d.bounding_box.origin_y,
+                 d.bounding_box.width, d.bounding_box.height) for d in result.detections]
+    
+    def detect(self, frame, context=None):
+        if self.running_mode == 'video':
+            return super().detect(frame, context)
+        
+        with self.metrics.timer(self._metric):
+            image = self._input(frame, context)
+            boxes, scale = self._detect_live(image)
+        # Skala saat frame hasil dikirim, bukan self.scale saat ini
+        return self._to_frame(boxes, scale, frame.shape)
+    
+    def _detect(self, image):
+        mp_image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=image)
+        return self._boxes(self.detector.detect_for_video(mp_image, self._timestamps.next()))
+    
+    def _detect_live(self, image):
+        """
+        Kirim image ke inferensi async (jika tidak ada yang berjalan) dan ambil hasil terakhir.
+        
+        Returns
+        -------
+        tuple
+            (bbox, skala) hasil callback terakhir beserta skala deteksi saat
+            frame tersebut dikirim
+        """
+        self._frame_index += 1
+        timestamp = self._timestamps.next()
+        with self._lock:
+            submit = self._in_flight is None
+            if submit:
+                self._in_flight = (timestamp, self.scale, self._frame_index)
+            boxes, scale, index = self._latest
+        
+        if submit:
+            mp_image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=image)
+            try:
+                self.detector.detect_async(mp_image, timestamp)
+            except Exception:
+                # Tanpa reset, tidak ada frame yang dikirim lagi dan deteksi berhenti diam-diam
+                with self._lock:
+                    self._in_flight = None
+                raise
+        
+        self.result_lag = None if index is None else self._frame_index - index
+        return boxes, scale
+    
+    def _on_result(self, result, output_image, timestamp_ms):
+        """Callback LIVE_STREAM dari thread MediaPipe: simpan hasil terbaru."""
+        boxes = self._boxes(result)
+        with self._lock:
+            if self._in_flight is None or self._in_flight[0] != timestamp_ms:
+                return  # Hasil kiriman yang sudah dibatalkan
+            _, scale, index = self._in_flight
+            self._latest = (boxes, scale, index)
+            self._in_flight = None
+        self.metrics.record(f"{self._metric}.async", time.monotonic() * 1000 - timestamp_ms)
+    
+    def close(self):
+        self.detector.close()
+
+
+class TasksPoseLandmarker:
+    """
+    Adapter PoseLandmarker MediaPipe Tasks (file .task) dengan antarmuka mp.solutions.Pose.
+    
+    process() menerima frame RGB dan mengembalikan objek dengan atribut
+    pose_landmarks berupa NormalizedLandmarkList (atau None), sama seperti
+    hasil Pose legacy, sehingga perhitungan ROI dada dan drawing_utils
+    tidak perlu dibedakan. Berjalan dalam mode VIDEO; eksekusi async
+    ditangani oleh AsyncPoseWorker.
+    """
+    
+    def __init__(self, model_path=None, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        """
+        Parameter
+        ----------
+        model_path : str, opsional
+            Path model pose_landmarker .task, default dari ROI_CONFIG
+        min_detection_confidence : float, opsional
+            Skor minimum deteksi pose, default 0.5
+        min_tracking_confidence : float, opsional
+            Skor minimum tracking pose antar frame, default 0.5
+        """
+        import mediapipe as mp
+        from mediapipe.framework.formats import landmark_pb2
+        
+        vision = mp.tasks.vision
+        options = vision.PoseLandmarkerOptions(
+            base_options=_tasks_base_options(mp, model_path or ROI_CONFIG['pose_model']),
+            running_mode=vision.RunningMode.VIDEO,
+            num_poses=1,
+            min_pose_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            output_segmentation_masks=False,
+        )
+        self.landmarker = vision.PoseLandmarker.create_from_options(options)
+        self._mp = mp
+        self._landmark_pb2 = landmark_pb2
+        self._timestamps = _TaskTimestamps()
+    
+    def process(self, rgb):
+        """
+        Jalankan pose landmarker pada satu frame RGB.
+        
+        Returns
+        -------
+        object
+            Atribut pose_landmarks: NormalizedLandmarkList, atau None jika
+            tidak ada pose terdeteksi
+        """
+        mp_image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=rgb)
+        result = self.landmarker.detect_for_video(mp_image, self._timestamps.next())
+        
+        landmarks = None
+        if result.pose_landmarks:
+            pb2 = self._landmark_pb2
+            landmarks = pb2.NormalizedLandmarkList(landmark=[
+                pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z, visibility=lm.visibility or 0.0)
+                for lm in result.pose_landmarks[0]
+            ])
+        return _PoseResult(landmarks)
+    
+    def close(self):
+        self.landmarker.close()
+
+
+class _PoseResult:
+    """Hasil pose dengan bentuk yang sama seperti mp.solutions.Pose.process()."""
+    
+    __slots__ = ('pose_landmarks',)
+    
+    def __init__(self, pose_landmarks):
+        self.pose_landmarks = pose_landmarks
+
+
+class HaarFaceDetector(FaceDetectorBackend):
+    """Haar cascade frontal face OpenCV pada frame grayscale."""
+    
+    name = 'haar'
+    color = 'gray'
+    
+    def __init__(self, scale=None, scale_factor=None, min_neighbors=None, min_size=30,
+                 metrics=None):
+        """
+        Parameter
+        ----------
+        scale : float, opsional
+            Skala frame untuk deteksi, default dari ROI_CONFIG
+        scale_factor : float, opsional
+            Faktor piramida detectMultiScale, default dari ROI_CONFIG
+        min_neighbors : int, opsional
+            Jumlah tetangga minimum detectMultiScale, default dari ROI_CONFIG
+        min_size : int, opsional
+            Ukuran wajah minimum dalam piksel frame penuh, default 30
+        metrics : MetricsRegistry, opsional
+            Registry latensi deteksi, default registry global
+        """
+        self._full_min_size = min_size
+        super().__init__(scale, metrics)
+        self.scale_factor = scale_factor or ROI_CONFIG['face_scale_factor']
+        self.min_neighbors = min_neighbors or ROI_CONFIG['face_min_neighbors']
+        self.cascade = cv2.CascadeClassifier(
+            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+        )
+        if self.cascade.empty():
+            raise RuntimeError("Haar cascade frontal face tidak dapat dimuat")
+    
+    def set_scale(self, scale):
+        super().set_scale(scale)
+        # Ukuran minimum ikut diperkecil, dibatasi ukuran jendela cascade (24 px)
+        self.min_size = max(24, int(self._full_min_size * self.scale))
+    
+    def _detect(self, image):
+        return self.cascade.detectMultiScale(image, scaleFactor=self.scale_factor,
+                                             minNeighbors=self.min_neighbors,
+                                             minSize=(self.min_size, self.min_size))
+
+
+class DNNFaceDetector(FaceDetectorBackend):
+    """
+    Detektor SSD ResNet-10 (Caffe) melalui modul cv2.dnn.
+    
+    File model tidak disertakan di repositori; path diambil dari ROI_CONFIG
+    ('dnn_model' dan 'dnn_config'). Input jaringan tetap 300x300, jadi
+    skala deteksi hanya mengurangi biaya resize.
+    """
+    
+    name = 'dnn'
+    color = 'bgr'
+    
+    # Rata-rata BGR data latih model res10
+    _MEAN = (104.0, 177.0, 123.0)
+    
+    def __init__(self, scale=None, model_path=None, config_path=None, confidence=None,
+                 metrics=None):
+        """
+        Parameter
+        ----------
+        scale : float, opsional
+            Skala frame untuk deteksi, default dari ROI_CONFIG
+        model_path, config_path : str, opsional
+            Path bobot (.caffemodel) dan arsitektur (.prototxt), default dari ROI_CONFIG
+        confidence : float, opsional
+            Skor minimum deteksi, default dari ROI_CONFIG
+        metrics : MetricsRegistry, opsional
+            Registry latensi deteksi, default registry global
+        """
+        super().__init__(scale, metrics)
+        model_path = model_path or ROI_CONFIG['dnn_model']
+        config_path = config_path or ROI_CONFIG['dnn_config']
+        for path in (model_path, config_path):
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"File model DNN tidak ditemukan: {path}")
+        
+        self.confidence = confidence or ROI_CONFIG['dnn_confidence']
+        self.net = cv2.dnn.readNet(model_path, config_path)
+    
+    def _detect(self, image):
+        h, w = image.shape[:2]
+        blob = cv2.dnn.blobFromImage(image, 1.0, (300, 300), self._MEAN)
+        self.net.setInput(blob)
+        detections = self.net.forward()
+        
+        boxes = []
+        for detection in detections[0, 0]:
+            if detection[2] < self.confidence:
+                continue
+            x1, y1, x2, y2 = detection[3:7]
+            boxes.append((x1 * w, y1 * h, (x2 - x1) * w, (y2 - y1) * h))
+        # Output SSD sudah terurut dari skor tertinggi
+        return boxes
+
+
+# Nama backend -> kelas, dipakai oleh create_face_detector dan benchmark
+FACE_DETECTORS = {
+    'blazeface_tasks': BlazeFaceTasksDetector,
+    'blazeface': BlazeFaceDetector,
+    'haar': HaarFaceDetector,
+    'dnn': DNNFaceDetector,
+}
+
+
+def create_face_detector(name=None, scale=None, **options):
+    """
+    Buat backend detektor wajah berdasarkan nama.
+    
+    Parameter
+    ----------
+    name : str, opsional
+        'blazeface_tasks', 'blazeface', 'haar', atau 'dnn', default dari ROI_CONFIG
+    scale : float, opsional
+        Skala frame untuk deteksi, default dari ROI_CONFIG
+    **options
+        Argumen tambahan untuk konstruktor backend (mis. running_mode, metrics)
+    
+    Returns
+    -------
+    FaceDetectorBackend
+        Backend yang siap dipakai
+    """
+    name = name or ROI_CONFIG['face_detector']
+    if name not in FACE_DETECTORS:
+        raise ValueError(f"Backend detektor wajah tidak dikenal: {name}")
+    return FACE_DETECTORS[name](scale=scale, **options)
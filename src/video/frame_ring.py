@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modul ring buffer frame mentah untuk investigasi pembacaan anomali.
+Menyimpan beberapa detik terakhir (hanya crop ROI dahi dan dada, atau frame
+penuh) di memori dengan batas tetap, dan atas permintaan menulis isinya ke
+klip video lossless (FFV1) di thread latar belakang.
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from src.utils.utils import FRAME_RING_CONFIG
+
+
+class FrameRing:
+    """
+    Ring buffer frame/ROI terbaru dengan ekspor klip lossless.
+    
+    Mode 'roi' menyalin crop dahi dan dada saja (puluhan KB per frame);
+    mode 'frame' menyimpan referensi frame penuh tanpa salinan (frame
+    kamera adalah array baru setiap pembacaan). Saat flush, isi ring
+    di-snapshot lalu ditulis oleh thread terpisah sehingga pemrosesan
+    frame tidak terganggu. Ukuran ROI yang berubah antar frame ditangani
+    dengan padding ke ukuran maksimum (tanpa resize) agar tetap lossless;
+    posisi ROI asli disimpan di file JSON pendamping.
+    """
+    
+    def __init__(self, seconds=None, fps=None, mode=None):
+        """
+        Parameter
+        ----------
+        seconds : float, opsional
+            Panjang riwayat dalam detik, default dari FRAME_RING_CONFIG
+        fps : float, opsional
+            Laju frame nominal untuk kapasitas ring, default dari FRAME_RING_CONFIG
+        mode : str, opsional
+            'roi' (crop dahi dan dada) atau 'frame' (frame penuh)
+        """
+        self.seconds = seconds or FRAME_RING_CONFIG['seconds']
+        self.fps = fps or FRAME_RING_CONFIG['fps']
+        self.mode = mode or FRAME_RING_CONFIG['mode']
+        if self.mode not in ('roi', 'frame'):
+            raise ValueError(f"Mode frame ring tidak dikenal: {self.mode}")
+        
+        self.capacity = max(1, int(round(self.seconds * self.fps)))
+        self._entries = deque(maxlen=self.capacity)
+        self._lock = threading.Lock()
+        self._writers = []
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def clear(self):
+        """Kosongkan ring."""
+        with self._lock:
+            self._entries.clear()
+    
+    def push(self, timestamp, frame, rects):
+        """
+        Tambahkan satu frame ke ring.
+        
+        Parameter
+        ----------
+        timestamp : float
+            Timestamp frame dalam detik
+        frame : numpy.ndarray
+            Frame video BGR
+        rects : dict
+            {'forehead': (x, y, w, h) atau None, 'chest': (x, y, w, h) atau None}
+        """
+        if self.mode == 'frame':
+            images = {'frame': frame}
+        else:
+            images = {}
+            for key, rect in rects.items():
+                if rect is None:
+                    continue
+                x, y, w, h = rect
+                crop = frame[y:y + h, x:x + w]
+                if crop.size:
+                    images[key] = crop.copy()
+        
+        with self._lock:
+            self._entries.append((timestamp, images, dict(rects)))
+    
+    def snapshot(self, seconds=None):
+        """
+        Salinan daftar entri untuk N detik terakhir.
+        
+        Parameter
+        ----------
+        seconds : float, opsional
+            Panjang riwayat yang diambil, default seluruh ring
+        
+        Returns
+        -------
+        list
+            Entri (timestamp, images, rects) dari terlama ke terbaru
+        """
+        with self._lock:
+            entries = list(self._entries)
+        if seconds is not None and entries:
+            t_last = entries[-1][0]
+            entries = [entry for entry in entries if entry[0] >= t_last - seconds]
+        return entries
+    
+    def flush(self, directory=None, seconds=None, on_done=None):
+        """
+        Tulis N detik terakhir ke klip lossless di thread latar belakang.
+        
+        Parameter
+        ----------
+        directory : str, opsional
+            Direktori output; default clip_<timestamp> di dalam
+            FRAME_RING_CONFIG['directory']
+        seconds : float, opsional
+            Panjang klip dalam detik, default seluruh ring
+        on_done : callable, opsional
+            Dipanggil dengan (directory, error) dari thread writer setelah selesai
+        
+        Returns
+        -------
+        str atau None
+            Direktori klip, atau None jika ring kosong
+        """
+        entries = self.snapshot(seconds)
+        if not entries:
+            return None
+        
+        if directory is None:
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            directory = os.path.join(FRAME_RING_CONFIG['directory'], f"clip_{stamp}")
+        
+        writer = threading.Thread(target=self._write_clip, args=(entries, directory, on_done),
+                                  name="FrameRingWriter", daemon=True)
+        self._writers = [w for w in self._writers if w.is_alive()]
+        self._writers.append(writer)
+        writer.start()
+        return directory
+    
+    def wait(self, timeout=None):
+        """Tunggu semua flush yang sedang berjalan selesai."""
+        for writer in list(self._writers):
+            writer.join(timeout)
+    
+    def _write_clip(self, entries, directory, on_done):
+        """Isi thread writer: satu klip per ROI dan file JSON pendamping."""
+        error = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            timestamps = [entry[0] for entry in entries]
+            duration = timestamps[-1] - timestamps[0]
+            fps = (len(entries) - 1) / duration if duration > 0 else self.fps
+            
+            streams = {}
+            for key in sorted({key for _, images, _ in entries for key in images}):
+                streams[key] = _write_stream(directory, key, entries, fps)
+            
+            meta = {
+                'mode': self.mode,
+                'fps': fps,
+                'frames': len(entries),
+                'timestamps': timestamps,
+                'rects': [{key: (list(map(int, rect)) if rect is not None else None)
+                           for key, rect in rects.items()} for _, _, rects in entries],
+                'streams': streams,
+            }
+            with open(os.path.join(directory, 'clip.json'), 'w') as f:
+                json.dump(meta, f, indent=2)
+        except Exception as e:
+            error = e
+            print(f"Warning: Gagal menyimpan klip frame: {e}")
+        
+        if on_done is not None:
+            on_done(directory, error)
+
+
+def _write_stream(directory, key, entries, fps):
+    """
+    Tulis satu stream (mis. 'forehead') sebagai video FFV1, fallback ke npz.
+    
+    Frame tanpa crop untuk stream ini ditulis sebagai frame hitam agar
+    indeks frame tetap sejajar dengan timestamps di clip.json.
+    
+    Returns
+    -------
+    dict
+        Info stream: file, format, ukuran frame, dan indeks frame yang kosong
+    """
+    images = [entry[1].get(key) for entry in entries]
+    present = [image for image in images if image is not None]
+    # Ukuran genap: encoder video membulatkan dimensi ganjil ke bawah
+    height = max(image.shape[0] for image in present)
+    width = max(image.shape[1] for image in present)
+    height, width = height + height % 2, width + width % 2
+    missing = [i for i, image in enumerate(images) if image is None]
+    
+    def padded(image):
+        canvas = np.zeros((height, width, 3), dtype=np.uint8)
+        if image is not None:
+            canvas[:image.shape[0], :image.shape[1]] = image
+        return canvas
+    
+    codec = FRAME_RING_CONFIG['codec']
+    path = os.path.join(directory, f"{key}.mkv")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*codec), fps, (width, height))
+    if writer.isOpened():
+        try:
+            for image in images:
+                writer.write(padded(image))
+        finally:
+            writer.release()
+        file_name, file_format = os.path.basename(path), codec
+    else:
+        # Codec lossless tidak tersedia di build OpenCV: simpan array terkompresi
+        writer.release()
+        if os.path.exists(path):
+            os.remove(path)
+        print(f"Warning: Codec {codec} tidak tersedia, klip {key} disimpan sebagai npz")
+        file_name, file_format = f"{key}.npz", 'npz'
+        np.savez_compressed(os.path.join(directory, file_name),
+                            frames=np.stack([padded(image) for image in images]))
+    
+    return {'file': file_name, 'format': file_format, 'size': [width, height],
+            'missing': missing}
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modul governor kualitas adaptif untuk mesin dengan CPU terbatas.
+Memantau latensi frame terhadap anggaran waktu dan menurunkan kualitas
+secara bertahap (kompleksitas pose, frekuensi dan resolusi deteksi wajah,
+laju refresh plot, laju estimasi spektral) saat kelebihan beban, lalu
+memulihkannya kembali saat ada ruang.
+"""
+
+import threading
+
+from src.utils.metrics import RollingHistogram, get_metrics
+from src.utils.utils import METRICS_CONFIG, QUALITY_CONFIG
+
+
+class QualityGovernor:
+    """
+    Pengatur level kualitas berdasarkan persentil latensi frame.
+    
+    Pipeline memanggil record() dengan latensi setiap frame. Setiap
+    window_frames frame, p95 jendela dibandingkan dengan anggaran: di atas
+    degrade_ratio x anggaran level naik (kualitas turun), di bawah
+    restore_ratio x anggaran level turun (kualitas pulih). Jendela
+    dikosongkan setelah setiap evaluasi sehingga keputusan berikutnya hanya
+    memakai frame yang diproses dengan pengaturan baru. Pemulihan
+    membutuhkan lebih banyak evaluasi berturut-turut daripada penurunan
+    agar level tidak berosilasi.
+    
+    Jika pose berjalan di AsyncPoseWorker, pose tidak berada di jalur
+    latensi frame yang diukur, sehingga langkah yang hanya menurunkan
+    kompleksitas pose dilewati (lihat _effective_levels) dan kompleksitas
+    pose tidak diubah.
+    
+    Level saat ini tersedia di atribut level (0 = kualitas penuh) dan
+    settings; level juga direkam per frame oleh pipeline ke kolom sesi
+    'quality_level' sehingga akurasi bisa dikorelasikan dengan degradasi.
+    """
+    
+    def __init__(self, video_processor, pipeline=None, budget_ms=None, levels=None, metrics=None):
+        """
+        Parameter
+        ----------
+        video_processor : VideoProcessor
+            Processor yang kompleksitas pose, tracker, dan detektornya diatur
+        pipeline : FramePipeline, opsional
+            Pipeline yang estimate_interval-nya diatur
+        budget_ms : float, opsional
+            Anggaran waktu per frame, default dari METRICS_CONFIG
+        levels : list of dict, opsional
+            Pengaturan per level, default dari QUALITY_CONFIG
+        metrics : MetricsRegistry, opsional
+            Registry untuk counter perubahan level, default registry global
+        """
+        self.video_processor = video_processor
+        self.pipeline = pipeline
+        self.budget_ms = budget_ms or METRICS_CONFIG['frame_budget_ms']
+        self.levels = self._effective_levels(levels or QUALITY_CONFIG['levels'],
+                                             video_processor.pose_worker is not None)
+        self.metrics = metrics or get_metrics()
+        
+        self.window_frames = QUALITY_CONFIG['window_frames']
+        self.degrade_ratio = QUALITY_CONFIG['degrade_ratio']
+        self.restore_ratio = QUALITY_CONFIG['restore_ratio']
+        self.degrade_after = QUALITY_CONFIG['degrade_after']
+        self.restore_after = QUALITY_CONFIG['restore_after']
+        
+        self._lock = threading.Lock()
+        self._window = RollingHistogram(self.window_frames)
+        self.level = 0
+        self.last_p95 = None
+        self._over = 0
+        self._under = 0
+        self._apply(self.levels[0])
+    
+    @staticmethod
+    def _effective_levels(levels, async_pose):
+        """
+        Daftar level yang dipakai: tanpa pose_complexity jika pose async.
+        
+        Level yang setelah itu identik dengan level sebelumnya dibuang,
+        sehingga setiap kenaikan level benar-benar mengurangi kerja di jalur
+        frame yang diukur.
+        """
+        if not async_pose:
+            return list(levels)
+        effective = []
+        for settings in levels:
+            settings = {key: value for key, value in settings.items() if key != 'pose_complexity'}
+            if not effective or settings != effective[-1]:
+                effective.append(settings)
+        return effective
+    
+    @property
+    def max_level(self):
+        """Level kualitas terendah yang tersedia."""
+        return len(self.levels) - 1
+    
+    @property
+    def settings(self):
+        """Pengaturan level saat ini (dict dari QUALITY_CONFIG['levels'])."""
+        return self.levels[self.level]
+    
+    def reset(self):
+        """Kembali ke level 0 dan kosongkan jendela evaluasi (mis. saat sesi baru)."""
+        with self._lock:
+            self._window.reset()
+            self._over = 0
+            self._under = 0
+            self.last_p95 = None
+            if self.level != 0:
+                self.level = 0
+                self._apply(self.levels[0])
+    
+    def record(self, frame_ms):
+        """
+        Catat latensi satu frame dan evaluasi level setiap window_frames frame.
+        
+        Parameter
+        ----------
+        frame_ms : float
+            Latensi pemrosesan frame dalam ms
+        """
+        with self._lock:
+            self._window.record(frame_ms)
+            if self._window.count < self.window_frames:
+                return
+            
+            p95 = self._window.summary()['p95']
+            self._window.reset()
+            self.last_p95 = p95
+            
+            if p95 > self.degrade_ratio * self.budget_ms:
+                self._over += 1
+                self._under = 0
+            elif p95 < self.restore_ratio * self.budget_ms:
+                self._under += 1
+                self._over = 0
+            else:
+                self._over = 0
+                self._under = 0
+            
+            if self._over >= self.degrade_after and self.level < self.max_level:
+                self._set_level(self.level + 1)
+            elif self._under >= self.restore_after and self.level > 0:
+                self._set_level(self.level - 1)
+    
+    def set_level(self, level):
+        """
+        Paksa level kualitas tertentu (mis. untuk eksperimen akurasi).
+        
+        Parameter
+        ----------
+        level : int
+            Level 0 sampai max_level
+        """
+        if not 0 <= level <= self.max_level:
+            raise ValueError(f"Level kualitas harus di antara 0 dan {self.max_level}: {level}")
+        with self._lock:
+            self._window.reset()
+            self.last_p95 = None
+            self._set_level(level)
+    
+    def _set_level(self, level):
+        """Terapkan level baru (dipanggil dengan lock dipegang)."""
+        previous, self.level = self.level, level
+        self._over = 0
+        self._under = 0
+        self._apply(self.levels[level])
+        self.metrics.increment('quality.level_changes')
+        p95 = f", p95 {self.last_p95:.1f} ms" if self.last_p95 is not None else ""
+        print(f"Level kualitas {previous} -> {level} (anggaran {self.budget_ms:.1f} ms{p95})")
+    
+    def _apply(self, settings):
+        """Terapkan pengaturan level ke processor dan pipeline."""
+        processor = self.video_processor
+        if 'pose_complexity' in settings:
+            # Tidak blocking: graph pose baru dibangun di thread latar
+            processor.set_pose_complexity(settings['pose_complexity'])
+        if processor.tracker is not None:
+            processor.tracker.detect_interval = max(1, int(settings['detect_interval']))
+        processor.face_detector.set_scale(settings['detection_scale'])
+        if self.pipeline is not None:
+            self.pipeline.estimate_interval = max(1, int(settings['estimate_interval']))
+    
+    def state(self):
+        """
+        Ringkasan status governor untuk tampilan atau ekspor.
+        
+        Returns
+        -------
+        dict
+            level, max_level, last_p95 (ms), budget_ms, dan settings
+        """
+        with self._lock:
+            return {'level': self.level, 'max_level': self.max_level,
+                    'last_p95': self.last_p95, 'budget_ms': self.budget_ms,
+                    'settings': dict(self.settings)}
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modul pipeline pemrosesan frame yang terpisah dari event loop GUI.
+Berisi pemrosesan satu frame (deteksi, ROI, sinyal, estimasi) dan
+worker thread yang mengonsumsi antrean frame dari ThreadedCamera.
+"""
+
+import threading
+import time
+import cv2
+
+from src.video.processor import get_processor
+from src.signal.respiration import RespirationSignalProcessor
+from src.signal.rppg import RPPGSignalProcessor
+from src.utils.metrics import get_metrics
+from src.utils.utils import ROI_COLORS
+
+
+class FramePipeline:
+    """Kelas untuk memproses satu frame menjadi sinyal dan estimasi laju."""
+    
+    def __init__(self, resp_processor=None, rppg_processor=None, video_processor=None,
+                 metrics=None):
+        """
+        Inisialisasi pipeline frame.
+        
+        Parameter
+        ----------
+        resp_processor : RespirationSignalProcessor, opsional
+            Processor sinyal respirasi, dibuat baru jika None
+        rppg_processor : RPPGSignalProcessor, opsional
+            Processor sinyal rPPG, dibuat baru jika None
+        video_processor : VideoProcessor, opsional
+            Detektor ROI, gunakan instance singleton jika None (dibuat saat
+            pertama dibutuhkan, sehingga pipeline yang selalu menerima
+            context tidak memuat MediaPipe)
+        metrics : MetricsRegistry, opsional
+            Registry timer per tahap, gunakan registry global jika None
+            
+        Atribut recorder (SessionRecorder, default None) dapat diisi untuk
+        merekam setiap sampel, ROI, dan estimasi laju ke file sesi,
+        frame_ring (FrameRing, default None) untuk menyimpan frame/ROI
+        terbaru yang bisa diekspor sebagai klip, dan governor
+        (QualityGovernor, default None) yang menerima latensi setiap frame.
+        estimate_interval (default 1) menjalankan estimasi laju hanya setiap
+        N frame; di antaranya estimasi terakhir dipakai ulang.
+        """
+        self.resp_processor = resp_processor or RespirationSignalProcessor()
+        self.rppg_processor = rppg_processor or RPPGSignalProcessor()
+        self._video_processor = video_processor
+        self.metrics = metrics or get_metrics()
+        self.recorder = None
+        self.frame_ring = None
+        self.governor = None
+        self.estimate_interval = 1
+        self.start_time = None
+        self._last_timestamp = None
+        self._frame_index = 0
+        self._last_rates = {'heart_rate': None, 'resp_rate': None}
+    
+    @property
+    def video_processor(self):
+        """VideoProcessor pipeline (singleton jika tidak diberikan)."""
+        if self._video_processor is None:
+            self._video_processor = get_processor()
+        return self._video_processor
+    
+    def reset(self):
+        """Reset processor sinyal dan waktu mulai."""
+        self.resp_processor.reset()
+        self.rppg_processor.reset()
+        if self._video_processor is not None:
+            self._video_processor.reset_tracking()
+        self.start_time = None
+        self._last_timestamp = None
+        self._frame_index = 0
+        self._last_rates = {'heart_rate': None, 'resp_rate': None}
+    
+    def process_frame(self, frame, timestamp, draw_overlay=True, context=None):
+        """
+        Proses satu frame: deteksi wajah, ekstraksi ROI, dan pemrosesan sinyal.
+        
+        Parameter
+        ----------
+        frame : numpy.ndarray
+            Frame video BGR
+        timestamp : float
+            Timestamp monotonic saat frame diambil (detik)
+        draw_overlay : bool, opsional
+            Apakah menggambar kotak ROI pada salinan frame, default True
+        context : FrameContext, opsional
+            Hasil analisis frame yang sudah ada (mis. satu subjek dari
+            banyak wajah); jika None frame dianalisis oleh video_processor
+        
+        Returns
+        -------
+        dict
+            Hasil pemrosesan frame (frame tampilan, ROI, sinyal, estimasi)
+        """
+        start = time.perf_counter()
+        with self.metrics.timer('frame.total'):
+            result = self._process_frame(frame, timestamp, draw_overlay, context)
+        
+        governor = self.governor
+        if governor is not None:
+            governor.record((time.perf_counter() - start) * 1000.0)
+        return result
+    
+    def _process_frame(self, frame, timestamp, draw_overlay, context):
+        """Isi process_frame; setiap tahap dicatat ke registry metrik."""
+        metrics = self.metrics
+        metrics.increment('frames')
+        
+        # Interval antar frame kamera (laju pemrosesan efektif)
+        if self._last_timestamp is not None:
+            metrics.record('frame.interval', (timestamp - self._last_timestamp) * 1000.0)
+        self._last_timestamp = timestamp
+        
+        # Waktu relatif terhadap frame pertama
+        if self.start_time is None:
+            self.start_time = timestamp
+        elapsed_time = timestamp - self.start_time
+        
+        result = {
+            'timestamp': elapsed_time,
+            'frame': None,
+            'face_rect': None,
+            'forehead_rect': None,
+            'chest_rect': None,
+            'rppg_signal': None,
+            'resp_signal': None,
+            'heart_rate': None,
+            'resp_rate': None,
+        }
+        
+        display_frame = frame.copy() if draw_overlay else None
+        rppg_sample, resp_sample = None, None
+        
+        # Estimasi laju (analisis spektral) hanya setiap estimate_interval frame
+        run_estimate = self._frame_index % max(1, self.estimate_interval) == 0
+        self._frame_index += 1
+        
+        # Analisis frame: konversi RGB dan setiap model dijalankan sekali
+        if context is None:
+            with metrics.timer('analyze_frame'):
+                context = self.video_processor.analyze_frame(frame, timestamp)
+        
+        face_rect = context.face_rect
+        if face_rect is None:
+            metrics.increment('frames_no_face')
+        else:
+            x, y, w, h = face_rect
+            result['face_rect'] = (x, y, w, h)
+            if draw_overlay:
+                cv2.rectangle(display_frame, (x, y), (x+w, y+h), ROI_COLORS['face'], 2)
+            
+            # ROI dahi untuk rPPG
+            if context.forehead is not None:
+                forehead_roi, (fx, fy, fw, fh) = context.forehead
+                result['forehead_rect'] = (fx, fy, fw, fh)
+                if draw_overlay:
+                    cv2.rectangle(display_frame, (fx, fy), (fx+fw, fy+fh), ROI_COLORS['forehead'], 2)
+                
+                with metrics.timer('rppg.process_roi'):
+                    rppg_sample = self.rppg_processor.process_roi(forehead_roi, elapsed_time,
+                                                    roi_stats=context.roi_stats,
+                                                    rect=(fx, fy, fw, fh))
+                
+                with metrics.timer('rppg.get_filtered_signal'):
+                    rppg_time, rppg_signal = self.rppg_processor.get_filtered_signal()
+                if len(rppg_signal) > 5:  # Pastikan ada cukup data
+                    # Salin view ring buffer agar aman dibaca thread GUI
+                    result['rppg_signal'] = (rppg_time.copy(), rppg_signal.copy())
+                    if run_estimate:
+                        with metrics.timer('rppg.estimate'):
+                            self._last_rates['heart_rate'] = self.rppg_processor.estimate_heart_rate()
+                    result['heart_rate'] = self._last_rates['heart_rate']
+            
+            # ROI dada untuk respirasi
+            if context.chest is not None:
+                chest_roi, (cx, cy, cw, ch) = context.chest
+                result['chest_rect'] = (cx, cy, cw, ch)
+                if draw_overlay:
+                    cv2.rectangle(display_frame, (cx, cy), (cx+cw, cy+ch), ROI_COLORS['chest'], 2)
+                
+                with metrics.timer('resp.process_roi'):
+                    resp_sample = self.resp_processor.process_roi(chest_roi, elapsed_time,
+                                                    roi_stats=context.roi_stats,
+                                                    rect=(cx, cy, cw, ch),
+                                                    gray=context.gray)
+                
+                with metrics.timer('resp.get_filtered_signal'):
+                    resp_time, resp_signal = self.resp_processor.get_filtered_signal()
+                if len(resp_signal) > 5:  # Pastikan ada cukup data
+                    # Salin view ring buffer agar aman dibaca thread GUI
+                    result['resp_signal'] = (resp_time.copy(), resp_signal.copy())
+                    if run_estimate:
+                        with metrics.timer('resp.estimate'):
+                            self._last_rates['resp_rate'] = self.resp_processor.estimate_respiration_rate()
+                    result['resp_rate'] = self._last_rates['resp_rate']
+        
+        result['frame'] = display_frame
+        
+        frame_ring = self.frame_ring
+        if frame_ring is not None:
+            frame_ring.push(timestamp, frame, {'forehead': result['forehead_rect'],
+                                               'chest': result['chest_rect']})
+        
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record(self._session_row(result, rppg_sample is not None,
+                                              resp_sample is not None))
+        return result
+    
+    def _session_row(self, result, new_rppg, new_resp):
+        """
+        Satu baris rekaman sesi dari hasil frame dan sampel terbaru processor.
+        
+        Parameter
+        ----------
+        result : dict
+            Hasil process_frame
+        new_rppg, new_resp : bool
+            Apakah processor menambahkan sampel baru pada frame ini
+        
+        Returns
+        -------
+        dict
+            Nilai per kolom SESSION_COLUMNS (kolom kosong tidak disertakan)
+        """
+        row = {'time': result['timestamp']}
+        if new_rppg:
+            buffer = self.rppg_processor.buffer
+            row['rppg_r'] = buffer.last('r')
+            row['rppg_g'] = buffer.last('g')
+            row['rppg_b'] = buffer.last('b')
+            row['rppg_pulse'] = buffer.last('pulse')
+            row['rppg_filtered'] = buffer.last('filtered')
+        if new_resp:
+            buffer = self.resp_processor.buffer
+            row['resp_raw'] = buffer.last('signal')
+            row['resp_filtered'] = buffer.last('filtered')
+        if result['heart_rate'] is not None:
+            row['heart_rate'] = result['heart_rate']
+        if result['resp_rate'] is not None:
+            row['resp_rate'] = result['resp_rate']
+        if self.governor is not None:
+            row['quality_level'] = self.governor.level
+        for key in ('face', 'forehead', 'chest'):
+            rect = result[f'{key}_rect']
+            if rect is not None:
+                row[f'{key}_x'], row[f'{key}_y'], row[f'{key}_w'], row[f'{key}_h'] = rect
+        return row
+
+
+class PipelineWorker(threading.Thread):
+    """
+    Worker thread yang mengonsumsi antrean frame kamera dan memproses tiap frame.
+    
+    GUI hanya membaca hasil terbaru melalui get_latest_result(), sehingga
+    capture dan pemrosesan tidak lagi memblokir event loop Qt.
+    """
+    
+    def __init__(self, camera, pipeline):
+        """
+        Inisialisasi worker.
+        
+        Parameter
+        ----------
+        camera : ThreadedCamera
+            Sumber frame bertimestamp
+        pipeline : FramePipeline
+            Pipeline yang memproses setiap frame
+        """
+        super().__init__(name="PipelineWorker", daemon=True)
+        self.camera = camera
+        self.pipeline = pipeline
+        
+        # Lock untuk akses processor dari thread lain (mis. simpan data)
+        self.lock = threading.Lock()
+        self._result_lock = threading.Lock()
+        self._latest_result = None
+        self._result_seq = 0
+        self._stop_event = threading.Event()
+    
+    def run(self):
+        """Loop utama worker."""
+        while not self._stop_event.is_set():
+            item = self.camera.get_frame(timeout=0.1)
+            if item is None:
+                if not self.camera.is_running:
+                    break
+                continue
+            
+            frame, timestamp = item
+            try:
+                with self.lock:
+                    result = self.pipeline.process_frame(frame, timestamp)
+            except Exception as e:
+                print(f"Warning: Error dalam pemrosesan frame: {e}")
+                continue
+            
+            with self._result_lock:
+                self._latest_result = result
+                self._result_seq += 1
+    
+    def get_latest_result(self):
+        """
+        Ambil hasil pemrosesan terbaru.
+        
+        Returns
+        -------
+        tuple
+            (seq, result) dengan seq bertambah setiap ada hasil baru
+        """
+        with self._result_lock:
+            return self._result_seq, self._latest_result
+    
+    def stop(self, timeout=1.0):
+        """Hentikan worker dan tunggu thread selesai."""
+        self._stop_event.set()
+        if self.is_alive() and self is not threading.current_thread():
+            self.join(timeout=timeout)
@@ -7,19 +7,381 @@ Menggunakan BlazeFace dan Pose Landmarker dari folder models/.
 
 import cv2
 import numpy as np
-import mediapipe as mp
 import os
+import threading
+import time
+
+from src.utils.metrics import get_metrics, timed
+from src.utils.utils import ROI_COLORS
+from src.video.detectors import TasksPoseLandmarker, create_face_detector
+from src.video.roi_stats import ROIStatistics, union_rect
+
+# Penanda bahwa sebuah model belum dijalankan pada frame
+_NOT_RUN = object()
+
+class FrameContext:
+    """
+    Konteks analisis per frame yang dipakai bersama oleh semua konsumen.
+    
+    Konversi BGR ke RGB dilakukan sekali saja, dan setiap model MediaPipe
+    dijalankan paling banyak sekali per frame. Hasil deteksi (bbox wajah,
+    pose landmarks, ROI) disimpan agar tidak dihitung ulang. Statistik
+    warna semua ROI berasal dari satu integral image (roi_stats).
+    """
+    
+    def __init__(self, frame):
+        """
+        Parameter
+        ----------
+        frame : numpy.ndarray
+            Frame video BGR
+        """
+        self.frame = frame
+        self._rgb = None
+        self._gray = None
+        self._roi_stats = None
+        self.face_results = _NOT_RUN
+        self.pose_results = _NOT_RUN
+        self.face_rect = None
+        self.forehead = None  # (roi, (x, y, w, h))
+        self.chest = None     # (roi, (x, y, w, h))
+        self.tracked = False  # True jika ROI berasal dari tracker, bukan detektor
+    
+    @property
+    def rgb(self):
+        """Frame dalam format RGB, dikonversi saat pertama kali dibutuhkan."""
+        if self._rgb is None:
+            self._rgb = cv2.cvtColor(self.frame, cv2.COLOR_BGR2RGB)
+        return self._rgb
+    
+    @property
+    def gray(self):
+        """Frame grayscale, dikonversi saat pertama kali dibutuhkan."""
+        if self._gray is None:
+            self._gray = cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY)
+        return self._gray
+    
+    @property
+    def roi_stats(self):
+        """
+        Statistik ROI (integral image) untuk area yang mencakup ROI dahi dan dada.
+        
+        Dibuat saat pertama kali dibutuhkan, setelah ROI frame ini ditetapkan.
+        """
+        if self._roi_stats is None:
+            rects = [roi[1] for roi in (self.forehead, self.chest) if roi is not None]
+            self._roi_stats = ROIStatistics(self.frame, union_rect(rects))
+        return self._roi_stats
+
+class ROITracker:
+    """
+    Tracker ROI ringan (template matching) di antara keyframe deteksi.
+    
+    Detektor hanya dijalankan setiap detect_interval frame. Di antaranya,
+    posisi setiap ROI dicari dengan template matching pada frame yang
+    diperkecil di sekitar posisi terakhir. Jika korelasi turun di bawah
+    min_confidence, tracker meminta deteksi ulang.
+    """
+    
+    def __init__(self, detect_interval=5, min_confidence=0.6, search_margin=0.25, scale=0.5,
+                 metrics=None):
+        """
+        Parameter
+        ----------
+        detect_interval : int, opsional
+            Jumlah frame maksimum di antara dua deteksi, default 5
+        min_confidence : float, opsional
+            Korelasi TM_CCOEFF_NORMED minimum agar hasil tracking diterima
+        search_margin : float, opsional
+            Margin area pencarian relatif terhadap ukuran ROI
+        scale : float, opsional
+            Skala frame untuk tracking, default 0.5
+        metrics : MetricsRegistry, opsional
+            Registry untuk timer 'roi_tracking', default registry global
+        """
+        self.detect_interval = max(1, int(detect_interval))
+        self.metrics = metrics
+        self.min_confidence = min_confidence
+        self.search_margin = search_margin
+        self.scale = scale
+        
+        # Statistik
+        self.detection_count = 0
+        self.tracked_count = 0
+        self.lost_count = 0
+        self.reset()
+    
+    def reset(self):
+        """Hapus template sehingga frame berikutnya menjalankan deteksi."""
+        self._templates = {}
+        self._frames_since_detection = 0
+        self.last_confidence = {}
+    
+    def needs_detection(self):
+        """True jika frame ini harus menjalankan detektor."""
+        return (not self._templates or
+                self._frames_since_detection >= self.detect_interval - 1)
+    
+    def _downscale(self, gray):
+        """Perkecil frame grayscale untuk tracking."""
+        if self.scale == 1.0:
+            return gray
+        return cv2.resize(gray, None, fx=self.scale, fy=self.scale,
+                          interpolation=cv2.INTER_AREA)
+    
+    def update(self, gray, rects):
+        """
+        Simpan template baru dari hasil deteksi keyframe.
+        
+        Parameter
+        ----------
+        gray : numpy.ndarray
+            Frame grayscale
+        rects : dict
+            Nama ROI -> (x, y, w, h) hasil deteksi, atau None jika tidak terdeteksi
+        """
+        small = self._downscale(gray)
+        self._templates = {}
+        for name, rect in rects.items():
+            if rect is None:
+                continue
+            x, y, w, h = rect
+            sx, sy = int(x * self.scale), int(y * self.scale)
+            sw, sh = int(w * self.scale), int(h * self.scale)
+            if sw < 8 or sh < 8:
+                continue  # Terlalu kecil untuk template matching yang andal
+            template = small[sy:sy+sh, sx:sx+sw].copy()
+            if template.shape[:2] != (sh, sw):
+                continue
+            self._templates[name] = {'template': template, 'pos': (sx, sy), 'size': (w, h)}
+        
+        self._frames_since_detection = 0
+        self.detection_count += 1
+    
+    @timed('roi_tracking')
+    def track(self, gray):
+        """
+        Lacak semua ROI pada frame baru.
+        
+        Parameter
+        ----------
+        gray : numpy.ndarray
+            Frame grayscale
+            
+        Returns
+        -------
+        dict atau None
+            Nama ROI -> (x, y, w, h) pada resolusi penuh, atau None jika
+            ada ROI yang hilang (deteksi ulang diperlukan)
+        """
+        if not self._templates:
+            return None
+        
+        small = self._downscale(gray)
+        small_h, small_w = small.shape[:2]
+        frame_h, frame_w = gray.shape[:2]
+        rects = {}
+        
+        for name, entry in self._templates.items():
+            template = entry['template']
+            th, tw = template.shape[:2]
+            px, py = entry['pos']
+            margin = int(max(tw, th) * self.search_margin) + 2
+            
+            # Area pencarian di sekitar posisi terakhir
+            x0, y0 = max(0, px - margin), max(0, py - margin)
+            x1, y1 = min(small_w, px + tw + margin), min(small_h, py + th + margin)
+            region = small[y0:y1, x0:x1]
+            if region.shape[0] < th or region.shape[1] < tw:
+                self.lost_count += 1
+                return None
+            
+            scores = cv2.matchTemplate(region, template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(scores)
+            self.last_confidence[name] = max_val
+            if not np.isfinite(max_val) or max_val < self.min_confidence:
+                self.lost_count += 1
+                return None
+            
+            nx, ny = x0 + max_loc[0], y0 + max_loc[1]
+            entry['pos'] = (nx, ny)
+            
+            # Kembalikan ke resolusi penuh, ukuran ROI mengikuti keyframe
+            w, h = entry['size']
+            x = max(0, min(int(nx / self.scale), frame_w - w))
+            y = max(0, min(int(ny / self.scale), frame_h - h))
+            rects[name] = (x, y, w, h)
+        
+        self._frames_since_detection += 1
+        self.tracked_count += 1
+        return rects
+
+class AsyncPoseWorker:
+    """
+    Worker thread untuk pose detection dengan semantik hasil terbaru.
+    
+    Frame dikirim lewat submit() tanpa blocking; jika worker masih sibuk,
+    frame yang menunggu diganti frame terbaru. Worker selalu memproses frame
+    terbaru dan mempublikasikan ROI dada terakhir, sehingga sampling rPPG
+    dan respirasi tidak menunggu latensi model pose.
+    """
+    
+    def __init__(self, processor):
+        """
+        Parameter
+        ----------
+        processor : VideoProcessor
+            Processor pemilik pose detector
+        """
+        self.processor = processor
+        self._condition = threading.Condition()
+        self._pending = None  # (frame, timestamp) terbaru yang belum diproses
+        self._latest_rect = None
+        self._latest_timestamp = None
+        self._running = False
+        self._thread = None
+        
+        # Statistik
+        self.submitted_count = 0
+        self.processed_count = 0
+        self.last_latency = 0.0
+    
+    def start(self):
+        """Mulai thread worker jika belum berjalan."""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="AsyncPose", daemon=True)
+        self._thread.start()
+    
+    def submit(self, frame, timestamp=None):
+        """
+        Kirim frame terbaru untuk diproses (tidak blocking).
+        
+        Parameter
+        ----------
+        frame : numpy.ndarray
+            Frame BGR; tidak boleh diubah setelah dikirim
+        timestamp : float, opsional
+            Timestamp monotonic frame, default waktu saat ini
+        """
+        if not self._running:
+            self.start()
+        if timestamp is None:
+            timestamp = time.monotonic()
+        with self._condition:
+            self._pending = (frame, timestamp)
+            self.submitted_count += 1
+            self._condition.notify()
+    
+    def _run(self):
+        """Loop worker: ambil frame terbaru, jalankan pose, publikasikan ROI."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or not self._running)
+                if not self._running:
+                    return
+                frame, timestamp = self._pending
+                self._pending = None
+            
+            start = time.perf_counter()
+            rect = self.processor.detect_chest_rect(frame)
+            
+            with self._condition:
+                self.last_latency = time.perf_counter() - start
+                self.processed_count += 1
+                if rect is not None:
+                    self._latest_rect = rect
+                    self._latest_timestamp = timestamp
+    
+    def latest_rect(self, max_age=None, now=None):
+        """
+        Ambil ROI dada terbaru.
+        
+        Parameter
+        ----------
+        max_age : float, opsional
+            Umur maksimum hasil dalam detik, None untuk tanpa batas
+        now : float, opsional
+            Timestamp acuan, default waktu monotonic saat ini
+            
+        Returns
+        -------
+        tuple atau None
+            (x, y, w, h) ROI dada, atau None jika belum ada/terlalu lama
+        """
+        with self._condition:
+            rect, timestamp = self._latest_rect, self._latest_timestamp
+        if rect is None:
+            return None
+        if max_age is not None:
+            now = time.monotonic() if now is None else now
+            if now - timestamp > max_age:
+                return None
+        return rect
+    
+    def reset(self):
+        """Buang hasil dan frame yang menunggu."""
+        with self._condition:
+            self._pending = None
+            self._latest_rect = None
+            self._latest_timestamp = None
+    
+    def stop(self):
+        """Hentikan thread worker."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+        self._thread = None
 
 class VideoProcessor:
     """Kelas untuk memproses video dan mendeteksi ROI dengan MediaPipe models."""
     
-    def __init__(self):
+    def __init__(self, tracking=None, async_pose=None, metrics=None):
         """
         Inisialisasi processor dengan model MediaPipe dari folder models/.
+        
+        Parameter
+        ----------
+        tracking : bool, opsional
+            Aktifkan tracking ROI di antara keyframe deteksi pada analyze_frame,
+            ambil dari ROI_CONFIG jika None
+        async_pose : bool, opsional
+            Jalankan pose detection di worker thread pada analyze_frame,
+            ambil dari ROI_CONFIG jika None. Sebaiknya False untuk analisis
+            offline yang tidak berjalan real-time.
+        metrics : MetricsRegistry, opsional
+            Registry timer deteksi, tracking, dan detektor wajah, default
+            registry global; sesi per kamera memberi registry sendiri
         """
+        from src.utils.utils import ROI_CONFIG
+        
+        self.metrics = metrics or get_metrics()
+        if tracking is None:
+            tracking = ROI_CONFIG['tracking_enabled']
+        if async_pose is None:
+            async_pose = ROI_CONFIG['async_pose']
+        self.pose_max_age = ROI_CONFIG['pose_max_age']
+        self._pose_lock = threading.Lock()
+        self._pose_rebuild_lock = threading.Lock()
+        self._pose_rebuild_thread = None
+        self.tracker = None
+        if tracking:
+            self.tracker = ROITracker(
+                detect_interval=ROI_CONFIG['detect_interval'],
+                min_confidence=ROI_CONFIG['tracker_min_confidence'],
+                search_margin=ROI_CONFIG['tracker_search_margin'],
+                scale=ROI_CONFIG['tracker_scale'],
+                metrics=self.metrics,
+            )
+        
         # Path ke model files di direktori models/
-        self.blaze_face_model = "models/blaze_face_short_range.tflite"
-        self.pose_model = "models/pose_landmarker.task"
+        self.blaze_face_model = ROI_CONFIG['blaze_face_model']
+        self.pose_model = ROI_CONFIG['pose_model']
         
         # Verifikasi file model ada
         if not os.path.exists(self.blaze_face_model):
@@ -27,95 +389,359 @@ class VideoProcessor:
         if not os.path.exists(self.pose_model):
             print(f"Warning: Pose model tidak ditemukan di {self.pose_model}")
         
+        # Import lazy: mediapipe (dan TensorFlow Lite) baru dimuat saat processor
+        # pertama dibuat, bukan saat modul diimpor oleh GUI
+        import mediapipe as mp
+        
         # Inisialisasi MediaPipe solutions
-        mp_face_detection = mp.solutions.face_detection
         mp_pose = mp.solutions.pose
         
         try:
-            # Inisialisasi BlazeFace detector
-            self.face_detector = mp_face_detection.FaceDetection(
-                model_selection=0,  # 0 untuk short-range model
-                min_detection_confidence=0.5
-            )
-            
-            # Inisialisasi Pose detector
-            self.pose_detector = mp_pose.Pose(
-                static_image_mode=False,
-                model_complexity=1,
-                smooth_landmarks=True,
-                enable_segmentation=False,
-                min_detection_confidence=0.5,
-                min_tracking_confidence=0.5
-            )
-            
+            # Pose detector: PoseLandmarker Tasks dari file .task jika tersedia
+            self.pose_detector = None
+            if ROI_CONFIG['pose_backend'] == 'tasks' and os.path.exists(self.pose_model):
+                try:
+                    self.pose_detector = TasksPoseLandmarker(self.pose_model)
+                except Exception as e:
+                    print(f"Warning: PoseLandmarker Tasks gagal dimuat ({e}), "
+                          "menggunakan mp.solutions.pose")
             self.mp_drawing = mp.solutions.drawing_utils
             self.mp_pose = mp_pose
-            self.mp_face_detection = mp_face_detection
+            self.pose_complexity = 1
+            self._pose_complexity_target = self.pose_complexity
+            if self.pose_detector is None:
+                self.pose_detector = self._create_solutions_pose(self.pose_complexity)
             
             print("MediaPipe models berhasil dimuat dari direktori models/")
             
         except Exception as e:
             print(f"Error loading MediaPipe models: {e}")
-            # Fallback ke OpenCV jika MediaPipe gagal
+            # Tanpa pose: ROI dada diestimasi dari posisi wajah
             self.use_opencv_fallback = True
-            self.face_cascade = cv2.CascadeClassifier(
-                cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-            )
-            print("Menggunakan OpenCV Haar Cascade sebagai fallback")
         else:
             self.use_opencv_fallback = False
+        
+        # Backend detektor wajah pada frame yang diperkecil; jika backend pilihan
+        # gagal dimuat, turun ke BlazeFace legacy lalu OpenCV Haar Cascade
+        self.face_detector = None
+        for name in dict.fromkeys((ROI_CONFIG['face_detector'], 'blazeface', 'haar')):
+            options = {}
+            if name == 'blazeface_tasks' and self.tracker is not None:
+                # Template tracker dibangun dari bbox keyframe, jadi bbox harus berasal
+                # dari frame yang sama; hasil live_stream tertinggal satu interval keyframe
+                options['running_mode'] = 'video'
+            try:
+                self.face_detector = create_face_detector(name, metrics=self.metrics, **options)
+                break
+            except Exception as e:
+                print(f"Warning: Detektor wajah '{name}' gagal dimuat: {e}")
+        if self.face_detector is None:
+            raise RuntimeError("Tidak ada backend detektor wajah yang dapat dimuat")
+        print(f"Detektor wajah: {self.face_detector.name} (skala {self.face_detector.scale})")
+        
+        # Worker pose async hanya jika model pose tersedia
+        self.pose_worker = None
+        if async_pose and not self.use_opencv_fallback:
+            self.pose_worker = AsyncPoseWorker(self)
+        
+        # Hasil warm-up terakhir (lihat warmup())
+        self.warmup_stats = None
+    
+    def warmup(self, width=None, height=None, iterations=None):
+        """
+        Jalankan inferensi dummy agar panggilan pertama saat sesi tidak lambat.
+        
+        Panggilan process() pertama MediaPipe mengalokasikan tensor, memilih
+        delegate, dan menyiapkan graph untuk ukuran input tertentu, sehingga
+        jauh lebih lambat dari steady state. Warm-up menjalankan detektor
+        wajah dan pose beberapa kali pada frame sintetis berukuran sama
+        dengan kamera, lalu mereset tracker agar tidak ada state dari frame
+        dummy yang terbawa ke sesi.
+        
+        Parameter
+        ----------
+        width, height : int, opsional
+            Ukuran frame dummy, default dari CAMERA_CONFIG
+        iterations : int, opsional
+            Jumlah inferensi per model, default dari ROI_CONFIG
+        
+        Returns
+        -------
+        dict
+            'total' (detik), serta 'face' dan 'pose' berisi latensi tiap
+            iterasi dalam ms (pertama = cold start, terakhir ~ steady state)
+        """
+        from src.utils.utils import CAMERA_CONFIG, ROI_CONFIG
+        
+        width = width or CAMERA_CONFIG['width']
+        height = height or CAMERA_CONFIG['height']
+        if iterations is None:
+            iterations = ROI_CONFIG['warmup_iterations']
+        
+        # Noise deterministik: memicu jalur inferensi penuh tanpa deteksi palsu yang stabil
+        rng = np.random.default_rng(0)
+        frame = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+        
+        stats = {'face': [], 'pose': []}
+        start = time.perf_counter()
+        for _ in range(max(0, int(iterations))):
+            # Context baru per iterasi agar setiap model benar-benar dijalankan
+            context = FrameContext(frame)
+            mark = time.perf_counter()
+            self._run_face_detector(context)
+            stats['face'].append((time.perf_counter() - mark) * 1000.0)
+            
+            if self.use_opencv_fallback:
+                continue
+            mark = time.perf_counter()
+            self._run_pose_detector(context)
+            stats['pose'].append((time.perf_counter() - mark) * 1000.0)
+        
+        # Thread pose async dimulai sekarang, bukan pada frame pertama sesi
+        if self.pose_worker is not None:
+            self.pose_worker.start()
+        self.reset_tracking()
+        
+        stats['total'] = time.perf_counter() - start
+        self.warmup_stats = stats
+        if stats['face']:
+            parts = [f"{name} {values[0]:.1f} -> {values[-1]:.1f} ms"
+                     for name, values in (('wajah', stats['face']), ('pose', stats['pose'])) if values]
+            print(f"Warm-up model ({width}x{height}) selesai dalam {stats['total']:.2f} detik: "
+                  + ", ".join(parts))
+        return stats
+    
+    def _create_solutions_pose(self, complexity):
+        """Pose detector mp.solutions dengan model_complexity tertentu."""
+        return self.mp_pose.Pose(
+            static_image_mode=False,
+            model_complexity=complexity,
+            smooth_landmarks=True,
+            enable_segmentation=False,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5
+        )
+    
+    def set_pose_complexity(self, complexity):
+        """
+        Ganti model_complexity pose detector mp.solutions (0 = lite, 1 = full, 2 = heavy).
+        
+        Membangun graph pose baru memakan ratusan ms, jadi dikerjakan di
+        thread latar; detector lama tetap dipakai sampai graph baru siap lalu
+        ditukar di bawah lock pose. Panggilan ini tidak blocking sehingga
+        aman dari worker pipeline (QualityGovernor). Jika kompleksitas diganti
+        lagi selama pembangunan, thread yang sama membangun ulang ke nilai
+        terakhir. PoseLandmarker Tasks tidak terpengaruh (kompleksitas
+        ditentukan file model .task).
+        
+        Parameter
+        ----------
+        complexity : int
+            Kompleksitas model pose
+            
+        Returns
+        -------
+        bool
+            True jika pembangunan ulang pose detector dijadwalkan
+        """
+        if self.use_opencv_fallback or isinstance(self.pose_detector, TasksPoseLandmarker):
+            return False
+        
+        with self._pose_rebuild_lock:
+            if complexity == self._pose_complexity_target:
+                return False
+            self._pose_complexity_target = complexity
+            if self._pose_rebuild_thread is None:
+                self._pose_rebuild_thread = threading.Thread(
+                    target=self._rebuild_pose, name="PoseRebuild", daemon=True)
+                self._pose_rebuild_thread.start()
+        return True
+    
+    def _rebuild_pose(self):
+        """Thread latar: bangun pose detector sesuai target lalu tukar di bawah lock pose."""
+        while True:
+            with self._pose_rebuild_lock:
+                target = self._pose_complexity_target
+                if target == self.pose_complexity:
+                    self._pose_rebuild_thread = None
+                    return
+            
+            try:
+                detector = self._create_solutions_pose(target)
+            except Exception as e:
+                print(f"Error membangun ulang pose detector: {e}")
+                with self._pose_rebuild_lock:
+                    self._pose_complexity_target = self.pose_complexity
+                    self._pose_rebuild_thread = None
+                return
+            
+            with self._pose_lock:
+                old, self.pose_detector = self.pose_detector, detector
+                self.pose_complexity = target
+            old.close()
+    
+    def _run_face_detector(self, context):
+        """Jalankan backend detektor wajah sekali per frame, daftar bbox disimpan di context."""
+        if context.face_results is _NOT_RUN:
+            context.face_results = self.face_detector.detect(context.frame, context)
+        return context.face_results
+    
+    def _run_pose_detector(self, context):
+        """Jalankan Pose sekali per frame, hasil disimpan di context."""
+        if context.pose_results is _NOT_RUN:
+            # Lock: pose detector juga dipakai oleh AsyncPoseWorker
+            with self._pose_lock:
+                context.pose_results = self.pose_detector.process(context.rgb)
+        return context.pose_results
     
-    def detect_face(self, frame):
+    def detect_chest_rect(self, frame):
         """
-        Mendeteksi wajah menggunakan BlazeFace atau OpenCV fallback.
+        Jalankan pose detection dan kembalikan koordinat ROI dada saja.
         
         Parameter
         ----------
         frame : numpy.ndarray
-            Frame video input
+            Frame video BGR
             
         Returns
         -------
         tuple atau None
-            (x, y, w, h) koordinat wajah, atau None jika tidak ada wajah terdeteksi
+            (x, y, w, h) ROI dada, atau None jika pose tidak terdeteksi
         """
-        if self.use_opencv_fallback:
-            # Fallback ke OpenCV
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            faces = self.face_cascade.detectMultiScale(gray, 1.1, 4)
-            if len(faces) > 0:
-                return faces[0]  # (x, y, w, h)
+        result = self.get_chest_roi(frame)
+        if result is None:
             return None
+        return result[1]
+    
+    def analyze_frame(self, frame, timestamp=None):
+        """
+        Analisis lengkap satu frame: wajah, ROI dahi, dan ROI dada.
+        
+        Parameter
+        ----------
+        frame : numpy.ndarray
+            Frame video input
+        timestamp : float, opsional
+            Timestamp monotonic frame, dipakai untuk umur hasil pose async
+            
+        Jika tracking aktif, detektor hanya dijalankan pada keyframe (setiap
+        detect_interval frame atau saat tracker kehilangan ROI). Jika pose
+        async aktif, ROI dada diambil dari hasil terbaru AsyncPoseWorker.
         
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        Returns
+        -------
+        FrameContext
+            Konteks frame berisi face_rect, forehead, dan chest (None jika gagal)
+        """
+        context = FrameContext(frame)
         
-        # Process the frame dengan BlazeFace
-        results = self.face_detector.process(rgb_frame)
+        # Pose async: kirim frame terbaru ke worker, tidak menunggu hasil
+        if self.pose_worker is not None:
+            self.pose_worker.submit(frame, timestamp)
         
-        if not results.detections:
-            return None
+        # Di antara keyframe, lacak ROI tanpa menjalankan detektor
+        if self.tracker is not None and not self.tracker.needs_detection():
+            rects = self.tracker.track(context.gray)
+            if rects is not None and 'face' in rects:
+                context.tracked = True
+                context.face_rect = rects['face']
+                context.forehead = self.get_forehead_roi(context.face_rect, frame)
+                if self.pose_worker is not None:
+                    context.chest = self._latest_async_chest(context.face_rect, frame, timestamp)
+                elif 'chest' in rects:
+                    cx, cy, cw, ch = rects['chest']
+                    context.chest = (frame[cy:cy+ch, cx:cx+cw], rects['chest'])
+                else:
+                    context.chest = self.get_chest_roi_fallback(context.face_rect, frame)
+                return context
         
-        # Ambil deteksi wajah pertama
-        detection = results.detections[0]
+        # Keyframe: jalankan detektor
+        context.face_rect = self.detect_face(frame, context)
+        if context.face_rect is not None:
+            context.forehead = self.get_forehead_roi(context.face_rect, frame)
+            if self.pose_worker is not None:
+                context.chest = self._latest_async_chest(context.face_rect, frame, timestamp)
+            else:
+                context.chest = self.find_chest_roi(context.face_rect, frame, context)
+        
+        if self.tracker is not None:
+            if context.face_rect is None:
+                self.tracker.reset()
+            else:
+                # Dada tidak di-track jika sudah disediakan oleh pose async
+                chest_rect = None
+                if context.chest is not None and self.pose_worker is None:
+                    chest_rect = context.chest[1]
+                self.tracker.update(context.gray, {'face': context.face_rect,
+                                                   'chest': chest_rect})
         
-        # Get bounding box
-        bbox = detection.location_data.relative_bounding_box
-        h, w, _ = frame.shape
+        return context
+    
+    def reset_tracking(self):
+        """Reset state tracker ROI dan hasil pose async (mis. saat sesi baru)."""
+        if self.tracker is not None:
+            self.tracker.reset()
+        if self.pose_worker is not None:
+            self.pose_worker.reset()
+    
+    def _latest_async_chest(self, face_rect, frame, timestamp=None):
+        """ROI dada dari hasil pose async terbaru, fallback ke estimasi dari wajah."""
+        rect = self.pose_worker.latest_rect(self.pose_max_age, timestamp)
+        if rect is None:
+            return self.get_chest_roi_fallback(face_rect, frame)
         
-        # Convert relative coordinates to absolute coordinates
-        x = int(bbox.xmin * w)
-        y = int(bbox.ymin * h)
-        width = int(bbox.width * w)
-        height = int(bbox.height * h)
+        cx, cy, cw, ch = rect
+        frame_h, frame_w = frame.shape[:2]
+        cx = max(0, min(cx, frame_w - 1))
+        cy = max(0, min(cy, frame_h - 1))
+        roi = frame[cy:cy+ch, cx:cx+cw]
+        if roi.size == 0:
+            return self.get_chest_roi_fallback(face_rect, frame)
+        return roi, (cx, cy, roi.shape[1], roi.shape[0])
+    
+    def detect_face(self, frame, context=None):
+        """
+        Mendeteksi wajah menggunakan backend detektor yang dipilih (ROI_CONFIG).
         
-        # Ensure coordinates are within frame bounds
-        x = max(0, x)
-        y = max(0, y)
-        width = min(width, w - x)
-        height = min(height, h - y)
+        Parameter
+        ----------
+        frame : numpy.ndarray
+            Frame video input
+        context : FrameContext, opsional
+            Konteks frame untuk berbagi konversi RGB dan hasil deteksi
+            
+        Returns
+        -------
+        tuple atau None
+            (x, y, w, h) koordinat wajah, atau None jika tidak ada wajah terdeteksi
+        """
+        faces = self.detect_faces(frame, context)
+        if not faces:
+            return None
         
-        return (x, y, width, height)
+        # Ambil deteksi wajah pertama
+        return faces[0]
+    
+    @timed('detect_face')
+    def detect_faces(self, frame, context=None):
+        """
+        Mendeteksi semua wajah dalam frame.
+        
+        Parameter
+        ----------
+        frame : numpy.ndarray
+            Frame video input
+        context : FrameContext, opsional
+            Konteks frame untuk berbagi konversi RGB dan hasil deteksi
+            
+        Returns
+        -------
+        list
+            Daftar (x, y, w, h) koordinat wajah, urut sesuai hasil detektor
+        """
+        # Backend memperkecil frame sendiri dan memetakan bbox ke resolusi penuh
+        context = context or FrameContext(frame)
+        return list(self._run_face_detector(context))
     
     def get_forehead_roi(self, face_rect, frame):
         """
@@ -159,7 +785,83 @@ class VideoProcessor:
         
         return roi, roi_coords
     
-    def get_chest_roi(self, frame):
+    def _chest_rect_from_landmarks(self, landmarks, w, h):
+        """
+        Hitung koordinat ROI dada dari pose landmarks.
+        
+        Parameter
+        ----------
+        landmarks : list
+            Pose landmarks MediaPipe (koordinat ternormalisasi)
+        w, h : int
+            Lebar dan tinggi frame
+            
+        Returns
+        -------
+        tuple atau None
+            (x, y, w, h) koordinat ROI dada, atau None jika tidak valid
+        """
+        # Landmark indices untuk area dada dan leher
+        left_shoulder = landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER.value]
+        right_shoulder = landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
+        
+        # Gunakan area leher untuk respirasi yang lebih akurat (area kulit)
+        try:
+            nose = landmarks[self.mp_pose.PoseLandmark.NOSE.value]
+            
+            # Koordinat dalam pixel
+            nose_x = int(nose.x * w)
+            nose_y = int(nose.y * h)
+            left_shoulder_x = int(left_shoulder.x * w)
+            left_shoulder_y = int(left_shoulder.y * h)
+            right_shoulder_x = int(right_shoulder.x * w)
+            right_shoulder_y = int(right_shoulder.y * h)
+            
+            # Area leher/chest atas (area kulit yang lebih responsif)
+            chest_center_x = (left_shoulder_x + right_shoulder_x) // 2
+            chest_center_y = (nose_y + left_shoulder_y + right_shoulder_y) // 3
+            
+            # Ukuran ROI yang lebih kecil tapi fokus pada area kulit
+            chest_width = abs(right_shoulder_x - left_shoulder_x)
+            chest_height = int(chest_width * 0.6)  # Rasio yang proporsional
+            
+            # Posisi ROI
+            chest_x = max(0, chest_center_x - chest_width // 2)
+            chest_y = max(0, chest_center_y - chest_height // 4)
+            
+            # Pastikan tidak keluar batas frame
+            chest_x = min(chest_x, w - chest_width)
+            chest_y = min(chest_y, h - chest_height)
+            
+            return (chest_x, chest_y, chest_width, chest_height)
+            
+        except:
+            # Fallback ke metode shoulder-hip jika nose detection gagal
+            left_shoulder_x = int(left_shoulder.x * w)
+            left_shoulder_y = int(left_shoulder.y * h)
+            right_shoulder_x = int(right_shoulder.x * w)
+            right_shoulder_y = int(right_shoulder.y * h)
+            
+            # Area dada berdasarkan bahu
+            chest_x_min = min(left_shoulder_x, right_shoulder_x)
+            chest_x_max = max(left_shoulder_x, right_shoulder_x)
+            chest_y_min = min(left_shoulder_y, right_shoulder_y)
+            
+            # ROI parameters
+            margin = 20
+            chest_x = max(0, chest_x_min - margin)
+            chest_y = max(0, chest_y_min + margin)
+            chest_width = min(w - chest_x, chest_x_max - chest_x_min + 2*margin)
+            chest_height = min(h - chest_y, int(chest_width * 0.8))
+            
+            # Pastikan ROI valid
+            if chest_width <= 0 or chest_height <= 0:
+                return None
+            
+            return (chest_x, chest_y, chest_width, chest_height)
+    
+    @timed('get_chest_roi')
+    def get_chest_roi(self, frame, context=None):
         """
         Dapatkan area dada untuk sinyal respirasi menggunakan pose detection.
         Prioritaskan area kulit yang terlihat untuk akurasi yang lebih baik.
@@ -168,6 +870,8 @@ class VideoProcessor:
         ----------
         frame : numpy.ndarray
             Frame video input
+        context : FrameContext, opsional
+            Konteks frame untuk berbagi konversi RGB dan hasil deteksi
             
         Returns
         -------
@@ -177,86 +881,24 @@ class VideoProcessor:
         if self.use_opencv_fallback:
             return None  # Tidak bisa deteksi pose dengan OpenCV fallback
         
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        context = context or FrameContext(frame)
         
         try:
-            # Process the frame
-            results = self.pose_detector.process(rgb_frame)
+            # Process the frame (pose dijalankan sekali per frame)
+            results = self._run_pose_detector(context)
             
             if not results.pose_landmarks:
                 return None
             
-            # Get landmarks
-            landmarks = results.pose_landmarks.landmark
+            # Hitung koordinat ROI dari landmarks lalu extract ROI
             h, w, _ = frame.shape
+            roi_coords = self._chest_rect_from_landmarks(results.pose_landmarks.landmark, w, h)
+            if roi_coords is None:
+                return None
             
-            # Landmark indices untuk area dada dan leher
-            left_shoulder = landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-            right_shoulder = landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-            
-            # Gunakan area leher untuk respirasi yang lebih akurat (area kulit)
-            try:
-                nose = landmarks[self.mp_pose.PoseLandmark.NOSE.value]
-                
-                # Koordinat dalam pixel
-                nose_x = int(nose.x * w)
-                nose_y = int(nose.y * h)
-                left_shoulder_x = int(left_shoulder.x * w)
-                left_shoulder_y = int(left_shoulder.y * h)
-                right_shoulder_x = int(right_shoulder.x * w)
-                right_shoulder_y = int(right_shoulder.y * h)
-                
-                # Area leher/chest atas (area kulit yang lebih responsif)
-                chest_center_x = (left_shoulder_x + right_shoulder_x) // 2
-                chest_center_y = (nose_y + left_shoulder_y + right_shoulder_y) // 3
-                
-                # Ukuran ROI yang lebih kecil tapi fokus pada area kulit
-                chest_width = abs(right_shoulder_x - left_shoulder_x)
-                chest_height = int(chest_width * 0.6)  # Rasio yang proporsional
-                
-                # Posisi ROI
-                chest_x = max(0, chest_center_x - chest_width // 2)
-                chest_y = max(0, chest_center_y - chest_height // 4)
-                
-                # Pastikan tidak keluar batas frame
-                chest_x = min(chest_x, w - chest_width)
-                chest_y = min(chest_y, h - chest_height)
-                
-                # Extract ROI
-                roi = frame[chest_y:chest_y+chest_height, chest_x:chest_x+chest_width]
-                roi_coords = (chest_x, chest_y, chest_width, chest_height)
-                
-                return roi, roi_coords
-                
-            except:
-                # Fallback ke metode shoulder-hip jika nose detection gagal
-                left_shoulder_x = int(left_shoulder.x * w)
-                left_shoulder_y = int(left_shoulder.y * h)
-                right_shoulder_x = int(right_shoulder.x * w)
-                right_shoulder_y = int(right_shoulder.y * h)
-                
-                # Area dada berdasarkan bahu
-                chest_x_min = min(left_shoulder_x, right_shoulder_x)
-                chest_x_max = max(left_shoulder_x, right_shoulder_x)
-                chest_y_min = min(left_shoulder_y, right_shoulder_y)
-                
-                # ROI parameters
-                margin = 20
-                chest_x = max(0, chest_x_min - margin)
-                chest_y = max(0, chest_y_min + margin)
-                chest_width = min(w - chest_x, chest_x_max - chest_x_min + 2*margin)
-                chest_height = min(h - chest_y, int(chest_width * 0.8))
-                
-                # Pastikan ROI valid
-                if chest_width <= 0 or chest_height <= 0:
-                    return None
-                
-                # Extract ROI
-                roi = frame[chest_y:chest_y+chest_height, chest_x:chest_x+chest_width]
-                roi_coords = (chest_x, chest_y, chest_width, chest_height)
-                
-                return roi, roi_coords
+            chest_x, chest_y, chest_width, chest_height = roi_coords
+            roi = frame[chest_y:chest_y+chest_height, chest_x:chest_x+chest_width]
+            return roi, roi_coords
             
         except Exception as e:
             print(f"Error dalam pose detection: {e}")
@@ -301,7 +943,34 @@ class VideoProcessor:
         
         return roi, roi_coords
     
-    def draw_landmarks(self, frame, draw_pose=True, draw_face=True):
+    def find_chest_roi(self, face_rect, frame, context=None):
+        """
+        Dapatkan ROI dada dengan pose detection, fallback ke estimasi dari wajah.
+        
+        Parameter
+        ----------
+        face_rect : tuple
+            (x, y, w, h) koordinat wajah
+        frame : numpy.ndarray
+            Frame video input
+        context : FrameContext, opsional
+            Konteks frame untuk berbagi konversi RGB dan hasil deteksi
+            
+        Returns
+        -------
+        tuple
+            (roi, (x, y, w, h)) - Data ROI dan koordinatnya, atau None jika gagal
+        """
+        # Coba gunakan pose detection
+        chest_roi = self.get_chest_roi(frame, context)
+        
+        # Jika gagal, gunakan fallback berdasarkan wajah
+        if chest_roi is None:
+            chest_roi = self.get_chest_roi_fallback(face_rect, frame)
+        
+        return chest_roi
+    
+    def draw_landmarks(self, frame, draw_pose=True, draw_face=True, context=None):
         """
         Menggambar landmarks pada frame untuk visualisasi.
         
@@ -313,6 +982,8 @@ class VideoProcessor:
             Apakah menggambar pose landmarks
         draw_face : bool
             Apakah menggambar face detection
+        context : FrameContext, opsional
+            Konteks frame; hasil deteksi yang sudah ada dipakai ulang
             
         Returns
         -------
@@ -320,16 +991,13 @@ class VideoProcessor:
             Frame dengan landmarks yang digambar
         """
         output_frame = frame.copy()
-        
-        if self.use_opencv_fallback:
-            return output_frame  # Tidak ada landmarks untuk digambar dengan OpenCV
-        
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        context = context or FrameContext(frame)
         
         try:
-            if draw_pose:
+            # Pose tidak tersedia pada fallback OpenCV
+            if draw_pose and not self.use_opencv_fallback:
                 # Draw pose landmarks
-                pose_results = self.pose_detector.process(rgb_frame)
+                pose_results = self._run_pose_detector(context)
                 if pose_results.pose_landmarks:
                     self.mp_drawing.draw_landmarks(
                         output_frame,
@@ -338,11 +1006,9 @@ class VideoProcessor:
                     )
             
             if draw_face:
-                # Draw face detection
-                face_results = self.face_detector.process(rgb_frame)
-                if face_results.detections:
-                    for detection in face_results.detections:
-                        self.mp_drawing.draw_detection(output_frame, detection)
+                # Draw bbox wajah (format sama untuk semua backend)
+                for x, y, w, h in self._run_face_detector(context):
+                    cv2.rectangle(output_frame, (x, y), (x + w, y + h), ROI_COLORS['face'], 2)
         except Exception as e:
             print(f"Error menggambar landmarks: {e}")
         
@@ -351,7 +1017,9 @@ class VideoProcessor:
     def __del__(self):
         """Cleanup resources."""
         try:
-            if hasattr(self, 'face_detector') and not self.use_opencv_fallback:
+            if getattr(self, 'pose_worker', None) is not None:
+                self.pose_worker.stop()
+            if hasattr(self, 'face_detector'):
                 self.face_detector.close()
             if hasattr(self, 'pose_detector') and not self.use_opencv_fallback:
                 self.pose_detector.close()
@@ -382,16 +1050,7 @@ def get_chest_roi(face_rect, frame):
     Wrapper function untuk mendapatkan ROI dada.
     Mencoba pose detection dulu, fallback ke face-based jika gagal.
     """
-    processor = get_processor()
-    
-    # Coba gunakan pose detection
-    chest_roi = processor.get_chest_roi(frame)
-    
-    # Jika gagal, gunakan fallback berdasarkan wajah
-    if chest_roi is None:
-        chest_roi = processor.get_chest_roi_fallback(face_rect, frame)
-    
-    return chest_roi
+    return get_processor().find_chest_roi(face_rect, frame)
 
 def draw_face_landmarks(frame):
     """Wrapper function untuk menggambar landmarks."""
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modul statistik ROI berbasis integral image.
+Satu integral image per frame menjawab query jumlah, rata-rata, dan variansi
+per kanal untuk persegi panjang mana pun (dahi, dada, patch) dalam O(1).
+"""
+
+import cv2
+import numpy as np
+
+
+def union_rect(rects):
+    """
+    Bounding box gabungan dari beberapa persegi panjang.
+    
+    Parameter
+    ----------
+    rects : list of tuple
+        Daftar (x, y, w, h)
+    
+    Returns
+    -------
+    tuple atau None
+        (x, y, w, h) gabungan, atau None jika daftar kosong
+    """
+    rects = [r for r in rects if r is not None]
+    if not rects:
+        return None
+    x0 = min(r[0] for r in rects)
+    y0 = min(r[1] for r in rects)
+    x1 = max(r[0] + r[2] for r in rects)
+    y1 = max(r[1] + r[3] for r in rects)
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+class ROIStatistics:
+    """
+    Statistik per kanal untuk persegi panjang pada satu frame.
+    
+    Integral image (jumlah) dihitung sekali dengan cv2.integral untuk region
+    yang mencakup semua ROI; integral kuadrat untuk variansi baru dihitung
+    saat pertama kali dibutuhkan. Urutan kanal mengikuti frame (BGR).
+    """
+    
+    def __init__(self, frame, region=None):
+        """
+        Parameter
+        ----------
+        frame : numpy.ndarray
+            Frame video BGR (h, w, 3)
+        region : tuple, opsional
+            (x, y, w, h) area yang dicakup integral image, default seluruh frame
+        """
+        h, w = frame.shape[:2]
+        if region is None:
+            x0, y0, x1, y1 = 0, 0, w, h
+        else:
+            x, y, rw, rh = region
+            x0, y0 = max(0, int(x)), max(0, int(y))
+            x1, y1 = min(w, int(x + rw)), min(h, int(y + rh))
+        x1, y1 = max(x0, x1), max(y0, y1)
+        
+        self.origin = (x0, y0)
+        self.size = (x1 - x0, y1 - y0)
+        self._region = frame[y0:y1, x0:x1]
+        # Integer 32-bit cukup untuk jumlah 8-bit hingga ~8 juta piksel
+        self._sum = cv2.integral(self._region, sdepth=cv2.CV_32S)
+        self._sqsum = None
+    
+    def _clip(self, rect):
+        """Koordinat (x0, y0, x1, y1) rect relatif terhadap region, dipotong ke batasnya."""
+        x, y, w, h = rect
+        ox, oy = self.origin
+        rw, rh = self.size
+        x0 = min(max(int(x) - ox, 0), rw)
+        y0 = min(max(int(y) - oy, 0), rh)
+        x1 = min(max(int(x + w) - ox, x0), rw)
+        y1 = min(max(int(y + h) - oy, y0), rh)
+        return x0, y0, x1, y1
+    
+    @staticmethod
+    def _box(table, x0, y0, x1, y1):
+        """Jumlah box dari tabel integral (dapat berupa array indeks)."""
+        return (table[y1, x1].astype(np.float64) - table[y0, x1]
+                - table[y1, x0] + table[y0, x0])
+    
+    def area(self, rect):
+        """Jumlah piksel rect setelah dipotong ke region."""
+        x0, y0, x1, y1 = self._clip(rect)
+        return (x1 - x0) * (y1 - y0)
+    
+    def sum(self, rect):
+        """
+        Jumlah nilai piksel per kanal di dalam rect.
+        
+        Parameter
+        ----------
+        rect : tuple
+            (x, y, w, h) dalam koordinat frame
+        
+        Returns
+        -------
+        numpy.ndarray
+            Array (3,) jumlah per kanal
+        """
+        x0, y0, x1, y1 = self._clip(rect)
+        return self._box(self._sum, x0, y0, x1, y1)
+    
+    def mean(self, rect):
+        """
+        Rata-rata per kanal di dalam rect.
+        
+        Returns
+        -------
+        numpy.ndarray atau None
+            Array (3,) rata-rata per kanal, atau None jika rect kosong
+        """
+        x0, y0, x1, y1 = self._clip(rect)
+        n = (x1 - x0) * (y1 - y0)
+        if n == 0:
+            return None
+        return self._box(self._sum, x0, y0, x1, y1) / n
+    
+    def variance(self, rect):
+        """
+        Variansi per kanal di dalam rect.
+        
+        Returns
+        -------
+        numpy.ndarray atau None
+            Array (3,) variansi per kanal, atau None jika rect kosong
+        """
+        x0, y0, x1, y1 = self._clip(rect)
+        n = (x1 - x0) * (y1 - y0)
+        if n == 0:
+            return None
+        if self._sqsum is None:
+            _, self._sqsum = cv2.integral2(self._region, sdepth=cv2.CV_32S,
+                                           sqdepth=cv2.CV_64F)
+        mean = self._box(self._sum, x0, y0, x1, y1) / n
+        mean_sq = self._box(self._sqsum, x0, y0, x1, y1) / n
+        return np.maximum(mean_sq - mean * mean, 0.0)
+    
+    def grid_means(self, rect, rows, cols):
+        """
+        Rata-rata per kanal untuk setiap sel grid di dalam rect, sekaligus.
+        
+        Parameter
+        ----------
+        rect : tuple
+            (x, y, w, h) dalam koordinat frame
+        rows, cols : int
+            Jumlah baris dan kolom grid
+        
+        Returns
+        -------
+        numpy.ndarray atau None
+            Array (rows * cols, 3) urut baris, atau None jika rect lebih
+            kecil dari grid
+        """
+        x0, y0, x1, y1 = self._clip(rect)
+        if x1 - x0 < cols or y1 - y0 < rows:
+            return None
+        
+        xs = x0 + (np.arange(cols + 1) * (x1 - x0)) // cols
+        ys = y0 + (np.arange(rows + 1) * (y1 - y0)) // rows
+        corners = self._sum[np.ix_(ys, xs)].astype(np.float64)
+        sums = corners[1:, 1:] - corners[:-1, 1:] - corners[1:, :-1] + corners[:-1, :-1]
+        areas = np.diff(ys)[:, None] * np.diff(xs)[None, :]
+        return (sums / areas[:, :, None]).reshape(-1, 3)
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modul manajer sesi untuk monitoring banyak kamera atau banyak subjek.
+Setiap sesi memiliki pipeline dan pasangan processor sinyal sendiri, dan
+semua sesi dijadwalkan pada satu worker pool dengan pencatatan FPS per sesi.
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import cv2
+
+from src.video.camera import ThreadedCamera
+from src.video.pipeline import FramePipeline
+from src.video.processor import VideoProcessor, FrameContext
+from src.utils.metrics import MetricsRegistry, get_metrics
+from src.utils.utils import ROI_COLORS
+
+
+class MultiFacePipeline:
+    """
+    Pipeline untuk banyak wajah dalam satu frame.
+    
+    Deteksi wajah dijalankan sekali per frame, lalu setiap wajah dipasangkan
+    ke subjek yang sudah ada berdasarkan jarak pusat bbox. Setiap subjek
+    memiliki FramePipeline (pasangan processor rPPG dan respirasi) sendiri.
+    ROI dada diestimasi dari wajah karena model pose hanya mendukung satu orang.
+    """
+    
+    def __init__(self, video_processor=None, max_subjects=4, match_distance=0.5, max_missed=15,
+                 metrics=None):
+        """
+        Parameter
+        ----------
+        video_processor : VideoProcessor, opsional
+            Detektor wajah, dibuat baru (dengan registry metrics) jika None
+        max_subjects : int, opsional
+            Jumlah subjek maksimum yang dilacak, default 4
+        match_distance : float, opsional
+            Jarak pusat maksimum (relatif lebar wajah) untuk subjek yang sama
+        max_missed : int, opsional
+            Jumlah frame tanpa deteksi sebelum subjek dihapus
+        metrics : MetricsRegistry, opsional
+            Registry timer deteksi wajah bersama, default registry global;
+            setiap subjek memiliki registry pipeline sendiri
+        """
+        self.metrics = metrics or get_metrics()
+        self.video_processor = video_processor or VideoProcessor(tracking=False, async_pose=False,
+                                                                 metrics=self.metrics)
+        self.max_subjects = max_subjects
+        self.match_distance = match_distance
+        self.max_missed = max_missed
+        self.subjects = {}
+        self._next_subject_id = 0
+        self.start_time = None
+    
+    def reset(self):
+        """Hapus semua subjek."""
+        self.subjects = {}
+        self._next_subject_id = 0
+        self.start_time = None
+    
+    def _match_subjects(self, faces):
+        """Pasangkan wajah terdeteksi ke subjek (greedy berdasarkan jarak terdekat)."""
+        pairs = []
+        for subject_id, subject in self.subjects.items():
+            sx, sy, sw, sh = subject['rect']
+            for face_idx, (x, y, w, h) in enumerate(faces):
+                dist = ((sx + sw / 2) - (x + w / 2)) ** 2 + ((sy + sh / 2) - (y + h / 2)) ** 2
+                if dist ** 0.5 <= self.match_distance * max(sw, w):
+                    pairs.append((dist, subject_id, face_idx))
+        pairs.sort()
+        
+        matches = {}
+        used_faces = set()
+        for _, subject_id, face_idx in pairs:
+            if subject_id in matches or face_idx in used_faces:
+                continue
+            matches[subject_id] = face_idx
+            used_faces.add(face_idx)
+        
+        # Wajah tanpa pasangan menjadi subjek baru jika masih ada slot
+        for face_idx in range(len(faces)):
+            if face_idx in used_faces or len(self.subjects) >= self.max_subjects:
+                continue
+            subject_id = self._next_subject_id
+            self._next_subject_id += 1
+            self.subjects[subject_id] = {
+                'rect': faces[face_idx],
+                'pipeline': FramePipeline(video_processor=self.video_processor,
+                                          metrics=MetricsRegistry()),
+                'missed': 0,
+            }
+            matches[subject_id] = face_idx
+        
+        return matches
+    
+    def process_frame(self, frame, timestamp, draw_overlay=True):
+        """
+        Proses satu frame untuk semua subjek.
+        
+        Parameter
+        ----------
+        frame : numpy.ndarray
+            Frame video BGR
+        timestamp : float
+            Timestamp monotonic saat frame diambil (detik)
+        draw_overlay : bool, opsional
+            Apakah menggambar kotak ROI pada salinan frame, default True
+        
+        Returns
+        -------
+        dict
+            {'timestamp', 'frame', 'subjects': {subject_id: hasil FramePipeline}}
+        """
+        if self.start_time is None:
+            self.start_time = timestamp
+        
+        shared = FrameContext(frame)
+        faces = self.video_processor.detect_faces(frame, shared)
+        matches = self._match_subjects(faces)
+        
+        display_frame = frame.copy() if draw_overlay else None
+        subject_results = {}
+        
+        for subject_id in list(self.subjects):
+            subject = self.subjects[subject_id]
+            if subject_id not in matches:
+                subject['missed'] += 1
+                if subject['missed'] > self.max_missed:
+                    del self.subjects[subject_id]
+                continue
+            
+            face_rect = faces[matches[subject_id]]
+            subject['rect'] = face_rect
+            subject['missed'] = 0
+            
+            # Konteks per subjek dari hasil deteksi bersama
+            context = FrameContext(frame)
+            context.face_rect = face_rect
+            context.forehead = self.video_processor.get_forehead_roi(face_rect, frame)
+            context.chest = self.video_processor.get_chest_roi_fallback(face_rect, frame)
+            
+            result = subject['pipeline'].process_frame(frame, timestamp,
+                                                       draw_overlay=False, context=context)
+            subject_results[subject_id] = result
+            
+            if draw_overlay:
+                for key, color in (('face_rect', 'face'), ('forehead_rect', 'forehead'),
+                                   ('chest_rect', 'chest')):
+                    if result[key] is not None:
+                        x, y, w, h = result[key]
+                        cv2.rectangle(display_frame, (x, y), (x+w, y+h), ROI_COLORS[color], 2)
+                x, y = face_rect[:2]
+                cv2.putText(display_frame, f"#{subject_id}", (x, max(0, y - 5)),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, ROI_COLORS['face'], 2)
+        
+        return {
+            'timestamp': timestamp - self.start_time,
+            'frame': display_frame,
+            'subjects': subject_results,
+        }
+
+
+class Session:
+    """Satu sesi monitoring: sumber kamera, pipeline, dan statistik FPS."""
+    
+    def __init__(self, session_id, camera, pipeline):
+        """
+        Parameter
+        ----------
+        session_id : int
+            ID sesi
+        camera : ThreadedCamera
+            Sumber frame sesi
+        pipeline : FramePipeline atau MultiFacePipeline
+            Pipeline pemrosesan frame sesi
+        """
+        self.session_id = session_id
+        self.camera = camera
+        self.pipeline = pipeline
+        
+        # Lock agar satu sesi hanya diproses oleh satu worker pada satu waktu
+        self.lock = threading.Lock()
+        self.scheduled = False
+        
+        self._result_lock = threading.Lock()
+        self._latest_result = None
+        
+        # Statistik FPS per sesi
+        self.processed_count = 0
+        self.error_count = 0
+        self.processing_time = 0.0
+        self._fps_window = deque(maxlen=60)
+    
+    def process_pending(self, max_frames=8):
+        """
+        Proses frame yang menunggu di antrean kamera.
+        
+        Parameter
+        ----------
+        max_frames : int, opsional
+            Jumlah frame maksimum per giliran agar sesi lain tetap kebagian
+        
+        Returns
+        -------
+        int
+            Jumlah frame yang diproses
+        """
+        processed = 0
+        with self.lock:
+            while processed < max_frames:
+                item = self.camera.get_frame(timeout=0)
+                if item is None:
+                    break
+                
+                frame, timestamp = item
+                start = time.perf_counter()
+                try:
+                    result = self.pipeline.process_frame(frame, timestamp)
+                except Exception as e:
+                    print(f"Warning: Error dalam sesi {self.session_id}: {e}")
+                    self.error_count += 1
+                    continue
+                self.processing_time += time.perf_counter() - start
+                
+                with self._result_lock:
+                    self._latest_result = result
+                    self.processed_count += 1
+                    self._fps_window.append(time.monotonic())
+                processed += 1
+        return processed
+    
+    def get_latest_result(self):
+        """Hasil pemrosesan terbaru sesi, atau None."""
+        with self._result_lock:
+            return self._latest_result
+    
+    @property
+    def processing_fps(self):
+        """FPS pemrosesan aktual sesi berdasarkan frame terakhir."""
+        with self._result_lock:
+            if len(self._fps_window) < 2:
+                return 0.0
+            span = self._fps_window[-1] - self._fps_window[0]
+            if span <= 0:
+                return 0.0
+            return (len(self._fps_window) - 1) / span
+    
+    @property
+    def finished(self):
+        """True jika sumber sudah habis/terputus dan semua frame sudah diproses."""
+        return (not self.camera.is_running and self.camera.pending_count == 0
+                and not self.scheduled)
+    
+    def stats(self):
+        """
+        Statistik sesi.
+        
+        Returns
+        -------
+        dict
+            FPS capture dan pemrosesan, jumlah frame diproses/dibuang, rata-rata
+            latensi, dan status selesai
+        """
+        processed = self.processed_count
+        return {
+            'session_id': self.session_id,
+            'source': self.camera.camera_id,
+            'capture_fps': self.camera.measured_fps,
+            'processing_fps': self.processing_fps,
+            'processed': processed,
+            'dropped': self.camera.dropped_count,
+            'errors': self.error_count,
+            'finished': self.finished,
+            'mean_latency_ms': (self.processing_time / processed * 1000) if processed else 0.0,
+        }
+
+
+class SessionManager:
+    """
+    Manajer banyak sesi monitoring yang berbagi satu worker pool.
+    
+    Thread capture setiap kamera menandai sesinya siap diproses; worker pool
+    mengambil sesi yang siap dari antrean dan memproses frame-nya. Satu sesi
+    tidak pernah diproses dua worker sekaligus, sehingga urutan sampel tetap
+    terjaga, sementara sesi berbeda berjalan paralel di beberapa core
+    (OpenCV dan MediaPipe melepas GIL selama inferensi).
+    """
+    
+    def __init__(self, workers=None):
+        """
+        Parameter
+        ----------
+        workers : int, opsional
+            Jumlah worker thread, default jumlah CPU
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.sessions = {}
+        self._next_session_id = 0
+        self._ready = queue.Queue()
+        self._schedule_lock = threading.Lock()
+        self._threads = []
+        self._running = False
+    
+    def _add_session(self, source, pipeline, camera_kwargs):
+        """Buat sesi baru dengan kamera ber-thread yang memicu penjadwalan."""
+        session_id = self._next_session_id
+        self._next_session_id += 1
+        
+        camera = ThreadedCamera(source, **camera_kwargs)
+        session = Session(session_id, camera, pipeline)
+        camera.frame_callback = lambda: self._schedule(session)
+        self.sessions[session_id] = session
+        
+        if self._running:
+            camera.start()
+        return session
+    
+    def add_camera(self, source, **camera_kwargs):
+        """
+        Tambahkan sesi satu subjek untuk sebuah sumber kamera.
+        
+        Parameter
+        ----------
+        source : int atau str
+            ID kamera atau path/URL video. File video dibaca tanpa membuang
+            frame dengan timestamp waktu media (lihat ThreadedCamera)
+        **camera_kwargs
+            Argumen tambahan untuk ThreadedCamera (width, height, fps, queue_size)
+        
+        Returns
+        -------
+        Session
+            Sesi yang dibuat
+        """
+        # Setiap sesi memiliki detektor sendiri agar state tracking terpisah,
+        # dan registry metrik sendiri (dipakai pipeline, processor, dan detektor) agar
+        # interval frame dan latensi deteksi antar kamera tidak tercampur
+        metrics = MetricsRegistry()
+        pipeline = FramePipeline(video_processor=VideoProcessor(metrics=metrics), metrics=metrics)
+        return self._add_session(source, pipeline, camera_kwargs)
+    
+    def add_multi_face_camera(self, source, max_subjects=4, **camera_kwargs):
+        """
+        Tambahkan sesi banyak subjek (banyak wajah dalam satu kamera).
+        
+        Parameter
+        ----------
+        source : int atau str
+            ID kamera atau path/URL video. File video dibaca tanpa membuang
+            frame dengan timestamp waktu media (lihat ThreadedCamera)
+        max_subjects : int, opsional
+            Jumlah subjek maksimum, default 4
+        **camera_kwargs
+            Argumen tambahan untuk ThreadedCamera
+        
+        Returns
+        -------
+        Session
+            Sesi yang dibuat
+        """
+        pipeline = MultiFacePipeline(max_subjects=max_subjects, metrics=MetricsRegistry())
+        return self._add_session(source, pipeline, camera_kwargs)
+    
+    def _schedule(self, session):
+        """Masukkan sesi ke antrean siap jika belum terjadwal."""
+        with self._schedule_lock:
+            if session.scheduled:
+                return
+            session.scheduled = True
+        self._ready.put(session)
+    
+    def _worker_loop(self):
+        """Loop worker: ambil sesi siap dan proses frame-nya."""
+        while self._running:
+            try:
+                session = self._ready.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            
+            session.process_pending()
+            
+            with self._schedule_lock:
+                session.scheduled = False
+            
+            # Frame yang masuk selama pemrosesan: jadwalkan ulang
+            if session.camera.pending_count > 0:
+                self._schedule(session)
+    
+    def start(self):
+        """Mulai semua kamera dan worker pool."""
+        if self._running:
+            return
+        self._running = True
+        
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop,
+                                      name=f"SessionWorker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        
+        for session in self.sessions.values():
+            session.camera.start()
+    
+    def stop(self):
+        """Hentikan semua kamera dan worker pool."""
+        for session in self.sessions.values():
+            session.camera.stop()
+        
+        self._running = False
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+        
+        # Kosongkan antrean siap
+        while not self._ready.empty():
+            session = self._ready.get_nowait()
+            session.scheduled = False
+    
+    def get_latest_results(self):
+        """
+        Hasil terbaru setiap sesi.
+        
+        Returns
+        -------
+        dict
+            session_id -> hasil terbaru (atau None)
+        """
+        return {sid: session.get_latest_result() for sid, session in self.sessions.items()}
+    
+    def stats(self):
+        """
+        Statistik semua sesi dan total throughput.
+        
+        Returns
+        -------
+        dict
+            {'sessions': [stats per sesi], 'total_processing_fps': float}
+        """
+        session_stats = [session.stats() for session in self.sessions.values()]
+        return {
+            'sessions': session_stats,
+            'total_processing_fps': sum(s['processing_fps'] for s in session_stats),
+            'workers': self.workers,
+        }
@@ -0,0 +1,23 @@
+"""Tes penamaan file output analisis batch."""
+
+import os
+
+import pytest
+
+pytest.importorskip('cv2')
+
+from src.video.batch import output_names
+
+
+def test_unique_basenames_are_kept():
+    assert output_names(['rekaman/sesi1.mp4', 'lain/sesi2.avi']) == ['sesi1', 'sesi2']
+
+
+def test_same_basename_in_different_directories_gets_path_prefix():
+    paths = [os.path.join('data', 'cam1', 'sesi1.mp4'), os.path.join('data', 'cam2', 'sesi1.mp4'),
+             os.path.join('data', 'sesi2.mp4')]
+    assert output_names(paths) == ['cam1_sesi1', 'cam2_sesi1', 'sesi2']
+
+
+def test_repeated_path_gets_numbered_suffix():
+    assert output_names(['a/x.mp4', 'a/x.mp4', 'a/x.mp4']) == ['x', 'x_2', 'x_3']
@@ -0,0 +1,111 @@
+"""Tes ThreadedCamera: akhir sumber dan penghentian thread capture."""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip('cv2')
+
+from src.video import camera as camera_module
+from src.video.camera import ThreadedCamera
+
+
+def _write_video(path, n_frames=30, fps=30.0, size=(64, 48)):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), fps, size)
+    if not writer.isOpened():
+        pytest.skip("VideoWriter MJPG tidak tersedia")
+    for i in range(n_frames):
+        writer.write(np.full((size[1], size[0], 3), i * 8 % 256, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+class _BlockingCapture:
+    """VideoCapture palsu yang grab()-nya tertahan sampai dilepas tes."""
+    
+    def __init__(self, *args):
+        self.entered = threading.Event()
+        self.unblock = threading.Event()
+        self.released = threading.Event()
+        _BlockingCapture.instance = self
+    
+    def set(self, *args):
+        return True
+    
+    def isOpened(self):
+        return True
+    
+    def grab(self):
+        self.entered.set()
+        self.unblock.wait(5.0)
+        return False
+    
+    def retrieve(self):
+        return False, None
+    
+    def release(self):
+        self.released.set()
+
+
+def test_end_of_file_stops_capture_and_wakes_consumer(tmp_path):
+    path = _write_video(tmp_path / 'clip.avi')
+    camera = ThreadedCamera(path, max_grab_failures=3)
+    camera.start()
+    thread = camera._thread
+    
+    # get_frame() harus kembali None (bukan menunggu selamanya) setelah file habis
+    frames = 0
+    while camera.get_frame(timeout=2.0) is not None:
+        frames += 1
+    
+    thread.join(timeout=2.0)
+    assert not thread.is_alive()
+    assert not camera.is_running
+    assert frames == camera.frame_count == 30
+    camera.stop()
+
+
+def test_file_source_uses_backpressure_and_media_timestamps(tmp_path):
+    path = _write_video(tmp_path / 'clip.avi', n_frames=30, fps=25.0)
+    camera = ThreadedCamera(path, queue_size=2)
+    assert not camera.realtime
+    camera.start()
+    
+    # Konsumen lambat: sumber file tidak boleh membuang frame
+    timestamps = []
+    while True:
+        item = camera.get_frame(timeout=2.0)
+        if item is None:
+            break
+        timestamps.append(item[1])
+        time.sleep(0.002)
+    camera.stop()
+    
+    assert camera.dropped_count == 0
+    np.testing.assert_allclose(timestamps, np.arange(30) / 25.0, atol=1e-6)
+
+
+def test_camera_index_is_realtime():
+    assert ThreadedCamera(0).realtime
+    assert ThreadedCamera('rtsp://host/stream').realtime
+
+
+def test_stop_leaves_release_to_thread_blocked_in_grab(monkeypatch):
+    monkeypatch.setattr(camera_module.cv2, 'VideoCapture', _BlockingCapture)
+    camera = ThreadedCamera(0)
+    camera.start()
+    capture = _BlockingCapture.instance
+    assert capture.entered.wait(2.0)
+    thread = camera._thread
+    
+    camera.stop()
+    assert thread.is_alive()
+    assert not capture.released.is_set()
+    assert camera.cap is None
+    
+    capture.unblock.set()
+    thread.join(timeout=2.0)
+    assert not thread.is_alive()
+    assert capture.released.is_set()
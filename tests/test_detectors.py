@@ -0,0 +1,119 @@
+"""Tes jalur LIVE_STREAM BlazeFaceTasksDetector dengan MediaPipe Tasks tiruan."""
+
+import sys
+import types
+
+import numpy as np
+import pytest
+
+pytest.importorskip('cv2')
+
+from src.utils.metrics import MetricsRegistry
+from src.video.detectors import BlazeFaceTasksDetector
+
+
+class _FakeFaceDetector:
+    """FaceDetector Tasks palsu: mencatat kiriman detect_async tanpa inferensi."""
+    
+    def __init__(self, options):
+        self.options = options
+        self.submitted = []
+        self.fail = False
+    
+    def detect_async(self, image, timestamp_ms):
+        if self.fail:
+            raise RuntimeError("graph error")
+        self.submitted.append((image, timestamp_ms))
+    
+    def respond(self, boxes, timestamp_ms=None):
+        """Panggil callback hasil seperti thread MediaPipe."""
+        if timestamp_ms is None:
+            timestamp_ms = self.submitted[-1][1]
+        detections = [types.SimpleNamespace(bounding_box=types.SimpleNamespace(
+            origin_x=x, origin_y=y, width=w, height=h)) for x, y, w, h in boxes]
+        self.options.result_callback(types.SimpleNamespace(detections=detections),
+                                     None, timestamp_ms)
+    
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_mediapipe(monkeypatch):
+    namespace = types.SimpleNamespace
+    base_options = lambda **kwargs: namespace(**kwargs)
+    base_options.Delegate = namespace(CPU='cpu', GPU='gpu')
+    vision = namespace(
+        FaceDetectorOptions=lambda **kwargs: namespace(**kwargs),
+        RunningMode=namespace(VIDEO='video', LIVE_STREAM='live_stream'),
+        FaceDetector=namespace(create_from_options=_FakeFaceDetector),
+    )
+    mp = types.ModuleType('mediapipe')
+    mp.tasks = namespace(BaseOptions=base_options, vision=vision)
+    mp.Image = lambda image_format, data: data
+    mp.ImageFormat = namespace(SRGB='srgb')
+    monkeypatch.setitem(sys.modules, 'mediapipe', mp)
+    return mp
+
+
+@pytest.fixture
+def detector(fake_mediapipe, tmp_path):
+    model = tmp_path / 'blaze_face_short_range.tflite'
+    model.write_bytes(b'')
+    return BlazeFaceTasksDetector(scale=0.5, running_mode='live_stream', model_path=str(model),
+                                  metrics=MetricsRegistry(enabled=True))
+
+
+FRAME = np.zeros((240, 320, 3), dtype=np.uint8)
+
+
+def test_live_stream_registers_callback(detector):
+    options = detector.detector.options
+    assert options.running_mode == 'live_stream'
+    assert options.result_callback == detector._on_result
+
+
+def test_no_new_submission_while_inference_is_in_flight(detector):
+    assert detector.detect(FRAME) == []
+    assert detector.detect(FRAME) == []
+    assert len(detector.detector.submitted) == 1
+    assert detector.result_lag is None
+    
+    # Frame dikirim pada skala deteksi
+    assert detector.detector.submitted[0][0].shape == (120, 160, 3)
+
+
+def test_result_uses_submit_scale_and_reports_lag(detector):
+    fake = detector.detector
+    detector.detect(FRAME)            # frame 1 dikirim pada skala 0.5
+    detector.detect(FRAME)            # frame 2: masih in flight
+    fake.respond([(10, 20, 30, 40)])
+    
+    # QualityGovernor mengganti skala sebelum hasil dipakai
+    detector.set_scale(1.0)
+    faces = detector.detect(FRAME)    # frame 3: hasil frame 1, kirim frame baru
+    assert faces == [(20, 40, 60, 80)]
+    assert detector.result_lag == 2
+    assert len(fake.submitted) == 2
+    assert detector.metrics.summary('detect_face.blazeface_tasks.async')['count'] == 1
+
+
+def test_stale_callback_is_ignored(detector):
+    fake = detector.detector
+    detector.detect(FRAME)
+    fake.respond([(10, 20, 30, 40)], timestamp_ms=fake.submitted[-1][1] - 1)
+    
+    assert detector.detect(FRAME) == []
+    assert len(fake.submitted) == 1
+    assert detector.metrics.summary('detect_face.blazeface_tasks.async') is None
+
+
+def test_failed_submission_clears_in_flight(detector):
+    fake = detector.detector
+    fake.fail = True
+    with pytest.raises(RuntimeError):
+        detector.detect(FRAME)
+    
+    fake.fail = False
+    detector.detect(FRAME)
+    assert len(fake.submitted) == 1
@@ -0,0 +1,44 @@
+"""Tes cache LRU desain filter Butterworth."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('scipy')
+from scipy import signal
+
+from src.signal.filters import FilterDesignCache
+
+
+def test_filter_design_cache_hits_misses_and_lru_eviction():
+    cache = FilterDesignCache(maxsize=2)
+    a = cache.get_bandpass_sos(0.8, 3.0, 30.0)
+    assert cache.get_bandpass_sos(0.8, 3.0, 30.0) is a
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 2}
+    
+    cache.get_bandpass_sos(0.8, 3.0, 25.0)
+    cache.get_bandpass_sos(0.8, 3.0, 30.0)   # a menjadi paling baru dipakai
+    cache.get_bandpass_sos(0.8, 3.0, 20.0)   # mengeluarkan desain 25 Hz
+    assert cache.stats()['size'] == 2
+    assert cache.get_bandpass_sos(0.8, 3.0, 30.0) is a
+    
+    misses = cache.stats()['misses']
+    cache.get_bandpass_sos(0.8, 3.0, 25.0)
+    assert cache.stats()['misses'] == misses + 1
+
+
+def test_cached_design_matches_butter_and_is_keyed_by_normalized_band():
+    cache = FilterDesignCache()
+    sos = cache.get_bandpass_sos(0.8, 3.0, 30.0, order=4)
+    np.testing.assert_allclose(sos, signal.butter(4, [0.8 / 15.0, 3.0 / 15.0], btype='band',
+                                                  output='sos'))
+    
+    # Pita ternormalisasi yang sama pada sampling rate berbeda memakai desain yang sama
+    assert cache.get_bandpass_sos(1.6, 6.0, 60.0, order=4) is sos
+    assert cache.get_bandpass_sos(0.8, 3.0, 30.0, order=2) is not sos
+    assert cache.stats()['hits'] == 1
+
+
+def test_filter_design_cache_rejects_invalid_band():
+    cache = FilterDesignCache()
+    assert cache.get_bandpass_sos(0.8, 3.0, 0.0) is None
+    assert cache.stats()['size'] == 0
@@ -0,0 +1,128 @@
+"""Tes QualityGovernor: urutan level dari latensi sintetis dan pengaturan yang diterapkan."""
+
+import types
+
+import pytest
+
+from src.utils.metrics import MetricsRegistry
+from src.utils.utils import QUALITY_CONFIG
+from src.video.governor import QualityGovernor
+
+BUDGET = 33.0
+WINDOW = QUALITY_CONFIG['window_frames']
+SLOW = QUALITY_CONFIG['degrade_ratio'] * BUDGET + 5.0
+FAST = QUALITY_CONFIG['restore_ratio'] * BUDGET - 5.0
+OK = 0.5 * (QUALITY_CONFIG['degrade_ratio'] + QUALITY_CONFIG['restore_ratio']) * BUDGET
+
+
+class _StubDetector:
+    def __init__(self):
+        self.scale = None
+    
+    def set_scale(self, scale):
+        self.scale = scale
+
+
+class _StubProcessor:
+    """VideoProcessor tiruan yang mencatat pengaturan dari governor."""
+    
+    def __init__(self, async_pose=False):
+        self.pose_worker = object() if async_pose else None
+        self.tracker = types.SimpleNamespace(detect_interval=None)
+        self.face_detector = _StubDetector()
+        self.pose_complexity_calls = []
+    
+    def set_pose_complexity(self, complexity):
+        self.pose_complexity_calls.append(complexity)
+
+
+def _governor(async_pose=False):
+    processor = _StubProcessor(async_pose)
+    pipeline = types.SimpleNamespace(estimate_interval=None)
+    governor = QualityGovernor(processor, pipeline, budget_ms=BUDGET, metrics=MetricsRegistry())
+    return governor, processor, pipeline
+
+
+def _feed(governor, frame_ms, windows=1):
+    levels = []
+    for _ in range(windows):
+        for _ in range(WINDOW):
+            governor.record(frame_ms)
+        levels.append(governor.level)
+    return levels
+
+
+def test_degrades_after_one_window_and_restores_after_three():
+    governor, _, _ = _governor()
+    
+    assert _feed(governor, SLOW, 2) == [1, 2]
+    assert _feed(governor, OK, 3) == [2, 2, 2]
+    assert _feed(governor, FAST, 6) == [2, 2, 1, 1, 1, 0]
+    assert _feed(governor, FAST, 3) == [0, 0, 0]
+
+
+def test_restore_streak_is_broken_by_an_in_budget_window():
+    governor, _, _ = _governor()
+    _feed(governor, SLOW)
+    
+    assert _feed(governor, FAST, 2) + _feed(governor, OK) + _feed(governor, FAST, 3) == \
+        [1, 1, 1, 1, 1, 0]
+
+
+def test_level_is_capped_at_lowest_quality():
+    governor, _, _ = _governor()
+    levels = _feed(governor, SLOW, governor.max_level + 3)
+    assert levels[-1] == levels[-4] == governor.max_level
+
+
+def test_apply_sets_tracker_detector_pipeline_and_pose():
+    governor, processor, pipeline = _governor()
+    levels = QUALITY_CONFIG['levels']
+    
+    # Level 0 diterapkan saat konstruksi
+    assert processor.pose_complexity_calls == [levels[0]['pose_complexity']]
+    
+    for level in range(governor.max_level + 1):
+        governor.set_level(level)
+        settings = levels[level]
+        assert processor.tracker.detect_interval == settings['detect_interval']
+        assert processor.face_detector.scale == settings['detection_scale']
+        assert pipeline.estimate_interval == settings['estimate_interval']
+        assert processor.pose_complexity_calls[-1] == settings['pose_complexity']
+    
+    with pytest.raises(ValueError):
+        governor.set_level(governor.max_level + 1)
+
+
+def test_async_pose_skips_pose_only_steps():
+    governor, processor, pipeline = _governor(async_pose=True)
+    
+    expected = QualityGovernor._effective_levels(QUALITY_CONFIG['levels'], True)
+    assert governor.levels == expected
+    assert all('pose_complexity' not in settings for settings in governor.levels)
+    assert len(governor.levels) == len(QUALITY_CONFIG['levels']) - 1
+    
+    # Langkah pertama langsung mengurangi kerja deteksi, bukan pose
+    _feed(governor, SLOW)
+    assert processor.tracker.detect_interval == expected[1]['detect_interval']
+    assert processor.pose_complexity_calls == []
+
+
+def test_effective_levels_drops_duplicates_without_pose():
+    levels = [{'pose_complexity': 1, 'detect_interval': 5},
+              {'pose_complexity': 0, 'detect_interval': 5},
+              {'pose_complexity': 0, 'detect_interval': 10}]
+    
+    assert QualityGovernor._effective_levels(levels, False) == levels
+    assert QualityGovernor._effective_levels(levels, True) == [{'detect_interval': 5},
+                                                               {'detect_interval': 10}]
+
+
+def test_reset_returns_to_full_quality():
+    governor, processor, _ = _governor()
+    _feed(governor, SLOW, 3)
+    governor.reset()
+    
+    assert governor.level == 0
+    assert processor.tracker.detect_interval == QUALITY_CONFIG['levels'][0]['detect_interval']
+    assert governor.state()['last_p95'] is None
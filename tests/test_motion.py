@@ -0,0 +1,67 @@
+"""Tes pelacak gerakan dada optical flow pada tekstur yang digeser vertikal."""
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip('cv2')
+
+from src.signal.motion import ChestMotionTracker
+
+FS = 30.0
+SIZE = (160, 120)
+MARGIN = 8
+
+
+@pytest.fixture(scope='module')
+def texture():
+    # Tekstur lebih tinggi dari region agar bisa digeser tanpa tepi kosong
+    rng = np.random.default_rng(0)
+    noise = rng.integers(30, 220, (SIZE[1] + 2 * MARGIN, SIZE[0]), dtype=np.uint8)
+    return cv2.GaussianBlur(noise, (0, 0), 1.5)
+
+
+def _shifted(texture, shift):
+    matrix = np.float32([[1, 0, 0], [0, 1, shift - MARGIN]])
+    return cv2.warpAffine(texture, matrix, SIZE, flags=cv2.INTER_LINEAR,
+                          borderMode=cv2.BORDER_REFLECT)
+
+
+def _track(tracker, texture, shifts):
+    rect = (0, 0) + SIZE
+    return np.array([tracker.update(_shifted(texture, s), rect) for s in shifts])
+
+
+@pytest.mark.parametrize('breaths_per_minute', [9.0, 15.0, 24.0])
+def test_displacement_follows_breathing_frequency(texture, breaths_per_minute):
+    n = 600
+    t = np.arange(n) / FS
+    shifts = 3.0 * np.sin(2 * np.pi * breaths_per_minute / 60.0 * t)
+    
+    position = _track(ChestMotionTracker(), texture, shifts)
+    
+    # Posisi terakumulasi = perpindahan sub-piksel relatif frame pertama
+    np.testing.assert_allclose(position, shifts - shifts[0], atol=0.2)
+    spectrum = np.abs(np.fft.rfft(position - position.mean()))
+    freqs = np.fft.rfftfreq(n, 1 / FS)
+    assert freqs[np.argmax(spectrum)] * 60 == pytest.approx(breaths_per_minute, abs=0.5)
+
+
+def test_large_jump_is_ignored_as_body_motion(texture):
+    # Batas langkah 6 piksel; lompatan 10 piksel masih terlacak tetapi ditolak
+    tracker = ChestMotionTracker(max_step_ratio=0.05)
+    position = _track(tracker, texture, [0.0, 0.5, 1.0, 11.0])
+    
+    assert position[2] == pytest.approx(1.0, abs=0.1)
+    assert position[3] == position[2]
+
+
+def test_region_change_restarts_tracking(texture):
+    tracker = ChestMotionTracker()
+    _track(tracker, texture, [0.0, 1.0])
+    
+    # ROI dada pindah jauh: region baru, tidak ada langkah dari frame lama
+    position = tracker.update(_shifted(texture, 2.0), (80, 60, 80, 60))
+    assert position == pytest.approx(1.0, abs=0.1)
+    
+    tracker.reset()
+    assert tracker.position == 0.0
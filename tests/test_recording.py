@@ -0,0 +1,63 @@
+"""Tes perekam sesi kolumnar append-only (SessionRecorder)."""
+
+import os
+
+import numpy as np
+import pytest
+
+from src.utils.recording import SessionRecorder, read_manifest
+
+COLUMNS = (('time', '<f8'), ('heart_rate', '<f8'), ('face_x', '<i4'))
+
+
+def _record(directory, rows):
+    recorder = SessionRecorder(directory, columns=COLUMNS, metadata={'source': 'test'},
+                               flush_interval=0.05)
+    recorder.start()
+    for row in rows:
+        recorder.record(row)
+    recorder.stop()
+    assert recorder.error is None
+    return recorder
+
+
+def test_columns_are_appended_as_raw_little_endian_files(tmp_path):
+    directory = str(tmp_path / 'session')
+    rows = [{'time': i / 30.0, 'face_x': i} for i in range(100)]
+    rows[10]['heart_rate'] = 72.5
+    del rows[20]['face_x']
+    recorder = _record(directory, rows)
+    assert recorder.rows == 100
+    
+    manifest = read_manifest(directory)
+    assert manifest['status'] == 'complete'
+    assert manifest['rows'] == 100
+    assert manifest['metadata'] == {'source': 'test'}
+    assert [c['name'] for c in manifest['columns']] == ['time', 'heart_rate', 'face_x']
+    
+    def column(name, dtype):
+        return np.fromfile(os.path.join(directory, f"{name}.bin"), dtype=dtype)
+    
+    np.testing.assert_allclose(column('time', '<f8'), np.arange(100) / 30.0)
+    heart_rate = column('heart_rate', '<f8')
+    assert heart_rate[10] == 72.5
+    assert np.isnan(np.delete(heart_rate, 10)).all()
+    face_x = column('face_x', '<i4')
+    assert face_x[20] == -1
+    assert face_x[21] == 21
+
+
+def test_rows_after_stop_are_ignored(tmp_path):
+    directory = str(tmp_path / 'session')
+    recorder = _record(directory, [{'time': 0.0}, {'time': 0.1}])
+    recorder.record({'time': 0.2})
+    
+    assert recorder.rows == 2
+    assert os.path.getsize(os.path.join(directory, 'time.bin')) == 2 * 8
+
+
+def test_start_refuses_existing_session(tmp_path):
+    directory = str(tmp_path / 'session')
+    _record(directory, [{'time': 0.0}])
+    with pytest.raises(RuntimeError):
+        SessionRecorder(directory, columns=COLUMNS).start()
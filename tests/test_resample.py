@@ -0,0 +1,66 @@
+"""Tes resampling ke grid waktu seragam dan estimasi laju sampling."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('scipy')
+
+from src.signal.filters import SampleRateEstimator, UniformResampler, resample_uniform
+
+
+def test_resample_uniform_grid_and_interpolation():
+    t = np.array([0.0, 0.03, 0.07, 0.1, 0.16, 0.2])
+    values = 2.0 * t + 1.0
+    
+    grid, resampled = resample_uniform(t, values, 50.0)
+    np.testing.assert_allclose(grid, np.arange(11) / 50.0)
+    np.testing.assert_allclose(resampled, 2.0 * grid + 1.0)
+    
+    grid, resampled = resample_uniform(t, np.vstack([values, -values]), 50.0)
+    assert resampled.shape == (2, 11)
+    np.testing.assert_allclose(resampled[1], -(2.0 * grid + 1.0))
+
+
+def test_resample_uniform_passes_through_degenerate_input():
+    t, values = np.array([1.0]), np.array([5.0])
+    grid, resampled = resample_uniform(t, values, 30.0)
+    np.testing.assert_array_equal(grid, t)
+    np.testing.assert_array_equal(resampled, values)
+
+
+def test_resample_uniform_end_anchor_ends_on_last_sample():
+    t = np.array([0.0, 0.05, 0.11, 0.17])
+    grid, resampled = resample_uniform(t, 3.0 * t, 20.0, anchor='end')
+    
+    assert grid[-1] == t[-1]
+    np.testing.assert_allclose(np.diff(grid), 0.05)
+    assert grid[0] >= t[0]
+    np.testing.assert_allclose(resampled, 3.0 * grid)
+
+
+def test_uniform_resampler_matches_batch_resample():
+    rng = np.random.default_rng(2)
+    t = np.cumsum(1 / 27.0 + rng.normal(0, 0.004, 200))
+    x = np.sin(2 * np.pi * 1.1 * t)
+    
+    resampler = UniformResampler(30.0)
+    streamed = [v for ti, xi in zip(t, x) for v in resampler.update(ti, xi)]
+    _, expected = resample_uniform(t, x, 30.0)
+    np.testing.assert_allclose(streamed, expected, atol=1e-12)
+    
+    # Timestamp yang tidak naik diabaikan
+    assert resampler.update(t[-1], 0.0) == []
+
+
+def test_sample_rate_estimator_tracks_effective_rate():
+    estimator = SampleRateEstimator(30.0, window_size=20, min_samples=5)
+    assert estimator.update(0.0) == 30.0
+    
+    # Frame terbuang menurunkan laju efektif; timestamp mundur diabaikan
+    for i in range(1, 40):
+        fs = estimator.update(i * 0.04)
+    assert fs == pytest.approx(25.0)
+    assert estimator.update(0.5) == pytest.approx(25.0)
+    
+    estimator.reset()
+    assert estimator.fs == 30.0
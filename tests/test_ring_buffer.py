@@ -0,0 +1,58 @@
+"""Tes RingBuffer: wraparound dan invarian view."""
+
+import numpy as np
+import pytest
+
+from src.utils.ring_buffer import RingBuffer
+
+
+def _fill(buffer, values):
+    for v in values:
+        buffer.append((v, 10.0 * v)[:len(buffer.columns)])
+
+
+def test_partial_fill_returns_only_valid_samples():
+    buffer = RingBuffer(5, ('a', 'b'))
+    _fill(buffer, [1, 2, 3])
+    
+    assert len(buffer) == 3
+    assert not buffer.is_full
+    np.testing.assert_array_equal(buffer.column('a'), [1, 2, 3])
+    np.testing.assert_array_equal(buffer.column('b'), [10, 20, 30])
+
+
+@pytest.mark.parametrize('n', [5, 6, 9, 10, 23])
+def test_wraparound_keeps_latest_samples_in_order(n):
+    buffer = RingBuffer(5, ('a', 'b'))
+    _fill(buffer, range(n))
+    
+    expected = np.arange(n)[-5:]
+    assert buffer.is_full
+    np.testing.assert_array_equal(buffer.column('a'), expected)
+    np.testing.assert_array_equal(buffer.view(), np.vstack([expected, 10.0 * expected]))
+    assert buffer.last('a') == expected[-1]
+
+
+def test_views_are_read_only_and_share_memory():
+    buffer = RingBuffer(4, ('a',))
+    _fill(buffer, range(7))
+    
+    column = buffer.column('a')
+    assert not column.flags.writeable
+    assert column.flags.c_contiguous
+    assert np.shares_memory(column, buffer._data)
+    with pytest.raises(ValueError):
+        column[0] = 0.0
+
+
+def test_clear_resets_count_and_last():
+    buffer = RingBuffer(3, ('a',))
+    _fill(buffer, range(4))
+    buffer.clear()
+    
+    assert len(buffer) == 0
+    assert buffer.last('a') is None
+    assert buffer.column('a').size == 0
+    
+    _fill(buffer, [7])
+    np.testing.assert_array_equal(buffer.column('a'), [7])
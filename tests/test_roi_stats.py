@@ -0,0 +1,91 @@
+"""Tes statistik ROI berbasis integral image terhadap cv2.mean dan np.var."""
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip('cv2')
+
+from src.video.roi_stats import ROIStatistics, union_rect
+
+
+def _crop(frame, rect):
+    x, y, w, h = rect
+    return frame[y:y+h, x:x+w]
+
+
+def _random_rects(rng, region, n):
+    rx, ry, rw, rh = region
+    rects = []
+    for _ in range(n):
+        w, h = rng.integers(1, rw + 1), rng.integers(1, rh + 1)
+        rects.append((rx + int(rng.integers(0, rw - w + 1)),
+                      ry + int(rng.integers(0, rh - h + 1)), int(w), int(h)))
+    return rects
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+
+
+def test_mean_and_variance_match_opencv_on_random_crops(frame):
+    rng = np.random.default_rng(1)
+    forehead, chest = (40, 10, 50, 20), (20, 60, 100, 50)
+    region = union_rect([forehead, chest])
+    stats = ROIStatistics(frame, region)
+    
+    # Rect acak di dalam region, rect di setiap tepi region, dan region itu sendiri
+    rx, ry, rw, rh = region
+    edges = [region, (rx, ry, 1, 1), (rx + rw - 1, ry + rh - 1, 1, 1),
+             (rx, ry, rw, 1), (rx, ry + rh - 1, rw, 1),
+             (rx, ry, 1, rh), (rx + rw - 1, ry, 1, rh), forehead, chest]
+    for rect in _random_rects(rng, region, 50) + edges:
+        crop = _crop(frame, rect)
+        np.testing.assert_allclose(stats.mean(rect), cv2.mean(crop)[:3], atol=1e-9)
+        np.testing.assert_allclose(stats.variance(rect),
+                                   crop.reshape(-1, 3).astype(np.float64).var(axis=0),
+                                   rtol=1e-9, atol=1e-6)
+
+
+def test_rects_outside_region_are_clipped(frame):
+    stats = ROIStatistics(frame, (30, 20, 40, 30))
+    
+    np.testing.assert_allclose(stats.mean((0, 0, 50, 40)),
+                               cv2.mean(frame[20:40, 30:50])[:3], atol=1e-9)
+    assert stats.area((60, 40, 50, 50)) == 10 * 10
+    assert stats.mean((100, 100, 10, 10)) is None
+    assert stats.variance((30, 20, 0, 5)) is None
+
+
+def test_region_is_clipped_to_frame(frame):
+    stats = ROIStatistics(frame, (-10, 100, 200, 50))
+    assert stats.origin == (0, 100)
+    assert stats.size == (160, 20)
+    np.testing.assert_allclose(stats.mean((0, 100, 160, 20)),
+                               cv2.mean(frame[100:120])[:3], atol=1e-9)
+
+
+@pytest.mark.parametrize('grid', [(1, 1), (2, 4), (3, 5)])
+def test_grid_means_match_per_cell_mean(frame, grid):
+    rows, cols = grid
+    rect = (13, 7, 97, 61)
+    stats = ROIStatistics(frame, rect)
+    
+    means = stats.grid_means(rect, rows, cols)
+    x, y, w, h = rect
+    xs = x + (np.arange(cols + 1) * w) // cols
+    ys = y + (np.arange(rows + 1) * h) // rows
+    expected = [cv2.mean(frame[ys[r]:ys[r+1], xs[c]:xs[c+1]])[:3]
+                for r in range(rows) for c in range(cols)]
+    np.testing.assert_allclose(means, expected, atol=1e-9)
+
+
+def test_grid_larger_than_rect_returns_none(frame):
+    stats = ROIStatistics(frame)
+    assert stats.grid_means((0, 0, 3, 3), 2, 4) is None
+
+
+def test_union_rect():
+    assert union_rect([(10, 20, 5, 5), None, (0, 30, 8, 10)]) == (0, 20, 15, 20)
+    assert union_rect([None]) is None
@@ -0,0 +1,109 @@
+"""Tes pembaca sesi memory-map (SessionReader) dan analisis ulang offline."""
+
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip('scipy')
+
+from src.utils.recording import SessionReader, SessionRecorder
+
+COLUMNS = (('time', '<f8'), ('heart_rate', '<f8'), ('face_x', '<i4'))
+
+
+def _record(directory, rows):
+    recorder = SessionRecorder(directory, columns=COLUMNS, metadata={'source': 'test'},
+                               flush_interval=0.05)
+    recorder.start()
+    for row in rows:
+        recorder.record(row)
+    recorder.stop()
+    assert recorder.error is None
+    return recorder
+
+
+def test_round_trip_with_missing_values(tmp_path):
+    directory = str(tmp_path / 'session')
+    rows = [{'time': i / 30.0, 'face_x': i} for i in range(100)]
+    rows[10]['heart_rate'] = 72.5
+    del rows[20]['face_x']
+    recorder = _record(directory, rows)
+    
+    reader = SessionReader(directory)
+    assert len(reader) == recorder.rows == 100
+    assert reader.columns == ('time', 'heart_rate', 'face_x')
+    assert reader.manifest['status'] == 'complete'
+    assert reader.metadata == {'source': 'test'}
+    
+    np.testing.assert_allclose(reader.column('time'), np.arange(100) / 30.0)
+    heart_rate = reader.column('heart_rate')
+    assert heart_rate[10] == 72.5
+    assert np.isnan(heart_rate[11])
+    assert reader.column('face_x')[20] == -1
+    assert reader.duration == pytest.approx(99 / 30.0)
+    
+    with pytest.raises(KeyError):
+        reader.column('resp_rate')
+
+
+def test_truncated_last_batch_is_cut_to_complete_rows(tmp_path):
+    directory = str(tmp_path / 'session')
+    _record(directory, [{'time': i * 0.1, 'heart_rate': 60.0 + i, 'face_x': i}
+                        for i in range(50)])
+    
+    # Simulasikan crash saat menulis batch terakhir: kolom terpotong tidak merata
+    with open(os.path.join(directory, 'time.bin'), 'ab') as f:
+        f.write(np.arange(5, dtype='<f8').tobytes())
+    with open(os.path.join(directory, 'heart_rate.bin'), 'ab') as f:
+        f.write(np.arange(3, dtype='<f8').tobytes()[:-4])
+    
+    reader = SessionReader(directory)
+    assert len(reader) == 50
+    assert all(len(reader.column(name)) == 50 for name in reader.columns)
+    assert reader.column('heart_rate')[-1] == 109.0
+
+
+def test_index_range_and_slice_by_time(tmp_path):
+    directory = str(tmp_path / 'session')
+    _record(directory, [{'time': i * 0.5, 'face_x': i} for i in range(20)])
+    
+    reader = SessionReader(directory)
+    assert reader.index_range(2.0, 4.0) == (4, 8)
+    assert reader.index_range(None, None) == (0, 20)
+    assert reader.index_range(5.0, 1.0) == (10, 10)
+
+
+def _record_signals(directory, time_array, pulse, resp):
+    recorder = SessionRecorder(directory, flush_interval=0.05)
+    recorder.start()
+    for t, p, r in zip(time_array, pulse, resp):
+        recorder.record({'time': t, 'rppg_pulse': p, 'resp_raw': r})
+    recorder.stop()
+    return SessionReader(directory)
+
+
+def test_estimate_rates_recovers_recorded_rates(tmp_path):
+    rng = np.random.default_rng(0)
+    t = np.cumsum(np.full(1200, 1 / 30.0) + rng.normal(0, 0.002, 1200))
+    reader = _record_signals(str(tmp_path / 'session'), t, np.sin(2 * np.pi * 1.2 * t),
+                             np.sin(2 * np.pi * 0.25 * t))
+    
+    rates = reader.estimate_rates(step=5.0)
+    heart_rates = rates['heart_rate'][np.isfinite(rates['heart_rate'])]
+    resp_rates = rates['resp_rate'][np.isfinite(rates['resp_rate'])]
+    assert len(heart_rates) > 0 and len(resp_rates) > 0
+    np.testing.assert_allclose(heart_rates, 72.0, atol=1.5)
+    np.testing.assert_allclose(resp_rates, 15.0, atol=1.0)
+
+
+def test_estimate_rates_with_stalled_timestamps_returns_nan(tmp_path):
+    # Timestamp macet (median langkah waktu nol) tidak boleh memicu OverflowError
+    t = np.repeat(np.arange(60) * 0.5, 20)
+    values = np.sin(np.arange(len(t)))
+    reader = _record_signals(str(tmp_path / 'session'), t, values, values)
+    
+    rates = reader.estimate_rates(step=5.0)
+    assert len(rates['time']) > 0
+    assert np.isnan(rates['heart_rate']).all()
+    assert np.isnan(rates['resp_rate']).all()
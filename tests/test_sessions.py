@@ -0,0 +1,49 @@
+"""Tes SessionManager dengan sumber file video."""
+
+import time
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip('cv2')
+
+from src.video.sessions import SessionManager
+
+
+class _RecordingPipeline:
+    """Pipeline palsu yang hanya mencatat timestamp frame."""
+    
+    def __init__(self):
+        self.timestamps = []
+    
+    def process_frame(self, frame, timestamp):
+        time.sleep(0.001)
+        self.timestamps.append(timestamp)
+        return {'timestamp': timestamp}
+
+
+def test_file_session_processes_every_frame_and_finishes(tmp_path):
+    path = str(tmp_path / 'clip.avi')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30.0, (64, 48))
+    if not writer.isOpened():
+        pytest.skip("VideoWriter MJPG tidak tersedia")
+    for i in range(30):
+        writer.write(np.full((48, 64, 3), i * 8, dtype=np.uint8))
+    writer.release()
+    
+    manager = SessionManager(workers=2)
+    pipeline = _RecordingPipeline()
+    session = manager._add_session(path, pipeline, {})
+    manager.start()
+    try:
+        deadline = time.monotonic() + 5.0
+        while not session.finished and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        manager.stop()
+    
+    stats = session.stats()
+    assert stats['finished']
+    assert stats['processed'] == 30
+    assert stats['dropped'] == 0
+    np.testing.assert_allclose(pipeline.timestamps, np.arange(30) / 30.0, atol=1e-6)
@@ -0,0 +1,94 @@
+"""Tes estimasi spektral terbatas pita (zoom DFT dan sliding DFT)."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('scipy')
+
+from src.signal.filters import UniformResampler
+from src.signal.spectral import (SlidingDFT, band_peak_frequency, parabolic_interpolation,
+                                 zoom_dft)
+
+
+def test_zoom_dft_matches_direct_dft():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=120)
+    fs = 30.0
+    
+    freqs, spectrum = zoom_dft(x, fs, 0.8, 2.2, resolution=0.05)
+    m = np.arange(len(x))
+    direct = np.array([np.sum(x * np.exp(-2j * np.pi * f * m / fs)) for f in freqs])
+    np.testing.assert_allclose(spectrum, direct, atol=1e-8)
+
+
+def test_sliding_dft_matches_zoom_dft_after_wraparound():
+    rng = np.random.default_rng(1)
+    fs, n = 30.0, 64
+    x = np.sin(2 * np.pi * 1.3 * np.arange(250) / fs) + 0.2 * rng.normal(size=250)
+    
+    sliding = SlidingDFT(n, fs, 0.8, 2.2)
+    for value in x:
+        sliding.update(value)
+    
+    freqs, expected = zoom_dft(x[-n:], fs, sliding.freqs[0], sliding.freqs[-1],
+                               sliding.freqs[1] - sliding.freqs[0])
+    np.testing.assert_allclose(sliding.freqs, freqs)
+    np.testing.assert_allclose(np.abs(sliding._bins), np.abs(expected), atol=1e-8)
+    assert sliding.count == n
+
+
+def test_sliding_dft_set_sampling_rate_with_samples_replaces_window():
+    fs, n = 30.0, 64
+    sliding = SlidingDFT(n, 20.0, 0.8, 2.2)
+    for value in np.ones(10):
+        sliding.update(value)
+    
+    samples = np.sin(2 * np.pi * 1.5 * np.arange(100) / fs)
+    sliding.set_sampling_rate(fs, samples)
+    
+    _, expected = zoom_dft(samples[-n:], fs, sliding.freqs[0], sliding.freqs[-1],
+                           sliding.freqs[1] - sliding.freqs[0])
+    np.testing.assert_allclose(np.abs(sliding._bins), np.abs(expected), atol=1e-8)
+    assert sliding.peak_frequency() == pytest.approx(1.5, abs=0.05)
+
+
+@pytest.mark.parametrize('frequency', [0.9, 1.2, 1.75, 2.1])
+def test_peak_frequency_recovers_tone(frequency):
+    fs = 30.0
+    x = np.sin(2 * np.pi * frequency * np.arange(300) / fs)
+    
+    sliding = SlidingDFT(300, fs, 0.83, 2.17)
+    for value in x:
+        sliding.update(value)
+    assert sliding.peak_frequency() == pytest.approx(frequency, abs=0.02)
+    assert band_peak_frequency(x, fs, 0.83, 2.17) == pytest.approx(frequency, abs=0.02)
+
+
+def test_parabolic_interpolation_finds_vertex():
+    k = np.arange(7)
+    values = 5.0 - (k - 3.3) ** 2
+    offset, peak = parabolic_interpolation(values, 3)
+    assert offset == pytest.approx(0.3)
+    assert peak == pytest.approx(5.0)
+    
+    # Indeks di tepi tidak diinterpolasi
+    assert parabolic_interpolation(values, 0) == (0.0, values[0])
+
+
+def test_sliding_dft_on_resampled_jittered_stream():
+    rng = np.random.default_rng(3)
+    fs = 30.0
+    t = np.cumsum(1 / 27.0 + rng.normal(0, 0.006, 900))
+    x = np.sin(2 * np.pi * 1.2 * t)
+    
+    # Timestamp tidak seragam: spektrum diisi dari grid seragam, bukan sampel mentah
+    resampler = UniformResampler(fs)
+    sliding = SlidingDFT(300, fs, 0.83, 2.17)
+    for ti, xi in zip(t, x):
+        for value in resampler.update(ti, xi):
+            sliding.update(value)
+    assert sliding.peak_frequency() * 60 == pytest.approx(72.0, abs=1.0)
+
+
+def test_empty_sliding_dft_has_no_peak():
+    assert SlidingDFT(32, 30.0, 0.8, 2.2).peak_frequency() is None
@@ -0,0 +1,60 @@
+"""Tes StreamingFilter terhadap rantai filter batch (detrend, sosfilt, moving average)."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('scipy')
+from scipy import signal
+
+from src.signal.filters import StreamingFilter, design_bandpass_sos
+
+
+def _trailing_mean(x, window):
+    """Rata-rata bergerak kausal dengan jendela parsial di awal (seperti RunningMean)."""
+    cumsum = np.concatenate(([0.0], np.cumsum(x)))
+    idx = np.arange(1, len(x) + 1)
+    start = np.maximum(0, idx - window)
+    return (cumsum[idx] - cumsum[start]) / (idx - start)
+
+
+def _trailing_detrend(x, window):
+    """Residu sampel terbaru terhadap garis least-squares jendela terakhir."""
+    out = np.zeros(len(x))
+    for i in range(1, len(x)):
+        segment = x[max(0, i - window + 1):i + 1]
+        k = np.arange(len(segment))
+        slope, intercept = np.polyfit(k, segment, 1)
+        out[i] = segment[-1] - (intercept + slope * k[-1])
+    return out
+
+
+def test_streaming_filter_matches_batch_chain():
+    rng = np.random.default_rng(0)
+    fs = 30.0
+    t = np.arange(300) / fs
+    x = np.sin(2 * np.pi * 1.2 * t) + 0.05 * t + 0.1 * rng.normal(size=len(t))
+    
+    stream = StreamingFilter(0.8, 3.0, fs, window_size=7, detrend_window=90)
+    output = stream.process(x)
+    
+    sos = design_bandpass_sos(0.8, 3.0, fs)
+    expected = signal.sosfilt(sos, _trailing_detrend(x, 90))
+    expected = _trailing_mean(_trailing_mean(expected, 7), 3)
+    np.testing.assert_allclose(output, expected, atol=1e-8)
+
+
+def test_streaming_bandpass_state_matches_sosfilt():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=200)
+    stream = StreamingFilter(0.8, 3.0, 30.0)
+    
+    y = np.array([stream._bandpass_step(v) for v in x])
+    expected, zf = signal.sosfilt(stream.sos, x, zi=np.zeros((len(stream.sos), 2)))
+    np.testing.assert_allclose(y, expected, atol=1e-10)
+    np.testing.assert_allclose(stream.zi, zf, atol=1e-10)
+
+
+def test_streaming_filter_replaces_non_finite_samples():
+    stream = StreamingFilter(0.8, 3.0, 30.0)
+    output = stream.process([1.0, 2.0, np.nan, np.inf, 3.0])
+    assert np.all(np.isfinite(output))